@@ -1,8 +1,29 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from application.api.users.handlers import router as auth_router
 from application.api.messages.handlers import router as message_router
 from application.api.moderator.handlers import router as moderator_router
 from application.api.messages.websockets.messages import router as message_ws_router
+from application.api.metrics.handlers import router as metrics_router
+from application.api.metrics.middlewares import RequestMetricsMiddleware
+from application.api.middlewares import MongoCommandBudgetMiddleware
+from infra.websockets.managers import BaseConnectionManager
+from logic.init import get_mediator, init_container, init_mongodb_indexes
+from logic.services.auth import AuthService
+from logic.services.messages import MessageWriteBuffer
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    container = init_container()
+    # Build the dispatch table eagerly so registration errors fail the startup
+    await get_mediator()
+    await init_mongodb_indexes(container)
+    yield
+    await container.resolve(BaseConnectionManager).close()
+    await container.resolve(MessageWriteBuffer).close()
+    container.resolve(AuthService).password_hasher.shutdown()
 
 
 def create_application() -> FastAPI:
@@ -10,9 +31,13 @@ def create_application() -> FastAPI:
         debug=True,
         title="ChatBridge",
         docs_url="/api/docs",
+        lifespan=lifespan,
     )
     app.include_router(auth_router, prefix="/auth")
     app.include_router(message_router, prefix="/chats")
     app.include_router(moderator_router, prefix="/m/chats")
     app.include_router(message_ws_router, prefix="/chats")
+    app.include_router(metrics_router)
+    app.add_middleware(MongoCommandBudgetMiddleware)
+    app.add_middleware(RequestMetricsMiddleware)
     return app
@@ -0,0 +1,87 @@
+import zlib
+from collections.abc import AsyncIterator
+
+import orjson
+from fastapi import Response
+
+from domain.entities.messages import Chat, Message
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+
+def _message_to_dict(message: Message) -> dict:
+    return {
+        "oid": message.oid,
+        "text": message.text.value,
+        "sender_oid": message.sender_oid,
+        "created_at": message.created_at,
+    }
+
+
+def _chat_to_dict(chat: Chat) -> dict:
+    return {
+        "oid": chat.oid,
+        "title": chat.title.value,
+        "participants": [
+            {"username": user.username.value, "user_oid": user.oid}
+            for user in chat.users
+        ],
+        "created_at": chat.created_at,
+        "messages_count": chat.messages_count,
+        "last_message": (
+            _message_to_dict(chat.last_message) if chat.last_message else None
+        ),
+    }
+
+
+# Same shape as GetUserChatMessagesSchema and GetUserChatsSchema, without models
+def encode_chat_messages(messages: list[Message]) -> bytes:
+    return orjson.dumps(
+        {
+            "count": len(messages),
+            "messages": [_message_to_dict(message) for message in messages],
+        }
+    )
+
+
+def encode_user_chats(chats: list[Chat]) -> bytes:
+    return orjson.dumps(
+        {"count": len(chats), "chats": [_chat_to_dict(chat) for chat in chats]}
+    )
+
+
+def encode_messages_ndjson(messages: list[Message]) -> bytes:
+    return b"".join(
+        orjson.dumps(_message_to_dict(message), option=orjson.OPT_APPEND_NEWLINE)
+        for message in messages
+    )
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    # An explicit gzip entry wins over the wildcard, q=0 means the coding is refused
+    qualities: dict[str, float] = {}
+    for entry in accept_encoding.split(","):
+        coding, *params = (part.strip() for part in entry.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding.lower()] = quality
+
+    quality = qualities.get("gzip", qualities.get("x-gzip", qualities.get("*", 0.0)))
+    return quality > 0
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    # A sync flush per chunk lets the client decode rows as they arrive
+    compressor = zlib.compressobj(wbits=31)
+    async for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
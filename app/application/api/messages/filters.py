@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field, model_validator
+
+from infra.repositories.filters.messages import (
+    GetMessagesFilters as GetMessagesInfraFilters,
+)
+
+
+class GetMessagesFilters(BaseModel):
+    limit: int = Field(default=50, ge=1, le=200)
+    before: str | None = None
+    after: str | None = None
+
+    @model_validator(mode="after")
+    def check_single_cursor(self) -> "GetMessagesFilters":
+        if self.before is not None and self.after is not None:
+            raise ValueError("only one of before and after can be set")
+        return self
+
+    def to_infra(self) -> GetMessagesInfraFilters:
+        return GetMessagesInfraFilters(
+            limit=self.limit, before=self.before, after=self.after
+        )
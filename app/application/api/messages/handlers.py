@@ -1,4 +1,15 @@
+from typing import Annotated
+
 from application.api.messages.decorators import handler_exceptions
+from application.api.messages.encoders import (
+    FastJSONResponse,
+    accepts_gzip,
+    encode_chat_messages,
+    encode_messages_ndjson,
+    encode_user_chats,
+    gzip_chunks,
+)
+from application.api.messages.filters import GetMessagesFilters
 from application.api.messages.schemas import (
     ChatDetailSchema,
     CreateChatRequestSchema,
@@ -15,19 +26,21 @@ from logic.commands.messages import (
     AddUserToChatCommand,
     CreateChatCommand,
     CreateMessageCommand,
+    ExportChatMessagesCommand,
     GetChatCommand,
     GetUserChatMessagesCommand,
     GetUserChatsCommand,
     GetUsersCommand,
 )
 from logic.commands.permissions import AccessCheckUserCommand
-from logic.init import init_container
+from logic.init import get_mediator, get_settings
 from logic.mediator import Mediator
+from settings.config import Settings
 
 from fastapi.routing import APIRouter
-from fastapi import Depends, status
+from fastapi import Depends, Query, Request, status
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from punq import Container
 
 router = APIRouter(tags=["Chat"])
 http_bearer = HTTPBearer()
@@ -46,10 +59,9 @@ http_bearer = HTTPBearer()
 @handler_exceptions
 async def create_user_chat_handler(
     schema: CreateChatRequestSchema,
-    container: Container = Depends(init_container),
+    mediator: Mediator = Depends(get_mediator),
     credentials: HTTPAuthorizationCredentials = Depends(http_bearer),
 ) -> CreateChatResponseSchema:
-    mediator: Mediator = container.resolve(Mediator)
     token = credentials.credentials
 
     user, *_ = await mediator.handle_command(AccessCheckUserCommand(access_token=token))
@@ -70,13 +82,17 @@ async def create_user_chat_handler(
 )
 @handler_exceptions
 async def get_user_chats_handler(
-    container: Container = Depends(init_container),
+    mediator: Mediator = Depends(get_mediator),
+    settings: Settings = Depends(get_settings),
     credentials: HTTPAuthorizationCredentials = Depends(http_bearer),
 ):
-    mediator: Mediator = container.resolve(Mediator)
     token = credentials.credentials
     user, *_ = await mediator.handle_command(AccessCheckUserCommand(access_token=token))
     chats, *_ = await mediator.handle_command(GetUserChatsCommand(user=user))
+
+    if settings.api_config.fast_json_responses:
+        return FastJSONResponse(encode_user_chats(chats))
+
     return GetUserChatsSchema(
         count=len(chats), chats=[ChatDetailSchema.from_entity(chat) for chat in chats]
     )
@@ -92,10 +108,9 @@ async def get_user_chats_handler(
 @handler_exceptions
 async def get_chat_detail_handler(
     chat_oid: str,
-    container: Container = Depends(init_container),
+    mediator: Mediator = Depends(get_mediator),
     credentials: HTTPAuthorizationCredentials = Depends(http_bearer),
 ):
-    mediator: Mediator = container.resolve(Mediator)
     token = credentials.credentials
     user, *_ = await mediator.handle_command(AccessCheckUserCommand(access_token=token))
     chat, *_ = await mediator.handle_command(GetChatCommand(chat_oid=chat_oid))
@@ -104,6 +119,7 @@ async def get_chat_detail_handler(
 
 @router.get(
     "/{chat_oid}/messages/",
+    description="История сообщений чата с постраничной навигацией по курсору",
     responses={
         status.HTTP_200_OK: {"model": GetUserChatMessagesSchema},
         status.HTTP_400_BAD_REQUEST: {"description": "Что-то пошло не так"},
@@ -112,21 +128,65 @@ async def get_chat_detail_handler(
 @handler_exceptions
 async def get_chat_messages_handler(
     chat_oid: str,
-    container: Container = Depends(init_container),
+    filters: Annotated[GetMessagesFilters, Query()],
+    mediator: Mediator = Depends(get_mediator),
+    settings: Settings = Depends(get_settings),
     credentials: HTTPAuthorizationCredentials = Depends(http_bearer),
 ):
-    mediator: Mediator = container.resolve(Mediator)
     token = credentials.credentials
     user, *_ = await mediator.handle_command(AccessCheckUserCommand(access_token=token))
     messages, *_ = await mediator.handle_command(
-        GetUserChatMessagesCommand(user=user, chat_oid=chat_oid)
+        GetUserChatMessagesCommand(
+            user=user, chat_oid=chat_oid, filters=filters.to_infra()
+        )
     )
+
+    if settings.api_config.fast_json_responses:
+        return FastJSONResponse(encode_chat_messages(messages))
+
     return GetUserChatMessagesSchema(
         count=len(messages),
         messages=[MessageDetailSchema.from_entity(message) for message in messages],
     )
 
 
+@router.get(
+    "/{chat_oid}/messages/export/",
+    description="Потоковая выгрузка всей истории чата в формате NDJSON",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {"content": {"application/x-ndjson": {}}},
+        status.HTTP_400_BAD_REQUEST: {"description": "Что-то пошло не так"},
+    },
+)
+@handler_exceptions
+async def export_chat_messages_handler(
+    chat_oid: str,
+    request: Request,
+    after: str | None = None,
+    mediator: Mediator = Depends(get_mediator),
+    credentials: HTTPAuthorizationCredentials = Depends(http_bearer),
+):
+    token = credentials.credentials
+    user, *_ = await mediator.handle_command(AccessCheckUserCommand(access_token=token))
+    batches, *_ = await mediator.handle_command(
+        ExportChatMessagesCommand(user=user, chat_oid=chat_oid, after=after)
+    )
+
+    async def encode():
+        async for messages in batches:
+            yield encode_messages_ndjson(messages)
+
+    if accepts_gzip(request.headers.get("accept-encoding", "")):
+        return StreamingResponse(
+            gzip_chunks(encode()),
+            media_type="application/x-ndjson",
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+        )
+
+    return StreamingResponse(encode(), media_type="application/x-ndjson")
+
+
 @router.post(
     "/{chat_oid}/messages/",
     response_model=CreateMessageResponseSchema,
@@ -141,10 +201,9 @@ async def get_chat_messages_handler(
 async def create_message_handler(
     chat_oid: str,
     schema: CreateMessageSchema,
-    container: Container = Depends(init_container),
+    mediator: Mediator = Depends(get_mediator),
     credentials: HTTPAuthorizationCredentials = Depends(http_bearer),
 ) -> CreateChatResponseSchema:
-    mediator: Mediator = container.resolve(Mediator)
     token = credentials.credentials
     user, *_ = await mediator.handle_command(AccessCheckUserCommand(access_token=token))
     message, *_ = await mediator.handle_command(
@@ -167,10 +226,9 @@ async def create_message_handler(
 async def add_user_to_chat_handler(
     chat_oid: str,
     user_oid: str,
-    container: Container = Depends(init_container),
+    mediator: Mediator = Depends(get_mediator),
     credentials: HTTPAuthorizationCredentials = Depends(http_bearer),
 ) -> None:
-    mediator: Mediator = container.resolve(Mediator)
     token = credentials.credentials
     user, *_ = await mediator.handle_command(AccessCheckUserCommand(access_token=token))
     await mediator.handle_command(
@@ -189,10 +247,9 @@ async def add_user_to_chat_handler(
 )
 @handler_exceptions
 async def get_users_handler(
-    container: Container = Depends(init_container),
+    mediator: Mediator = Depends(get_mediator),
     credentials: HTTPAuthorizationCredentials = Depends(http_bearer),
 ) -> GetUsersSchema:
-    mediator: Mediator = container.resolve(Mediator)
     token = credentials.credentials
     user, *_ = await mediator.handle_command(AccessCheckUserCommand(access_token=token))
     users, *_ = await mediator.handle_command(GetUsersCommand(user=user))
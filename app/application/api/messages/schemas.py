@@ -30,11 +30,29 @@ class UserSchema(BaseModel):
         return cls(username=user.username.value, user_oid=user.oid)
 
 
+class MessageDetailSchema(BaseModel):
+    oid: str
+    text: str
+    sender_oid: str
+    created_at: datetime
+
+    @classmethod
+    def from_entity(cls, message: Message) -> "MessageDetailSchema":
+        return MessageDetailSchema(
+            oid=message.oid,
+            text=message.text.value,
+            created_at=message.created_at,
+            sender_oid=message.sender_oid,
+        )
+
+
 class ChatDetailSchema(BaseModel):
     oid: str
     title: str
     participants: list[UserSchema]
     created_at: datetime
+    messages_count: int = 0
+    last_message: MessageDetailSchema | None = None
 
     @classmethod
     def from_entity(cls, chat: Chat) -> "ChatDetailSchema":
@@ -46,22 +64,12 @@ class ChatDetailSchema(BaseModel):
                 UserSchema(username=user.username.value, user_oid=user.oid)
                 for user in chat.users
             ],
-        )
-
-
-class MessageDetailSchema(BaseModel):
-    oid: str
-    text: str
-    sender_oid: str
-    created_at: datetime
-
-    @classmethod
-    def from_entity(cls, message: Message) -> "MessageDetailSchema":
-        return MessageDetailSchema(
-            oid=message.oid,
-            text=message.text.value,
-            created_at=message.created_at,
-            sender_oid=message.sender_oid,
+            messages_count=chat.messages_count,
+            last_message=(
+                MessageDetailSchema.from_entity(chat.last_message)
+                if chat.last_message
+                else None
+            ),
         )
 
 
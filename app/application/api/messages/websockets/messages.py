@@ -2,11 +2,19 @@ from fastapi import WebSocket, WebSocketDisconnect, Depends, APIRouter
 from fastapi.security import HTTPBearer
 from punq import Container
 
+from infra.exceptions.websockets import ConnectionLimitExceededException
+from infra.repositories.monitoring import MongoCommandMonitor
+from infra.websockets.frames import (
+    PONG_FRAME,
+    build_message_frame,
+    negotiate_subprotocol,
+    unpack_text,
+)
 from infra.websockets.managers import BaseConnectionManager
-from logic.commands.messages import CreateMessageCommand, GetChatCommand
+from logic.commands.messages import BufferMessageCommand, GetChatCommand
 from logic.commands.permissions import AccessCheckUserCommand
 from logic.exceptions.messages import ChatNotFoundException
-from logic.init import init_container
+from logic.init import get_mediator, init_container
 from logic.mediator import Mediator
 
 
@@ -20,9 +28,10 @@ async def websocket_endpoint(
     chat_oid: str,
     websocket: WebSocket,
     container: Container = Depends(init_container),
+    mediator: Mediator = Depends(get_mediator),
 ):
     connection_manager: BaseConnectionManager = container.resolve(BaseConnectionManager)
-    mediator: Mediator = container.resolve(Mediator)
+    command_monitor: MongoCommandMonitor = container.resolve(MongoCommandMonitor)
 
     token = websocket.headers.get("Authorization")
     if token is None or not token.startswith("Bearer "):
@@ -30,27 +39,69 @@ async def websocket_endpoint(
         return
 
     token = token.split(" ")[1]
-    user, *_ = await mediator.handle_command(AccessCheckUserCommand(access_token=token))
+    with command_monitor.track("WS connect /chats/{chat_oid}/"):
+        user, *_ = await mediator.handle_command(
+            AccessCheckUserCommand(access_token=token)
+        )
 
+        try:
+            await mediator.handle_command(GetChatCommand(chat_oid=chat_oid))
+        except ChatNotFoundException as error:
+            await websocket.accept()
+            await websocket.send_json(data={"error": error.message})
+            await websocket.close()
+            return
+
+    subprotocol = negotiate_subprotocol(websocket.scope.get("subprotocols", ()))
     try:
-        await mediator.handle_command(GetChatCommand(chat_oid=chat_oid))
-    except ChatNotFoundException as error:
-        await websocket.accept()
-        await websocket.send_json(data={"error": error.message})
-        await websocket.close()
+        await connection_manager.accept_connection(
+            websocket=websocket, key=chat_oid, subprotocol=subprotocol
+        )
+    except ConnectionLimitExceededException:
         return
 
-    await connection_manager.accept_connection(websocket=websocket, key=chat_oid)
-
-    await websocket.send_text("You are now connected!")
+    if subprotocol is None:
+        await websocket.send_text("You are now connected!")
 
+    close_code = None
     try:
         while True:
-            message = await websocket.receive_text()
-            await connection_manager.send_all(chat_oid, message.encode())
-            await mediator.handle_command(
-                CreateMessageCommand(text=message, chat_oid=chat_oid, user=user)
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(frame.get("code", 1000))
+            connection_manager.mark_alive(websocket)
+
+            # Each subprotocol accepts one frame type, anything else is unsupported data
+            if subprotocol is None:
+                text, packed_text = frame.get("text"), None
+                if text is None:
+                    close_code = 1003
+                    break
+            else:
+                packed_text = frame.get("bytes")
+                if packed_text is None:
+                    close_code = 1003
+                    break
+                if packed_text == PONG_FRAME:
+                    continue
+
+                text = unpack_text(packed_text)
+                if text is None:
+                    close_code = 1007
+                    break
+
+            with command_monitor.track("WS message /chats/{chat_oid}/"):
+                message, *_ = await mediator.handle_command(
+                    BufferMessageCommand(text=text, chat_oid=chat_oid, user=user)
+                )
+            await connection_manager.send_all(
+                chat_oid, build_message_frame(message, packed_text=packed_text)
             )
 
     except WebSocketDisconnect:
+        pass
+    finally:
         await connection_manager.remove_connection(websocket=websocket, key=chat_oid)
+
+    if close_code is not None:
+        await websocket.close(code=close_code)
@@ -0,0 +1,37 @@
+from secrets import compare_digest
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.responses import PlainTextResponse
+from fastapi.routing import APIRouter
+from punq import Container
+
+from infra.metrics.registry import MetricsRegistry
+from logic.init import init_container
+from settings.config import Settings
+
+
+router = APIRouter(tags=["Metrics"])
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get(
+    "/metrics",
+    description="Метрики в текстовом формате Prometheus",
+    response_class=PlainTextResponse,
+    include_in_schema=False,
+)
+async def metrics_handler(
+    request: Request, container: Container = Depends(init_container)
+):
+    metrics_config = container.resolve(Settings).metrics_config
+    if not metrics_config.enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    if metrics_config.token is not None:
+        authorization = request.headers.get("Authorization", "")
+        if not compare_digest(authorization, f"Bearer {metrics_config.token}"):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+
+    registry: MetricsRegistry = container.resolve(MetricsRegistry)
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
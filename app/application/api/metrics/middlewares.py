@@ -0,0 +1,57 @@
+from dataclasses import dataclass, field
+from time import perf_counter
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from infra.metrics.registry import Histogram, MetricsRegistry
+from logic.init import init_container
+from settings.config import Settings
+
+
+@dataclass
+class RequestMetricsMiddleware:
+    app: ASGIApp
+    _histogram: Histogram | None = field(default=None, init=False)
+    _enabled: bool | None = field(default=None, init=False)
+
+    def _resolve(self):
+        # The lifespan builds the container, it is looked up on the first request
+        container = init_container()
+        self._enabled = container.resolve(Settings).metrics_config.enabled
+        if self._enabled:
+            self._histogram = container.resolve(MetricsRegistry).histogram(
+                name="chat_http_request_duration_seconds",
+                help="HTTP request latency by route",
+                label_names=("method", "route", "status"),
+            )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self._enabled is None:
+            self._resolve()
+        if not self._enabled:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route, its template keeps the labels bounded
+            route = scope.get("route")
+            self._histogram.labels(
+                scope["method"],
+                route.path if route is not None else "unmatched",
+                str(status),
+            ).observe(perf_counter() - started)
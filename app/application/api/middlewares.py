@@ -0,0 +1,36 @@
+from dataclasses import dataclass, field
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from infra.repositories.monitoring import MongoCommandMonitor
+from logic.init import init_container
+
+
+@dataclass
+class MongoCommandBudgetMiddleware:
+    app: ASGIApp
+    _monitor: MongoCommandMonitor | None = field(default=None, init=False)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        # Websocket connections are long lived, their endpoint tracks each message
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self._monitor is None:
+            self._monitor = init_container().resolve(MongoCommandMonitor)
+
+        monitor = self._monitor
+        with monitor.track(f"{scope['method']} {scope['path']}") as commands:
+
+            async def send_and_close(message: Message):
+                # A streamed body keeps querying after the start, those commands
+                # belong to the download and not to the request round trips
+                if message["type"] == "http.response.start":
+                    route = scope.get("route")
+                    if route is not None:
+                        commands.name = f"{scope['method']} {route.path}"
+                    monitor.close(commands)
+                await send(message)
+
+            await self.app(scope, receive, send_and_close)
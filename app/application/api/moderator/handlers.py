@@ -1,13 +1,12 @@
 from application.api.moderator.decorators import handler_exceptions
 from logic.commands.moderators import DeleteUserCommand
 from logic.commands.permissions import AccessCheckModeratorCommand
-from logic.init import init_container
+from logic.init import get_mediator
 from logic.mediator import Mediator
 
 from fastapi.routing import APIRouter
 from fastapi import Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from punq import Container
 
 router = APIRouter(tags=["Moderator"])
 http_bearer = HTTPBearer()
@@ -23,10 +22,9 @@ http_bearer = HTTPBearer()
 @handler_exceptions
 async def delete_user_handler(
     user_oid: str,
-    container: Container = Depends(init_container),
+    mediator: Mediator = Depends(get_mediator),
     credentials: HTTPAuthorizationCredentials = Depends(http_bearer),
 ) -> None:
-    mediator: Mediator = container.resolve(Mediator)
     token = credentials.credentials
     user, *_ = await mediator.handle_command(
         AccessCheckModeratorCommand(access_token=token)
@@ -6,14 +6,13 @@ from application.api.users.schemas import (
     TokenResponseSchema,
 )
 from logic.commands.users import ConfirmCodeCommand, SignInCommand, SignUpCommand
-from logic.init import init_container
+from logic.init import get_mediator
 from logic.mediator import Mediator
 
 from fastapi.routing import APIRouter
 from fastapi import status
 from fastapi import Depends
 from fastapi.security import HTTPBearer
-from punq import Container
 
 router = APIRouter(tags=["Auth"])
 http_bearer = HTTPBearer()
@@ -31,9 +30,8 @@ http_bearer = HTTPBearer()
 )
 @handler_exceptions
 async def sign_up_handler(
-    schema: SignUpRequestSchema, container: Container = Depends(init_container)
+    schema: SignUpRequestSchema, mediator: Mediator = Depends(get_mediator)
 ) -> str:
-    mediator: Mediator = container.resolve(Mediator)
     await mediator.handle_command(
         SignUpCommand(
             username=schema.username, phone=schema.phone, password=schema.password1
@@ -52,9 +50,8 @@ async def sign_up_handler(
 )
 @handler_exceptions
 async def confirm_handler(
-    schema: ConfirmCodeRequestSchema, container: Container = Depends(init_container)
+    schema: ConfirmCodeRequestSchema, mediator: Mediator = Depends(get_mediator)
 ) -> TokenResponseSchema:
-    mediator: Mediator = container.resolve(Mediator)
     token, *_ = await mediator.handle_command(
         ConfirmCodeCommand(phone=schema.phone, code=schema.code)
     )
@@ -74,9 +71,8 @@ async def confirm_handler(
 @handler_exceptions
 async def sign_in_handler(
     schema: SignInRequestSchema,
-    container: Container = Depends(init_container),
+    mediator: Mediator = Depends(get_mediator),
 ):
-    mediator: Mediator = container.resolve(Mediator)
     token, *_ = await mediator.handle_command(
         SignInCommand(phone=schema.phone, password=schema.password)
     )
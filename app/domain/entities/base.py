@@ -4,7 +4,7 @@ from datetime import datetime
 from uuid import uuid4
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class BaseEntity(ABC):
     oid: str = field(default_factory=lambda: str(uuid4()), kw_only=True)
     created_at: datetime = field(default_factory=datetime.now, kw_only=True)
@@ -5,21 +5,32 @@ from domain.entities.users import User
 from domain.values.messages import Text, Title
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class Message(BaseEntity):
     text: Text
     sender_oid: str
     chat_oid: str
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class Chat(BaseEntity):
     title: Title
     messages: set[Message] = field(default_factory=set, kw_only=True)
     users: set[User] = field(default_factory=set, kw_only=True)
+    messages_count: int = field(default=0, kw_only=True)
+    last_message: Message | None = field(default=None, kw_only=True)
 
     def add_message(self, message: Message):
         self.messages.add(message)
+        self.track_message(message)
+
+    def track_message(self, message: Message):
+        self.messages_count += 1
+
+        if self.last_message is None or (
+            message.created_at >= self.last_message.created_at
+        ):
+            self.last_message = message
 
     def add_user(self, user: User):
         self.users.add(user)
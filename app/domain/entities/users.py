@@ -4,7 +4,7 @@ from domain.entities.base import BaseEntity
 from domain.values.users import Phone, Username, Password
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class User(BaseEntity):
     username: Username
     credentials: "Credentials"
@@ -13,7 +13,7 @@ class User(BaseEntity):
     is_moderator: bool = field(default=False, kw_only=True)
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class Credentials(BaseEntity):
     phone: Phone
-    password: Password
+    password: Password | None = None
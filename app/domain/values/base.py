@@ -1,11 +1,11 @@
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
-from typing import Any, Generic, TypeVar
+from typing import Any, Generic, Self, TypeVar
 
 VT = TypeVar("VT", bound=Any)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BaseValue(ABC, Generic[VT]):
     value: VT
 
@@ -14,3 +14,14 @@ class BaseValue(ABC, Generic[VT]):
 
     @abstractmethod
     def validate(self): ...
+
+    @classmethod
+    def from_trusted(cls, value: VT) -> Self:
+        # Values loaded from storage were validated when they were first written
+        instance = object.__new__(cls)
+        _set_value(instance, value)
+        return instance
+
+
+# Writes the slot directly, bypassing the frozen __setattr__
+_set_value = BaseValue.value.__set__
@@ -8,7 +8,7 @@ from domain.exceptions.messages import (
 from domain.values.base import BaseValue
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Text(BaseValue):
     value: str
 
@@ -20,7 +20,7 @@ class Text(BaseValue):
         return str(self.value)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Title(BaseValue):
     value: str
 
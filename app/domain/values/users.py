@@ -10,7 +10,7 @@ from domain.exceptions.users import (
 from domain.values.base import BaseValue
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Username(BaseValue):
     value: str
 
@@ -19,7 +19,7 @@ class Username(BaseValue):
             raise EmptyUsernameException()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Phone(BaseValue):
     value: str
 
@@ -33,7 +33,7 @@ class Phone(BaseValue):
         #     raise FormatPhoneException(self.value)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Password(BaseValue):
     value: bytes
 
@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+from domain.entities.users import User
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+@dataclass
+class BaseUserIdentityCache(ABC):
+    @abstractmethod
+    async def get(self, user_oid: str) -> User | None: ...
+
+    @abstractmethod
+    async def set(self, user: User): ...
+
+    @abstractmethod
+    async def invalidate(self, user_oid: str): ...
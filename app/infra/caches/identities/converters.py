@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from domain.entities.users import Credentials, User
+from domain.values.users import Phone, Username
+from infra.caches.identities.documents import UserIdentityDocument
+
+
+def convert_user_entity_to_identity_document(user: User) -> UserIdentityDocument:
+    return UserIdentityDocument(
+        oid=user.oid,
+        created_at=user.created_at.isoformat(),
+        username=user.username.value,
+        phone=user.credentials.phone.value,
+        credentials_oid=user.credentials.oid,
+        credentials_created_at=user.credentials.created_at.isoformat(),
+        is_confirmed=user.is_confirmed,
+        is_blocked=user.is_blocked,
+        is_moderator=user.is_moderator,
+    )
+
+
+def convert_identity_document_to_user_entity(document: UserIdentityDocument) -> User:
+    return User(
+        username=Username.from_trusted(document["username"]),
+        credentials=Credentials(
+            phone=Phone.from_trusted(document["phone"]),
+            oid=document["credentials_oid"],
+            created_at=datetime.fromisoformat(document["credentials_created_at"]),
+        ),
+        oid=document["oid"],
+        created_at=datetime.fromisoformat(document["created_at"]),
+        is_confirmed=document["is_confirmed"],
+        is_blocked=document["is_blocked"],
+        is_moderator=document["is_moderator"],
+    )
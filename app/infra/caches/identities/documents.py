@@ -0,0 +1,13 @@
+from typing import TypedDict
+
+
+class UserIdentityDocument(TypedDict):
+    oid: str
+    created_at: str
+    username: str
+    phone: str
+    credentials_oid: str
+    credentials_created_at: str
+    is_confirmed: bool
+    is_blocked: bool
+    is_moderator: bool
@@ -0,0 +1,39 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from time import monotonic
+
+from domain.entities.users import User
+from infra.caches.identities.base import BaseUserIdentityCache, CacheStats
+
+
+@dataclass
+class MemoryUserIdentityCache(BaseUserIdentityCache):
+    max_size: int = 10_000
+    expire_seconds: float = 5
+    stats: CacheStats = field(default_factory=CacheStats, kw_only=True)
+    _entries: OrderedDict[str, tuple[float, User]] = field(
+        default_factory=OrderedDict, kw_only=True
+    )
+
+    async def get(self, user_oid: str) -> User | None:
+        entry = self._entries.get(user_oid)
+
+        if entry is None or entry[0] <= monotonic():
+            self._entries.pop(user_oid, None)
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(user_oid)
+        self.stats.hits += 1
+        return entry[1]
+
+    async def set(self, user: User):
+        identity = replace(user, credentials=replace(user.credentials, password=None))
+        self._entries[user.oid] = (monotonic() + self.expire_seconds, identity)
+        self._entries.move_to_end(user.oid)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def invalidate(self, user_oid: str):
+        self._entries.pop(user_oid, None)
@@ -0,0 +1,48 @@
+import json
+from dataclasses import dataclass, field
+
+from redis.exceptions import RedisError
+
+from domain.entities.users import User
+from infra.caches.identities.base import BaseUserIdentityCache, CacheStats
+from infra.caches.identities.converters import (
+    convert_identity_document_to_user_entity,
+    convert_user_entity_to_identity_document,
+)
+from infra.caches.users.redis import BaseRedisUserCache
+from infra.exceptions.caches import IdentityCacheUnavailableException
+
+
+@dataclass
+class RedisUserIdentityCache(BaseRedisUserCache, BaseUserIdentityCache):
+    expire_seconds: int = 300
+    key_prefix: str = "user-identity"
+    stats: CacheStats = field(default_factory=CacheStats, kw_only=True)
+
+    def _key(self, user_oid: str) -> str:
+        return f"{self.key_prefix}:{user_oid}"
+
+    async def get(self, user_oid: str) -> User | None:
+        try:
+            raw_document: bytes | None = await self._cache.get(self._key(user_oid))
+        except RedisError as error:
+            raise IdentityCacheUnavailableException() from error
+
+        if raw_document is None:
+            self.stats.misses += 1
+            return None
+
+        self.stats.hits += 1
+        return convert_identity_document_to_user_entity(json.loads(raw_document))
+
+    async def set(self, user: User):
+        document = convert_user_entity_to_identity_document(user)
+        try:
+            await self._cache.set(
+                self._key(user.oid), json.dumps(document), ex=self.expire_seconds
+            )
+        except RedisError as error:
+            raise IdentityCacheUnavailableException() from error
+
+    async def invalidate(self, user_oid: str):
+        await self._cache.delete(self._key(user_oid))
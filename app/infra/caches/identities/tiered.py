@@ -0,0 +1,33 @@
+from dataclasses import dataclass, field
+
+from domain.entities.users import User
+from infra.caches.identities.base import BaseUserIdentityCache, CacheStats
+
+
+@dataclass
+class TieredUserIdentityCache(BaseUserIdentityCache):
+    local_cache: BaseUserIdentityCache
+    remote_cache: BaseUserIdentityCache
+    stats: CacheStats = field(default_factory=CacheStats, kw_only=True)
+
+    async def get(self, user_oid: str) -> User | None:
+        user = await self.local_cache.get(user_oid)
+
+        if user is None:
+            user = await self.remote_cache.get(user_oid)
+            if user is not None:
+                await self.local_cache.set(user)
+
+        if user is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return user
+
+    async def set(self, user: User):
+        await self.remote_cache.set(user)
+        await self.local_cache.set(user)
+
+    async def invalidate(self, user_oid: str):
+        await self.remote_cache.invalidate(user_oid)
+        await self.local_cache.invalidate(user_oid)
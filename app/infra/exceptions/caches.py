@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+
+from infra.exceptions.base import InfraException
+
+
+@dataclass(eq=False)
+class IdentityCacheUnavailableException(InfraException):
+    @property
+    def message(self):
+        return "Identity cache is unavailable"
@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+
+from infra.exceptions.base import InfraException
+
+
+@dataclass(eq=False)
+class QueryNotIndexedException(InfraException):
+    collection_name: str
+    query_name: str
+
+    @property
+    def message(self):
+        return (
+            f"Query {self.query_name} on collection {self.collection_name} "
+            "runs a collection scan"
+        )
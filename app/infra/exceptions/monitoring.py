@@ -0,0 +1,17 @@
+from dataclasses import dataclass
+
+from infra.exceptions.base import InfraException
+
+
+@dataclass(eq=False)
+class CommandBudgetExceededException(InfraException):
+    scope_name: str
+    count: int
+    budget: int
+
+    @property
+    def message(self):
+        return (
+            f"{self.scope_name} ran {self.count} mongo commands, "
+            f"the budget is {self.budget}"
+        )
@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+
+from infra.exceptions.base import InfraException
+
+
+@dataclass(eq=False)
+class UserAlreadyExistsException(InfraException):
+    phone: str
+
+    @property
+    def message(self):
+        return f"User with phone {self.phone} already exists"
+
+
+@dataclass(eq=False)
+class UnsupportedSnapshotVersionException(InfraException):
+    version: int
+
+    @property
+    def message(self):
+        return f"Unsupported users snapshot version {self.version}"
@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+
+from infra.exceptions.base import InfraException
+
+
+@dataclass(eq=False)
+class ConnectionLimitExceededException(InfraException):
+    max_connections: int
+
+    @property
+    def message(self):
+        return f"Connection limit of {self.max_connections} sockets reached"
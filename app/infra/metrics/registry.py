@@ -0,0 +1,134 @@
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Callable, Literal
+
+
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+@dataclass(eq=False, slots=True)
+class HistogramChild:
+    bounds: tuple[float, ...]
+    counts: list[int]
+    sum: float = 0.0
+    count: int = 0
+
+    def observe(self, value: float):
+        # Buckets are stored per slot and accumulated only when rendered
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+@dataclass(eq=False)
+class Histogram:
+    name: str
+    help: str
+    label_names: tuple[str, ...] = ()
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    children: dict[tuple[str, ...], HistogramChild] = field(
+        default_factory=dict, init=False
+    )
+
+    def labels(self, *values: str) -> HistogramChild:
+        child = self.children.get(values)
+        if child is None:
+            child = self.children[values] = HistogramChild(
+                bounds=self.buckets, counts=[0] * (len(self.buckets) + 1)
+            )
+        return child
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for values, child in self.children.items():
+            labels = _format_labels(self.label_names, values)
+            prefix = f"{labels}," if labels else ""
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), child.counts):
+                cumulative += count
+                lines.append(
+                    f'{self.name}_bucket{{{prefix}le="{_format_value(bound)}"}} '
+                    f"{cumulative}"
+                )
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{self.name}_sum{suffix} {_format_value(child.sum)}")
+            lines.append(f"{self.name}_count{suffix} {child.count}")
+        return lines
+
+
+@dataclass(eq=False)
+class CallbackMetric:
+    # Read only when scraped, so the observed code pays nothing
+    name: str
+    help: str
+    callback: Callable[[], float]
+    type: Literal["gauge", "counter"] = "gauge"
+
+    def render(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.help}",
+            f"# TYPE {self.name} {self.type}",
+            f"{self.name} {_format_value(self.callback())}",
+        ]
+
+
+@dataclass(eq=False)
+class MetricsRegistry:
+    metrics: dict[str, Histogram | CallbackMetric] = field(default_factory=dict)
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        label_names: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = Histogram(
+                name=name, help=help, label_names=label_names, buckets=buckets
+            )
+        return metric
+
+    def gauge(self, name: str, help: str, callback: Callable[[], float]):
+        self.metrics[name] = CallbackMetric(name=name, help=help, callback=callback)
+
+    def counter(self, name: str, help: str, callback: Callable[[], float]):
+        self.metrics[name] = CallbackMetric(
+            name=name, help=help, callback=callback, type="counter"
+        )
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,177 @@
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass
+from time import perf_counter
+
+from domain.entities.messages import Chat, Message
+from domain.entities.users import User
+from infra.metrics.registry import Histogram
+from infra.repositories.filters.messages import GetMessagesFilters
+from infra.repositories.messages.base import BaseChatRepository, BaseMessageRepository
+from infra.repositories.users.base import BaseUserRepository
+
+
+@dataclass
+class BaseInstrumentedRepository:
+    histogram: Histogram
+    name: str
+
+    def _observe(self, method: str, started: float):
+        self.histogram.labels(self.name, method).observe(perf_counter() - started)
+
+
+@dataclass
+class InstrumentedChatRepository(BaseInstrumentedRepository, BaseChatRepository):
+    repository: BaseChatRepository
+
+    async def add_chat(self, chat: Chat):
+        started = perf_counter()
+        try:
+            return await self.repository.add_chat(chat)
+        finally:
+            self._observe("add_chat", started)
+
+    async def get_chat_by_chat_oid(self, chat_oid: str) -> Chat | None:
+        started = perf_counter()
+        try:
+            return await self.repository.get_chat_by_chat_oid(chat_oid)
+        finally:
+            self._observe("get_chat_by_chat_oid", started)
+
+    async def delete_chat_by_chat_oid(self, chat_oid: str):
+        started = perf_counter()
+        try:
+            return await self.repository.delete_chat_by_chat_oid(chat_oid)
+        finally:
+            self._observe("delete_chat_by_chat_oid", started)
+
+    async def get_chats_by_user_oid(self, user_oid: str) -> Iterable[Chat]:
+        started = perf_counter()
+        try:
+            return await self.repository.get_chats_by_user_oid(user_oid)
+        finally:
+            self._observe("get_chats_by_user_oid", started)
+
+    async def add_user_to_chat(self, user: User, chat: Chat):
+        started = perf_counter()
+        try:
+            return await self.repository.add_user_to_chat(user=user, chat=chat)
+        finally:
+            self._observe("add_user_to_chat", started)
+
+
+@dataclass
+class InstrumentedMessageRepository(BaseInstrumentedRepository, BaseMessageRepository):
+    repository: BaseMessageRepository
+
+    async def add_message(self, message: Message):
+        started = perf_counter()
+        try:
+            return await self.repository.add_message(message)
+        finally:
+            self._observe("add_message", started)
+
+    async def insert_messages(self, messages: list[Message]):
+        started = perf_counter()
+        try:
+            return await self.repository.insert_messages(messages)
+        finally:
+            self._observe("insert_messages", started)
+
+    async def update_chat_counters(self, messages: list[Message]):
+        started = perf_counter()
+        try:
+            return await self.repository.update_chat_counters(messages)
+        finally:
+            self._observe("update_chat_counters", started)
+
+    async def get_messages_by_chat_oid(
+        self, chat_oid: str, filters: GetMessagesFilters
+    ) -> Iterable[Message]:
+        started = perf_counter()
+        try:
+            return await self.repository.get_messages_by_chat_oid(
+                chat_oid=chat_oid, filters=filters
+            )
+        finally:
+            self._observe("get_messages_by_chat_oid", started)
+
+    async def get_message_by_message_oid(self, message_oid: str) -> Message | None:
+        started = perf_counter()
+        try:
+            return await self.repository.get_message_by_message_oid(message_oid)
+        finally:
+            self._observe("get_message_by_message_oid", started)
+
+    async def iter_messages_by_chat_oid(
+        self, chat_oid: str, after: str | None = None, batch_size: int = 500
+    ) -> AsyncIterator[list[Message]]:
+        batches = self.repository.iter_messages_by_chat_oid(
+            chat_oid=chat_oid, after=after, batch_size=batch_size
+        )
+        # Each batch fetch is timed, the consumer's time between batches is not
+        try:
+            while True:
+                started = perf_counter()
+                try:
+                    batch = await anext(batches)
+                except StopAsyncIteration:
+                    return
+                finally:
+                    self._observe("iter_messages_by_chat_oid", started)
+                yield batch
+        finally:
+            await batches.aclose()
+
+
+@dataclass
+class InstrumentedUserRepository(BaseInstrumentedRepository, BaseUserRepository):
+    repository: BaseUserRepository
+
+    async def add_user(self, user: User):
+        started = perf_counter()
+        try:
+            return await self.repository.add_user(user)
+        finally:
+            self._observe("add_user", started)
+
+    async def get_user_by_user_oid(self, user_oid: str) -> User | None:
+        started = perf_counter()
+        try:
+            return await self.repository.get_user_by_user_oid(user_oid)
+        finally:
+            self._observe("get_user_by_user_oid", started)
+
+    async def delete_user_by_user_oid(self, user_oid: str):
+        started = perf_counter()
+        try:
+            return await self.repository.delete_user_by_user_oid(user_oid)
+        finally:
+            self._observe("delete_user_by_user_oid", started)
+
+    async def get_user_by_phone(self, phone: str) -> User | None:
+        started = perf_counter()
+        try:
+            return await self.repository.get_user_by_phone(phone)
+        finally:
+            self._observe("get_user_by_phone", started)
+
+    async def get_users(self, limit: int) -> list[User]:
+        started = perf_counter()
+        try:
+            return await self.repository.get_users(limit)
+        finally:
+            self._observe("get_users", started)
+
+    async def confirm_user(self, user_oid: str):
+        started = perf_counter()
+        try:
+            return await self.repository.confirm_user(user_oid)
+        finally:
+            self._observe("confirm_user", started)
+
+    async def update_user_password(self, user_oid: str, password: bytes):
+        started = perf_counter()
+        try:
+            return await self.repository.update_user_password(user_oid, password)
+        finally:
+            self._observe("update_user_password", started)
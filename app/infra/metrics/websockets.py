@@ -0,0 +1,52 @@
+from infra.metrics.registry import MetricsRegistry
+from infra.websockets.managers import ConnectionManager
+
+
+def register_connection_metrics(registry: MetricsRegistry, manager: ConnectionManager):
+    stats = manager.stats
+
+    registry.gauge(
+        "chat_websocket_connections",
+        "Open websocket connections",
+        lambda: manager.live_connections,
+    )
+    registry.gauge(
+        "chat_websocket_idle_connections",
+        "Connections with unanswered pings",
+        lambda: manager.idle_connections,
+    )
+    registry.gauge(
+        "chat_websocket_rooms",
+        "Chats with at least one open connection",
+        lambda: len(manager.registry.rooms),
+    )
+    registry.gauge(
+        "chat_websocket_queued_frames",
+        "Frames waiting in outbound queues",
+        lambda: manager.queued_frames,
+    )
+    registry.counter(
+        "chat_websocket_reaped_connections_total",
+        "Connections closed after missed pongs",
+        lambda: stats.reaped_connections,
+    )
+    registry.counter(
+        "chat_websocket_rejected_connections_total",
+        "Connections rejected by the connection limit",
+        lambda: stats.rejected_connections,
+    )
+    registry.counter(
+        "chat_websocket_evicted_frames_total",
+        "Frames dropped from full outbound queues",
+        lambda: stats.evicted_frames,
+    )
+    registry.counter(
+        "chat_websocket_overflow_disconnects_total",
+        "Connections closed because their queue overflowed",
+        lambda: stats.overflow_disconnects,
+    )
+    registry.counter(
+        "chat_websocket_failed_sends_total",
+        "Frames that failed to send",
+        lambda: stats.failed_sends,
+    )
@@ -0,0 +1,25 @@
+import asyncio
+from collections.abc import Callable, Sequence
+from typing import TypeVar
+
+
+DocumentT = TypeVar("DocumentT")
+EntityT = TypeVar("EntityT")
+
+CONVERT_CHUNK_SIZE = 1_000
+
+
+async def convert_in_chunks(
+    items: Sequence[DocumentT],
+    convert: Callable[[Sequence[DocumentT]], list[EntityT]],
+    chunk_size: int = CONVERT_CHUNK_SIZE,
+) -> list[EntityT]:
+    if len(items) <= chunk_size:
+        return convert(items)
+
+    # Large batches give the event loop a turn between chunks
+    converted = []
+    for start in range(0, len(items), chunk_size):
+        converted.extend(convert(items[start : start + chunk_size]))
+        await asyncio.sleep(0)
+    return converted
@@ -31,5 +31,6 @@ class ChatDocument(TypedDict):
     oid: str
     title: str
     created_at: datetime
-    messages: list[str]
     users: list[str]
+    messages_count: int
+    last_message: MessageDocument | None
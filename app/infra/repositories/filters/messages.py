@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class GetMessagesFilters:
+    limit: int = 50
+    before: str | None = None
+    after: str | None = None
@@ -0,0 +1,139 @@
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+from motor.core import AgnosticClient
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from infra.exceptions.indexes import QueryNotIndexedException
+from settings.config import MongoConfig
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    name: str
+    keys: tuple[tuple[str, int], ...]
+    unique: bool = False
+
+    def to_index_model(self) -> IndexModel:
+        return IndexModel(list(self.keys), name=self.name, unique=self.unique)
+
+
+@dataclass(frozen=True)
+class QuerySpec:
+    name: str
+    filter: dict[str, Any]
+    sort: tuple[tuple[str, int], ...] = ()
+
+
+@dataclass(frozen=True)
+class CollectionIndexes:
+    indexes: tuple[IndexSpec, ...]
+    queries: tuple[QuerySpec, ...] = ()
+
+
+USER_INDEXES = CollectionIndexes(
+    indexes=(
+        IndexSpec(name="oid", keys=(("oid", ASCENDING),), unique=True),
+        IndexSpec(
+            name="credentials_phone",
+            keys=(("credentials.phone", ASCENDING),),
+            unique=True,
+        ),
+    ),
+    queries=(
+        QuerySpec(name="get_user_by_user_oid", filter={"oid": ""}),
+        QuerySpec(name="get_user_by_phone", filter={"credentials.phone": ""}),
+    ),
+)
+
+CHAT_INDEXES = CollectionIndexes(
+    indexes=(
+        IndexSpec(name="oid", keys=(("oid", ASCENDING),), unique=True),
+        IndexSpec(name="users", keys=(("users", ASCENDING),)),
+    ),
+    queries=(
+        QuerySpec(name="get_chat_by_chat_oid", filter={"oid": ""}),
+        QuerySpec(name="get_chats_by_user_oid", filter={"users": ""}),
+    ),
+)
+
+MESSAGE_INDEXES = CollectionIndexes(
+    indexes=(
+        IndexSpec(name="oid", keys=(("oid", ASCENDING),), unique=True),
+        IndexSpec(
+            name="chat_oid_created_at_oid",
+            keys=(
+                ("chat_oid", ASCENDING),
+                ("created_at", ASCENDING),
+                ("oid", ASCENDING),
+            ),
+        ),
+    ),
+    queries=(
+        QuerySpec(name="get_message_by_message_oid", filter={"oid": ""}),
+        QuerySpec(
+            name="get_messages_by_chat_oid",
+            filter={"chat_oid": ""},
+            sort=(("created_at", DESCENDING), ("oid", DESCENDING)),
+        ),
+        QuerySpec(
+            name="iter_messages_by_chat_oid",
+            filter={"chat_oid": ""},
+            sort=(("created_at", ASCENDING), ("oid", ASCENDING)),
+        ),
+    ),
+)
+
+
+def build_index_registry(mongo_config: MongoConfig) -> dict[str, CollectionIndexes]:
+    return {
+        mongo_config.mongodb_user_collection: USER_INDEXES,
+        mongo_config.mongodb_chat_collection: CHAT_INDEXES,
+        mongo_config.mongodb_message_collection: MESSAGE_INDEXES,
+    }
+
+
+def iter_plan_stages(plan: Any) -> Iterator[str]:
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from iter_plan_stages(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            yield from iter_plan_stages(value)
+
+
+def is_collection_scan(explain: dict) -> bool:
+    winning_plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+    return "COLLSCAN" in iter_plan_stages(winning_plan)
+
+
+@dataclass
+class MongoDBIndexManager:
+    mongo_db_client: AgnosticClient
+    mongo_db_name: str
+    registry: dict[str, CollectionIndexes] = field(default_factory=dict)
+
+    def _collection(self, collection_name: str):
+        return self.mongo_db_client[self.mongo_db_name][collection_name]
+
+    async def apply(self):
+        # createIndexes is a no-op for indexes that already exist with the same spec
+        for collection_name, collection_indexes in self.registry.items():
+            await self._collection(collection_name).create_indexes(
+                [index.to_index_model() for index in collection_indexes.indexes]
+            )
+
+    async def verify(self):
+        for collection_name, collection_indexes in self.registry.items():
+            collection = self._collection(collection_name)
+            for query in collection_indexes.queries:
+                cursor = collection.find(query.filter).limit(1)
+                if query.sort:
+                    cursor = cursor.sort(list(query.sort))
+
+                if is_collection_scan(await cursor.explain()):
+                    raise QueryNotIndexedException(
+                        collection_name=collection_name, query_name=query.name
+                    )
@@ -1,10 +1,11 @@
 from abc import ABC, abstractmethod
-from collections.abc import Iterable
+from collections.abc import AsyncIterator, Iterable
 from dataclasses import dataclass
 
 
 from domain.entities.messages import Chat, Message
 from domain.entities.users import User
+from infra.repositories.filters.messages import GetMessagesFilters
 
 
 @dataclass
@@ -31,7 +32,25 @@ class BaseMessageRepository(ABC):
     async def add_message(self, message: Message): ...
 
     @abstractmethod
-    async def get_messages_by_chat_oid(self, chat_oid: str) -> Iterable[Message]: ...
+    async def insert_messages(self, messages: list[Message]): ...
+
+    @abstractmethod
+    async def update_chat_counters(self, messages: list[Message]): ...
+
+    async def add_messages(self, messages: list[Message]):
+        # Two steps, so a writer can retry each of them on its own
+        await self.insert_messages(messages)
+        await self.update_chat_counters(messages)
+
+    @abstractmethod
+    async def get_messages_by_chat_oid(
+        self, chat_oid: str, filters: GetMessagesFilters
+    ) -> Iterable[Message]: ...
 
     @abstractmethod
     async def get_message_by_message_oid(self, message_oid: str) -> Message: ...
+
+    @abstractmethod
+    def iter_messages_by_chat_oid(
+        self, chat_oid: str, after: str | None = None, batch_size: int = 500
+    ) -> AsyncIterator[list[Message]]: ...
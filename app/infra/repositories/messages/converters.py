@@ -1,3 +1,5 @@
+from collections.abc import Iterable
+
 from domain.entities.messages import Chat, Message
 from domain.values.messages import Text, Title
 from infra.repositories.documents import (
@@ -6,31 +8,50 @@ from infra.repositories.documents import (
 )
 
 
-async def convert_chat_entity_to_document(chat: Chat) -> ChatDocument:
+def convert_chat_entity_to_document(chat: Chat) -> ChatDocument:
     return ChatDocument(
         oid=chat.oid,
         title=chat.title.value,
         created_at=chat.created_at,
         users=[user.oid for user in chat.users],
-        messages=[message.oid for message in chat.messages],
+        messages_count=chat.messages_count,
+        last_message=(
+            convert_message_entity_to_document(chat.last_message)
+            if chat.last_message
+            else None
+        ),
     )
 
 
-async def convert_chat_document_to_entity(chat_document: ChatDocument) -> Chat:
+def convert_chat_document_to_entity(chat_document: ChatDocument) -> Chat:
     return Chat(
-        title=Title(value=chat_document["title"]),
+        title=Title.from_trusted(chat_document["title"]),
         oid=chat_document["oid"],
         created_at=chat_document["created_at"],
         users=set(user_oid for user_oid in chat_document["users"]),
-        messages=set(message_oid for message_oid in chat_document["messages"]),
+        messages_count=chat_document.get("messages_count", 0),
+        last_message=(
+            convert_message_document_to_entity(chat_document["last_message"])
+            if chat_document.get("last_message")
+            else None
+        ),
     )
 
 
-async def convert_message_document_to_entity(
+def convert_chat_documents_to_entities(
+    chat_documents: Iterable[ChatDocument],
+) -> list[Chat]:
+    return [
+        convert_chat_document_to_entity(chat_document)
+        for chat_document in chat_documents
+    ]
+
+
+def convert_message_document_to_entity(
     message_document: MessageDocument,
 ) -> Message:
     return Message(
-        text=Text(value=message_document["text"]),
+        text=Text.from_trusted(message_document["text"]),
         sender_oid=message_document["sender_oid"],
         chat_oid=message_document["chat_oid"],
         oid=message_document["oid"],
@@ -38,7 +59,16 @@ async def convert_message_document_to_entity(
     )
 
 
-async def convert_message_entity_to_document(message: Message) -> MessageDocument:
+def convert_message_documents_to_entities(
+    message_documents: Iterable[MessageDocument],
+) -> list[Message]:
+    return [
+        convert_message_document_to_entity(message_document)
+        for message_document in message_documents
+    ]
+
+
+def convert_message_entity_to_document(message: Message) -> MessageDocument:
     return MessageDocument(
         oid=message.oid,
         created_at=message.created_at,
@@ -46,3 +76,9 @@ async def convert_message_entity_to_document(message: Message) -> MessageDocumen
         chat_oid=message.chat_oid,
         sender_oid=message.sender_oid,
     )
+
+
+def convert_message_entities_to_documents(
+    messages: Iterable[Message],
+) -> list[MessageDocument]:
+    return [convert_message_entity_to_document(message) for message in messages]
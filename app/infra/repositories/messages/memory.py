@@ -1,60 +1,183 @@
-from dataclasses import dataclass
+from bisect import bisect_left, bisect_right
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
 
 from domain.entities.messages import Chat, Message
 from domain.entities.users import User
+from infra.repositories.filters.messages import GetMessagesFilters
 from infra.repositories.messages.base import BaseChatRepository, BaseMessageRepository
 
 
-_local_storage: list[Chat] = []
+@dataclass
+class MessageLog:
+    messages: list[Message] = field(default_factory=list)
+    keys: list[tuple[datetime, str]] = field(default_factory=list)
+
+    def append(self, message: Message):
+        key = (message.created_at, message.oid)
+
+        # Messages almost always arrive in time order, late ones are put in place
+        if not self.keys or key >= self.keys[-1]:
+            self.messages.append(message)
+            self.keys.append(key)
+            return
+
+        index = bisect_right(self.keys, key)
+        self.messages.insert(index, message)
+        self.keys.insert(index, key)
+
+    def before(self, cursor: Message | None, limit: int) -> list[Message]:
+        if cursor is None:
+            end = len(self.keys)
+        else:
+            end = bisect_left(self.keys, (cursor.created_at, cursor.oid))
+        return self.messages[max(end - limit, 0) : end]
+
+    def after(self, cursor: Message | None, limit: int) -> list[Message]:
+        if cursor is None:
+            start = 0
+        else:
+            start = bisect_right(self.keys, (cursor.created_at, cursor.oid))
+        return self.messages[start : start + limit]
+
+
+@dataclass
+class MemoryChatStorage:
+    chats: dict[str, Chat] = field(default_factory=dict)
+    user_chats: dict[str, dict[str, None]] = field(default_factory=dict)
+    messages: dict[str, Message] = field(default_factory=dict)
+    logs: dict[str, MessageLog] = field(default_factory=dict)
+
+    def add_chat(self, chat: Chat):
+        self.chats[chat.oid] = chat
+        self.logs.setdefault(chat.oid, MessageLog())
+        for user in chat.users:
+            self.user_chats.setdefault(user.oid, {})[chat.oid] = None
+
+    def add_user_to_chat(self, user: User, chat: Chat):
+        chat.add_user(user)
+        self.user_chats.setdefault(user.oid, {})[chat.oid] = None
+
+    def delete_chat(self, chat_oid: str):
+        chat = self.chats.pop(chat_oid, None)
+        if chat is None:
+            return
+
+        for user in chat.users:
+            chat_oids = self.user_chats.get(user.oid, {})
+            chat_oids.pop(chat_oid, None)
+            if not chat_oids:
+                self.user_chats.pop(user.oid, None)
+
+        for message in self.logs.pop(chat_oid, MessageLog()).messages:
+            del self.messages[message.oid]
+
+    def get_chats_by_user_oid(self, user_oid: str) -> list[Chat]:
+        return [self.chats[chat_oid] for chat_oid in self.user_chats.get(user_oid, ())]
+
+    def insert_message(self, message: Message):
+        # Logs live as long as their chat, messages of unknown or deleted chats
+        # would never be cleaned up
+        log = self.logs.get(message.chat_oid)
+        if log is None or message.oid in self.messages:
+            return
+
+        self.messages[message.oid] = message
+        log.append(message)
+
+    def track_message(self, message: Message):
+        chat = self.chats.get(message.chat_oid)
+        if chat is not None:
+            chat.track_message(message)
+
+    def add_message(self, message: Message):
+        self.insert_message(message)
+        self.track_message(message)
+
+    def get_messages(self, chat_oid: str, filters: GetMessagesFilters) -> list[Message]:
+        log = self.logs.get(chat_oid)
+        if log is None:
+            return []
+
+        cursor = None
+        cursor_oid = filters.before or filters.after
+        if cursor_oid is not None:
+            cursor = self.messages.get(cursor_oid)
+            if cursor is None or cursor.chat_oid != chat_oid:
+                return []
+
+        if filters.after is not None:
+            return log.after(cursor, filters.limit)
+        return log.before(cursor, filters.limit)
+
+    def iter_messages(
+        self, chat_oid: str, after: str | None, batch_size: int
+    ) -> Iterator[list[Message]]:
+        log = self.logs.get(chat_oid)
+        if log is None:
+            return
+
+        cursor = None
+        if after is not None:
+            cursor = self.messages.get(after)
+            if cursor is None or cursor.chat_oid != chat_oid:
+                return
+
+        # Each batch continues from the last key, so concurrent writes are not skipped
+        while batch := log.after(cursor, batch_size):
+            yield batch
+            cursor = batch[-1]
 
 
 @dataclass
 class MemoryChatRepository(BaseChatRepository):
+    storage: MemoryChatStorage
+
     async def add_chat(self, chat: Chat):
-        _local_storage.append(chat)
+        self.storage.add_chat(chat)
 
     async def get_chat_by_chat_oid(self, chat_oid: str) -> Chat | None:
-        try:
-            return next(chat for chat in _local_storage if chat.oid == chat_oid)
-        except StopIteration:
-            return None
+        return self.storage.chats.get(chat_oid)
 
     async def delete_chat_by_chat_oid(self, chat_oid: str):
-        for chat in _local_storage:
-            if chat.oid == chat_oid:
-                _local_storage.remove(chat)
-                break
+        self.storage.delete_chat(chat_oid)
 
     async def get_chats_by_user_oid(self, user_oid: str) -> list[Chat]:
-        chats = []
-        for chat in _local_storage:
-            for user in chat.users:
-                if user.oid == user_oid:
-                    chats.append(chat)
-                    break
-        return chats
+        return self.storage.get_chats_by_user_oid(user_oid)
 
     async def add_user_to_chat(self, user: User, chat: Chat):
         if user not in chat.users and len(chat.users) < 2:
-            chat.users.add(user)
+            self.storage.add_user_to_chat(user=user, chat=chat)
 
 
 @dataclass
 class MemoryMessageRepository(BaseMessageRepository):
+    storage: MemoryChatStorage
+
     async def add_message(self, message: Message):
-        chat = next(chat for chat in _local_storage if chat.oid == message.chat_oid)
-        chat.add_message(message)
-
-    async def get_message_by_message_oid(self, message_oid: str) -> Message:
-        for chat in _local_storage:
-            for message in chat.messages:
-                if message.oid == message_oid:
-                    return message
-
-    async def get_messages_by_chat_oid(self, chat_oid) -> list[Message]:
-        return [
-            message
-            for chat in _local_storage
-            if chat.oid == chat_oid
-            for message in chat.messages
-        ]
+        self.storage.add_message(message)
+
+    async def insert_messages(self, messages: list[Message]):
+        for message in messages:
+            self.storage.insert_message(message)
+
+    async def update_chat_counters(self, messages: list[Message]):
+        for message in messages:
+            self.storage.track_message(message)
+
+    async def get_message_by_message_oid(self, message_oid: str) -> Message | None:
+        return self.storage.messages.get(message_oid)
+
+    async def get_messages_by_chat_oid(
+        self, chat_oid: str, filters: GetMessagesFilters
+    ) -> list[Message]:
+        return self.storage.get_messages(chat_oid=chat_oid, filters=filters)
+
+    async def iter_messages_by_chat_oid(
+        self, chat_oid: str, after: str | None = None, batch_size: int = 500
+    ) -> AsyncIterator[list[Message]]:
+        for batch in self.storage.iter_messages(
+            chat_oid=chat_oid, after=after, batch_size=batch_size
+        ):
+            yield batch
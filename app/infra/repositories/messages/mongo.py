@@ -1,20 +1,61 @@
 from abc import ABC
+from collections import Counter
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
+from datetime import datetime
+from functools import cached_property
 
 from motor.core import AgnosticClient, AgnosticCollection
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from pymongo.errors import BulkWriteError
 
 from domain.entities.messages import Chat, Message
 from domain.entities.users import User
-from infra.repositories.documents import ChatDocument
+from infra.repositories.converters import convert_in_chunks
+from infra.repositories.documents import MessageDocument
+from infra.repositories.filters.messages import GetMessagesFilters
 from infra.repositories.messages.base import BaseChatRepository, BaseMessageRepository
 from infra.repositories.messages.converters import (
     convert_chat_document_to_entity,
+    convert_chat_documents_to_entities,
     convert_chat_entity_to_document,
     convert_message_document_to_entity,
+    convert_message_documents_to_entities,
+    convert_message_entities_to_documents,
     convert_message_entity_to_document,
 )
-from infra.repositories.users.converters import convert_user_document_to_entity
-from settings.config import MongoConfig
+from infra.repositories.users.converters import convert_user_documents_to_entities
+
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+def build_chat_counters_update(
+    last_message: MessageDocument, messages_count: int
+) -> list[dict]:
+    # Pipeline update so that a late write never replaces a newer last message
+    last_message = {key: value for key, value in last_message.items() if key != "_id"}
+    return [
+        {
+            "$set": {
+                "messages_count": {
+                    "$add": [{"$ifNull": ["$messages_count", 0]}, messages_count]
+                },
+                "last_message": {
+                    "$cond": [
+                        {
+                            "$gte": [
+                                last_message["created_at"],
+                                {"$ifNull": ["$last_message.created_at", datetime.min]},
+                            ]
+                        },
+                        {"$literal": last_message},
+                        "$last_message",
+                    ]
+                },
+            }
+        }
+    ]
 
 
 @dataclass
@@ -23,60 +64,76 @@ class BaseMongoDBRepository(ABC):
     mongo_db_name: str
     mongo_db_collection_name: str
 
-    @property
-    def _collection(self):
-        return self.mongo_db_client[self.mongo_db_name][self.mongo_db_collection_name]
+    def _get_collection(self, collection_name: str) -> AgnosticCollection:
+        return self.mongo_db_client[self.mongo_db_name][collection_name]
+
+    @cached_property
+    def _collection(self) -> AgnosticCollection:
+        return self._get_collection(self.mongo_db_collection_name)
 
 
 @dataclass
 class MongoDBChatRepository(BaseChatRepository, BaseMongoDBRepository):
-    async def _get_user_by_user_oid(self, user_oid: str) -> User:
-        user_document = await self.mongo_db_client[self.mongo_db_name][
-            MongoConfig().mongodb_user_collection
-        ].find_one(filter={"oid": user_oid})
-        return await convert_user_document_to_entity(user_document)
-
-    async def _get_message_by_message_oid(self, message_oid: str) -> Message:
-        message_document = await self.mongo_db_client[self.mongo_db_name][
-            MongoConfig().mongodb_message_collection
-        ].find_one(filter={"oid": message_oid})
-        return await convert_message_document_to_entity(message_document)
+    mongo_db_user_collection_name: str
+
+    @cached_property
+    def _user_collection(self) -> AgnosticCollection:
+        return self._get_collection(self.mongo_db_user_collection_name)
+
+    async def _get_users_by_user_oids(self, user_oids: list[str]) -> list[User]:
+        if not user_oids:
+            return []
+
+        user_documents = await self._user_collection.find(
+            {"oid": {"$in": user_oids}}
+        ).to_list(length=None)
+        return await convert_in_chunks(
+            user_documents, convert_user_documents_to_entities
+        )
 
     async def add_chat(self, chat: Chat):
-        await self._collection.insert_one(await convert_chat_entity_to_document(chat))
+        await self._collection.insert_one(convert_chat_entity_to_document(chat))
 
     async def get_chat_by_chat_oid(self, chat_oid: str) -> Chat | None:
         chat_document = await self._collection.find_one(filter={"oid": chat_oid})
         if chat_document:
-            users = [
-                await self._get_user_by_user_oid(user_oid)
-                for user_oid in chat_document["users"]
-            ]
-            messages = [
-                await self._get_message_by_message_oid(message_oid)
-                for message_oid in chat_document["messages"]
-            ]
+            users = await self._get_users_by_user_oids(chat_document["users"])
 
-            chat = await convert_chat_document_to_entity(chat_document)
+            chat = convert_chat_document_to_entity(chat_document)
 
             if users:
                 chat.users = set(users)
 
-            if messages:
-                chat.messages = set(messages)
-
             return chat
 
     async def delete_chat_by_chat_oid(self, chat_oid):
         await self._collection.delete_one({"oid": chat_oid})
 
     async def get_chats_by_user_oid(self, user_oid) -> list[Chat]:
-        chats = []
-        chats_document = self._collection.find()
-        async for chat_document in chats_document:
-            for user_oid_ in chat_document["users"]:
-                if user_oid_ == user_oid:
-                    chats.append(await self.get_chat_by_chat_oid(chat_document["oid"]))
+        chat_documents = await self._collection.find({"users": user_oid}).to_list(
+            length=None
+        )
+        participant_oids = {
+            participant_oid
+            for chat_document in chat_documents
+            for participant_oid in chat_document["users"]
+        }
+        participants = {
+            participant.oid: participant
+            for participant in await self._get_users_by_user_oids(
+                list(participant_oids)
+            )
+        }
+
+        chats = await convert_in_chunks(
+            chat_documents, convert_chat_documents_to_entities
+        )
+        for chat, chat_document in zip(chats, chat_documents):
+            chat.users = {
+                participants[participant_oid]
+                for participant_oid in chat_document["users"]
+                if participant_oid in participants
+            }
         return chats
 
     async def add_user_to_chat(self, user: User, chat: Chat):
@@ -88,35 +145,140 @@ class MongoDBChatRepository(BaseChatRepository, BaseMongoDBRepository):
 
 @dataclass
 class MongoDBMessageRepository(BaseMessageRepository, BaseMongoDBRepository):
-    async def _add_message_oid_to_chat(
-        self, chat_oid: str, message_oid: str
-    ) -> ChatDocument:
-        chat_collection: AgnosticCollection = self.mongo_db_client[self.mongo_db_name][
-            MongoConfig().mongodb_chat_collection
-        ]
-        await chat_collection.update_one(
-            {"oid": chat_oid}, {"$push": {"messages": message_oid}}
-        )
+    mongo_db_chat_collection_name: str
+
+    @cached_property
+    def _chat_collection(self) -> AgnosticCollection:
+        return self._get_collection(self.mongo_db_chat_collection_name)
 
     async def add_message(self, message: Message):
-        await self._collection.insert_one(
-            await convert_message_entity_to_document(message)
+        message_document = convert_message_entity_to_document(message)
+        await self._collection.insert_one(message_document)
+        await self.update_chat_counters([message])
+
+    async def insert_messages(self, messages: list[Message]):
+        if not messages:
+            return
+
+        message_documents = await convert_in_chunks(
+            messages, convert_message_entities_to_documents
         )
-        await self._add_message_oid_to_chat(
-            chat_oid=message.chat_oid, message_oid=message.oid
+        try:
+            await self._collection.insert_many(message_documents, ordered=False)
+        except BulkWriteError as error:
+            # oid is the only unique key, a duplicate was stored by an earlier attempt
+            write_errors = error.details.get("writeErrors", [])
+            if any(
+                write_error.get("code") != DUPLICATE_KEY_ERROR
+                for write_error in write_errors
+            ):
+                raise
+
+    async def update_chat_counters(self, messages: list[Message]):
+        messages_count = Counter()
+        last_messages: dict[str, Message] = {}
+        for message in messages:
+            messages_count[message.chat_oid] += 1
+            last_message = last_messages.get(message.chat_oid)
+            if last_message is None or message.created_at >= last_message.created_at:
+                last_messages[message.chat_oid] = message
+
+        if not last_messages:
+            return
+
+        await self._chat_collection.bulk_write(
+            [
+                UpdateOne(
+                    {"oid": chat_oid},
+                    build_chat_counters_update(
+                        last_message=convert_message_entity_to_document(last_message),
+                        messages_count=messages_count[chat_oid],
+                    ),
+                )
+                for chat_oid, last_message in last_messages.items()
+            ],
+            ordered=False,
         )
 
-    async def get_message_by_message_oid(self, message_oid: str) -> Message:
-        return await convert_message_document_to_entity(
-            self._collection.find_one({"oid": message_oid})
+    async def get_message_by_message_oid(self, message_oid: str) -> Message | None:
+        message_document = await self._collection.find_one({"oid": message_oid})
+        if message_document:
+            return convert_message_document_to_entity(message_document)
+
+    async def _get_cursor_filter(
+        self, chat_oid: str, cursor_oid: str, operator: str
+    ) -> dict | None:
+        cursor_document = await self._collection.find_one(
+            {"oid": cursor_oid, "chat_oid": chat_oid},
+            projection={"_id": False, "oid": True, "created_at": True},
         )
+        if cursor_document is None:
+            return None
+
+        return {
+            "$or": [
+                {"created_at": {operator: cursor_document["created_at"]}},
+                {
+                    "created_at": cursor_document["created_at"],
+                    "oid": {operator: cursor_document["oid"]},
+                },
+            ]
+        }
+
+    async def get_messages_by_chat_oid(
+        self, chat_oid: str, filters: GetMessagesFilters
+    ) -> list[Message]:
+        query = {"chat_oid": chat_oid}
+        direction = DESCENDING
+
+        if filters.before is not None or filters.after is not None:
+            if filters.after is not None:
+                cursor_oid, operator, direction = filters.after, "$gt", ASCENDING
+            else:
+                cursor_oid, operator = filters.before, "$lt"
+
+            cursor_filter = await self._get_cursor_filter(
+                chat_oid=chat_oid, cursor_oid=cursor_oid, operator=operator
+            )
+            if cursor_filter is None:
+                return []
+            query.update(cursor_filter)
+
+        message_documents = (
+            await self._collection.find(query)
+            .sort([("created_at", direction), ("oid", direction)])
+            .limit(filters.limit)
+            .to_list(length=None)
+        )
+        messages = await convert_in_chunks(
+            message_documents, convert_message_documents_to_entities
+        )
+
+        if direction == DESCENDING:
+            messages.reverse()
 
-    async def get_messages_by_chat_oid(self, chat_oid) -> list[Message]:
-        message_documents = self._collection.find()
-        messages = []
-        async for message_document in message_documents:
-            if message_document["chat_oid"] == chat_oid:
-                messages.append(
-                    await convert_message_document_to_entity(message_document)
-                )
         return messages
+
+    async def iter_messages_by_chat_oid(
+        self, chat_oid: str, after: str | None = None, batch_size: int = 500
+    ) -> AsyncIterator[list[Message]]:
+        query = {"chat_oid": chat_oid}
+
+        if after is not None:
+            cursor_filter = await self._get_cursor_filter(
+                chat_oid=chat_oid, cursor_oid=after, operator="$gt"
+            )
+            if cursor_filter is None:
+                return
+            query.update(cursor_filter)
+
+        message_documents = (
+            self._collection.find(query, projection={"_id": False})
+            .sort([("created_at", ASCENDING), ("oid", ASCENDING)])
+            .batch_size(batch_size)
+        )
+        try:
+            while batch := await message_documents.to_list(length=batch_size):
+                yield convert_message_documents_to_entities(batch)
+        finally:
+            await message_documents.close()
@@ -0,0 +1,101 @@
+import asyncio
+from dataclasses import dataclass
+from functools import cached_property
+
+from motor.core import AgnosticClient, AgnosticCollection
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+
+from settings.config import Settings
+
+
+@dataclass
+class ChatCompactionMigration:
+    mongo_db_client: AgnosticClient
+    mongo_db_name: str
+    mongo_db_chat_collection_name: str
+    mongo_db_message_collection_name: str
+    batch_size: int = 1000
+
+    @cached_property
+    def _chat_collection(self) -> AgnosticCollection:
+        return self.mongo_db_client[self.mongo_db_name][
+            self.mongo_db_chat_collection_name
+        ]
+
+    @cached_property
+    def _message_collection(self) -> AgnosticCollection:
+        return self.mongo_db_client[self.mongo_db_name][
+            self.mongo_db_message_collection_name
+        ]
+
+    async def _write(self, operations: list[UpdateOne]) -> int:
+        if not operations:
+            return 0
+
+        result = await self._chat_collection.bulk_write(operations, ordered=False)
+        return result.modified_count
+
+    async def run(self) -> int:
+        pipeline = [
+            {"$sort": {"chat_oid": 1, "created_at": 1, "oid": 1}},
+            {
+                "$group": {
+                    "_id": "$chat_oid",
+                    "messages_count": {"$sum": 1},
+                    "last_message": {"$last": "$$ROOT"},
+                }
+            },
+        ]
+        modified = 0
+        operations = []
+
+        async for counters in self._message_collection.aggregate(
+            pipeline, allowDiskUse=True
+        ):
+            last_message = counters["last_message"]
+            last_message.pop("_id", None)
+            operations.append(
+                UpdateOne(
+                    {"oid": counters["_id"]},
+                    {
+                        "$set": {
+                            "messages_count": counters["messages_count"],
+                            "last_message": last_message,
+                        },
+                        "$unset": {"messages": ""},
+                    },
+                )
+            )
+            if len(operations) >= self.batch_size:
+                modified += await self._write(operations)
+                operations = []
+
+        modified += await self._write(operations)
+
+        # Chats without any stored message
+        result = await self._chat_collection.update_many(
+            {"messages_count": {"$exists": False}},
+            {
+                "$set": {"messages_count": 0, "last_message": None},
+                "$unset": {"messages": ""},
+            },
+        )
+        return modified + result.modified_count
+
+
+async def main():
+    mongo_config = Settings().mongo_config
+
+    migration = ChatCompactionMigration(
+        mongo_db_client=AsyncIOMotorClient(mongo_config.mongodb_connection_uri),
+        mongo_db_name=mongo_config.mongodb_database,
+        mongo_db_chat_collection_name=mongo_config.mongodb_chat_collection,
+        mongo_db_message_collection_name=mongo_config.mongodb_message_collection,
+    )
+    modified = await migration.run()
+    print(f"Compacted chat documents: {modified}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
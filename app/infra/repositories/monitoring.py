@@ -0,0 +1,141 @@
+import logging
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from pymongo.monitoring import (
+    CommandFailedEvent,
+    CommandListener,
+    CommandStartedEvent,
+    CommandSucceededEvent,
+)
+
+from infra.exceptions.monitoring import CommandBudgetExceededException
+
+
+logger = logging.getLogger(__name__)
+
+# Commands keep their filter under different keys, the rest are shown without one
+_FILTER_KEYS = {
+    "find": "filter",
+    "count": "query",
+    "distinct": "query",
+    "findAndModify": "query",
+    "aggregate": "pipeline",
+    "update": "updates",
+    "delete": "deletes",
+}
+
+
+def filter_shape(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: filter_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        # $in lists and batched statements collapse to their distinct shapes
+        shapes = []
+        for item in value:
+            shape = filter_shape(item)
+            if shape not in shapes:
+                shapes.append(shape)
+        return shapes
+    return type(value).__name__
+
+
+def command_collection(command_name: str, command: dict) -> str:
+    collection = command.get(command_name)
+    if not isinstance(collection, str):
+        collection = command.get("collection")
+    return collection if isinstance(collection, str) else "-"
+
+
+@dataclass
+class CommandScope:
+    name: str
+    count: int = 0
+    commands: Counter = field(default_factory=Counter)
+    closed: bool = False
+
+    def record(self, command: str):
+        self.count += 1
+        self.commands[command] += 1
+
+
+_current_scope: ContextVar[CommandScope | None] = ContextVar(
+    "mongo_command_scope", default=None
+)
+
+
+@dataclass
+class MongoCommandMonitor(CommandListener):
+    slow_command_ms: float = 100
+    request_command_budget: int = 20
+    budget_action: Literal["warn", "raise"] = "warn"
+    _started: dict[tuple, dict] = field(default_factory=dict, init=False)
+
+    def started(self, event: CommandStartedEvent):
+        # Motor copies the context into its executor, the scope of the caller is seen
+        scope = _current_scope.get()
+        if scope is not None and not scope.closed:
+            collection = command_collection(event.command_name, event.command)
+            scope.record(f"{event.command_name} {collection}")
+
+        self._started[(event.connection_id, event.request_id)] = event.command
+
+    def succeeded(self, event: CommandSucceededEvent):
+        self._finish(event)
+
+    def failed(self, event: CommandFailedEvent):
+        self._finish(event)
+
+    def _finish(self, event: CommandSucceededEvent | CommandFailedEvent):
+        command = self._started.pop((event.connection_id, event.request_id), None)
+        if command is None or event.duration_micros < self.slow_command_ms * 1000:
+            return
+
+        filter_key = _FILTER_KEYS.get(event.command_name)
+        logger.warning(
+            "Slow mongo command %s on %s took %.1f ms, filter %s",
+            event.command_name,
+            command_collection(event.command_name, command),
+            event.duration_micros / 1000,
+            filter_shape(command.get(filter_key)) if filter_key else "-",
+        )
+
+    @contextmanager
+    def track(self, name: str) -> Iterator[CommandScope]:
+        scope = CommandScope(name=name)
+        token = _current_scope.set(scope)
+        try:
+            yield scope
+        except BaseException:
+            scope.closed = True
+            raise
+        finally:
+            _current_scope.reset(token)
+
+        self.close(scope)
+
+    def close(self, scope: CommandScope):
+        # Background tasks spawned in the scope keep it, closing stops their counting
+        if scope.closed:
+            return
+
+        scope.closed = True
+        if scope.count > self.request_command_budget:
+            self._budget_exceeded(scope)
+
+    def _budget_exceeded(self, scope: CommandScope):
+        error = CommandBudgetExceededException(
+            scope_name=scope.name,
+            count=scope.count,
+            budget=self.request_command_budget,
+        )
+        if self.budget_action == "raise":
+            raise error
+
+        logger.warning(
+            "%s, most frequent: %s", error.message, scope.commands.most_common(3)
+        )
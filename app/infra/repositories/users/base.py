@@ -23,3 +23,6 @@ class BaseUserRepository(ABC):
 
     @abstractmethod
     async def confirm_user(self, user_oid: str): ...
+
+    @abstractmethod
+    async def update_user_password(self, user_oid: str, password: bytes): ...
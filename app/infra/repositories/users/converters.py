@@ -1,14 +1,16 @@
+from collections.abc import Iterable
+
 from domain.entities.users import Credentials, User
 from domain.values.users import Password, Phone, Username
 from infra.repositories.documents import CredentialsDocument, UserDocument
 
 
-async def convert_user_document_to_entity(user_document: UserDocument) -> User:
+def convert_user_document_to_entity(user_document: UserDocument) -> User:
     return User(
-        username=Username(value=user_document["username"]),
+        username=Username.from_trusted(user_document["username"]),
         credentials=Credentials(
-            phone=Phone(value=user_document["credentials"]["phone"]),
-            password=Password(value=user_document["credentials"]["password"]),
+            phone=Phone.from_trusted(user_document["credentials"]["phone"]),
+            password=Password.from_trusted(user_document["credentials"]["password"]),
             created_at=user_document["credentials"]["created_at"],
             oid=user_document["credentials"]["oid"],
         ),
@@ -20,7 +22,16 @@ async def convert_user_document_to_entity(user_document: UserDocument) -> User:
     )
 
 
-async def convert_user_entity_to_document(user: User) -> UserDocument:
+def convert_user_documents_to_entities(
+    user_documents: Iterable[UserDocument],
+) -> list[User]:
+    return [
+        convert_user_document_to_entity(user_document)
+        for user_document in user_documents
+    ]
+
+
+def convert_user_entity_to_document(user: User) -> UserDocument:
     return UserDocument(
         oid=user.oid,
         created_at=user.created_at,
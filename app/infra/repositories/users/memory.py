@@ -1,45 +1,153 @@
+import gc
+from contextlib import contextmanager
 from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import islice
 
+import msgpack
 
-from domain.entities.users import User
+from domain.entities.users import Credentials, User
+from domain.values.users import Password, Phone, Username
+from infra.caches.identities.base import BaseUserIdentityCache
+from infra.exceptions.users import (
+    UnsupportedSnapshotVersionException,
+    UserAlreadyExistsException,
+)
 from infra.repositories.users.base import BaseUserRepository
 
 
+SNAPSHOT_VERSION = 1
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _pack_datetime(value: datetime) -> int:
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _unpack_datetime(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value)
+
+
+@contextmanager
+def _gc_paused():
+    # Millions of new objects would otherwise trigger repeated full collections
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def _pack_user(user: User) -> tuple:
+    credentials = user.credentials
+    return (
+        user.oid,
+        _pack_datetime(user.created_at),
+        user.username.value,
+        user.is_confirmed,
+        user.is_blocked,
+        user.is_moderator,
+        credentials.oid,
+        _pack_datetime(credentials.created_at),
+        credentials.phone.value,
+        credentials.password.value if credentials.password else None,
+    )
+
+
+def _unpack_user(row: list) -> User:
+    (
+        oid,
+        created_at,
+        username,
+        is_confirmed,
+        is_blocked,
+        is_moderator,
+        credentials_oid,
+        credentials_created_at,
+        phone,
+        password,
+    ) = row
+    credentials = Credentials(
+        phone=Phone.from_trusted(phone),
+        password=Password.from_trusted(password) if password is not None else None,
+        oid=credentials_oid,
+        created_at=_unpack_datetime(credentials_created_at),
+    )
+    return User(
+        username=Username.from_trusted(username),
+        credentials=credentials,
+        is_confirmed=is_confirmed,
+        is_blocked=is_blocked,
+        is_moderator=is_moderator,
+        oid=oid,
+        created_at=_unpack_datetime(created_at),
+    )
+
+
 @dataclass
 class MemoryUserRepository(BaseUserRepository):
-    _saved_users: list[User] = field(default_factory=list, kw_only=True)
+    identity_cache: BaseUserIdentityCache | None = field(default=None, kw_only=True)
+    _users_by_oid: dict[str, User] = field(default_factory=dict, init=False)
+    _users_by_phone: dict[str, User] = field(default_factory=dict, init=False)
+
+    async def _invalidate_identity(self, user_oid: str):
+        if self.identity_cache is not None:
+            await self.identity_cache.invalidate(user_oid)
+
+    def _index(self, user: User):
+        self._users_by_oid[user.oid] = user
+        self._users_by_phone[user.credentials.phone.value] = user
 
     async def add_user(self, user: User):
-        self._saved_users.append(user)
+        # Phones match exactly, like the unique index of the Mongo repository
+        phone = user.credentials.phone.value
+        if phone in self._users_by_phone:
+            raise UserAlreadyExistsException(phone=phone)
+
+        self._index(user)
 
     async def delete_user_by_user_oid(self, user_oid: str):
-        for user in self._saved_users:
-            if user.oid == user_oid:
-                user.is_blocked = True
-                break
+        user = self._users_by_oid.get(user_oid)
+        if user is not None:
+            user.is_blocked = True
+        await self._invalidate_identity(user_oid=user_oid)
 
     async def get_user_by_user_oid(self, user_oid: str) -> User | None:
-        try:
-            return next(user for user in self._saved_users if user.oid == user_oid)
-        except StopIteration:
-            return None
+        return self._users_by_oid.get(user_oid)
 
     async def get_user_by_phone(self, phone: str) -> User | None:
-        try:
-            user = next(
-                user
-                for user in self._saved_users
-                if user.credentials.phone.value == phone
-            )
-            return user
-        except StopIteration:
-            return None
+        return self._users_by_phone.get(phone)
 
     async def get_users(self, limit: int) -> list[User]:
-        return self._saved_users[:limit]
+        # Dicts keep insertion order, so pages are stable across calls
+        return list(islice(self._users_by_oid.values(), limit))
 
     async def confirm_user(self, user_oid: str):
-        for user in self._saved_users:
-            if user.oid == user_oid:
-                user.is_confirmed = True
-                break
+        user = self._users_by_oid.get(user_oid)
+        if user is not None:
+            user.is_confirmed = True
+        await self._invalidate_identity(user_oid=user_oid)
+
+    async def update_user_password(self, user_oid: str, password: bytes):
+        user = self._users_by_oid.get(user_oid)
+        if user is not None:
+            user.credentials.password = Password(value=password)
+
+    def snapshot(self) -> bytes:
+        rows = [_pack_user(user) for user in self._users_by_oid.values()]
+        return msgpack.packb([SNAPSHOT_VERSION, rows])
+
+    def restore(self, snapshot: bytes):
+        version, rows = msgpack.unpackb(snapshot, use_list=False)
+        if version != SNAPSHOT_VERSION:
+            raise UnsupportedSnapshotVersionException(version=version)
+
+        self._users_by_oid.clear()
+        self._users_by_phone.clear()
+
+        with _gc_paused():
+            for row in rows:
+                self._index(_unpack_user(row))
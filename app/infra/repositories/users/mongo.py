@@ -1,54 +1,77 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cached_property
+
+from motor.core import AgnosticCollection
+from pymongo.errors import DuplicateKeyError
 
 from domain.entities.messages import Chat
 from domain.entities.users import User
+from infra.caches.identities.base import BaseUserIdentityCache
+from infra.exceptions.users import UserAlreadyExistsException
+from infra.repositories.converters import convert_in_chunks
 from infra.repositories.messages.mongo import BaseMongoDBRepository
 from infra.repositories.users.base import BaseUserRepository
 from infra.repositories.users.converters import (
     convert_user_document_to_entity,
+    convert_user_documents_to_entities,
     convert_user_entity_to_document,
 )
 
 
-from settings.config import MongoConfig
-
-
 @dataclass
 class MongoDBUserRepository(BaseMongoDBRepository, BaseUserRepository):
+    mongo_db_chat_collection_name: str
+    identity_cache: BaseUserIdentityCache | None = field(default=None, kw_only=True)
+
+    @cached_property
+    def _chat_collection(self) -> AgnosticCollection:
+        return self._get_collection(self.mongo_db_chat_collection_name)
+
+    async def _invalidate_identity(self, user_oid: str):
+        if self.identity_cache is not None:
+            await self.identity_cache.invalidate(user_oid)
+
     async def _remove_user_from_chats(self, user_oid: str) -> list[Chat]:
-        await self.mongo_db_client[self.mongo_db_name][
-            MongoConfig().mongodb_chat_collection
-        ].update_many({"users": user_oid}, {"$pull": {"users": user_oid}})
+        await self._chat_collection.update_many(
+            {"users": user_oid}, {"$pull": {"users": user_oid}}
+        )
 
     async def add_user(self, user: User):
-        await self._collection.insert_one(
-            await convert_user_entity_to_document(user=user)
-        )
+        try:
+            await self._collection.insert_one(
+                convert_user_entity_to_document(user=user)
+            )
+        except DuplicateKeyError:
+            raise UserAlreadyExistsException(phone=user.credentials.phone.value)
 
     async def delete_user_by_user_oid(self, user_oid: str):
         await self._remove_user_from_chats(user_oid=user_oid)
         await self._collection.delete_one({"oid": user_oid})
+        await self._invalidate_identity(user_oid=user_oid)
 
     async def get_user_by_user_oid(self, user_oid: str) -> User | None:
         user_document = await self._collection.find_one({"oid": user_oid})
         if user_document:
-            return await convert_user_document_to_entity(user_document)
+            return convert_user_document_to_entity(user_document)
 
     async def get_user_by_phone(self, phone: str) -> User | None:
-        users_document = self._collection.find()
-        async for user_document in users_document:
-            if user_document["credentials"]["phone"] == phone:
-                return await convert_user_document_to_entity(user_document)
+        user_document = await self._collection.find_one({"credentials.phone": phone})
+        if user_document:
+            return convert_user_document_to_entity(user_document)
 
     async def get_users(self, limit: int) -> list[User]:
-        users_document = self._collection.find().limit(limit)
-        users = [
-            await convert_user_document_to_entity(user_document)
-            async for user_document in users_document
-        ]
-        return users
+        user_documents = await self._collection.find().limit(limit).to_list(length=None)
+        return await convert_in_chunks(
+            user_documents, convert_user_documents_to_entities
+        )
 
     async def confirm_user(self, user_oid: str):
         filter_query = {"oid": user_oid}
         update_query = {"$set": {"is_confirmed": True}}
         await self._collection.update_one(filter_query, update_query)
+        await self._invalidate_identity(user_oid=user_oid)
+
+    async def update_user_password(self, user_oid: str, password: bytes):
+        await self._collection.update_one(
+            {"oid": user_oid}, {"$set": {"credentials.password": password}}
+        )
@@ -0,0 +1,82 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+
+import msgpack
+
+from domain.entities.messages import Message
+
+
+MSGPACK_SUBPROTOCOL = "chat.msgpack.v1"
+SUPPORTED_SUBPROTOCOLS = (MSGPACK_SUBPROTOCOL,)
+HEARTBEAT_SUBPROTOCOLS = frozenset((MSGPACK_SUBPROTOCOL,))
+
+PING_FRAME = msgpack.packb({"type": "ping"})
+PONG_FRAME = msgpack.packb({"type": "pong"})
+
+# fixmap with 4 entries: sender, oid, timestamp, text
+_ENVELOPE_HEADER = b"\x84"
+_SENDER_KEY = msgpack.packb("sender")
+_OID_KEY = msgpack.packb("oid")
+_TIMESTAMP_KEY = msgpack.packb("timestamp")
+_TEXT_KEY = msgpack.packb("text")
+
+
+@dataclass(eq=False)
+class BroadcastFrame:
+    envelope: bytes
+    text: bytes | None = None
+
+    def encode(self, subprotocol: str | None) -> bytes:
+        if subprotocol == MSGPACK_SUBPROTOCOL:
+            return self.envelope
+
+        if self.text is None:
+            self.text = msgpack.unpackb(self.envelope)["text"].encode()
+        return self.text
+
+
+def negotiate_subprotocol(offered: Iterable[str]) -> str | None:
+    for subprotocol in offered:
+        if subprotocol in SUPPORTED_SUBPROTOCOLS:
+            return subprotocol
+    return None
+
+
+def unpack_text(packed_text: bytes) -> str | None:
+    try:
+        text = msgpack.unpackb(packed_text)
+    except ValueError:
+        return None
+
+    return text if isinstance(text, str) else None
+
+
+def _to_timestamp(created_at: datetime) -> msgpack.Timestamp:
+    return msgpack.Timestamp(
+        seconds=int(created_at.timestamp()),
+        nanoseconds=created_at.microsecond * 1000,
+    )
+
+
+def build_message_frame(
+    message: Message, packed_text: bytes | None = None
+) -> BroadcastFrame:
+    # The client's own msgpack text is spliced in as is and never re-encoded
+    if packed_text is None:
+        packed_text = msgpack.packb(message.text.value)
+
+    envelope = b"".join(
+        (
+            _ENVELOPE_HEADER,
+            _SENDER_KEY,
+            msgpack.packb(message.sender_oid),
+            _OID_KEY,
+            msgpack.packb(message.oid),
+            _TIMESTAMP_KEY,
+            msgpack.packb(_to_timestamp(message.created_at)),
+            _TEXT_KEY,
+            packed_text,
+        )
+    )
+    return BroadcastFrame(envelope=envelope, text=message.text.value.encode())
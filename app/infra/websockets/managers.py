@@ -1,60 +1,232 @@
 import asyncio
 
-from collections import defaultdict
 from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
+from typing import Literal
 from fastapi import WebSocket
 
+from infra.exceptions.websockets import ConnectionLimitExceededException
+from infra.websockets.frames import HEARTBEAT_SUBPROTOCOLS, PING_FRAME, BroadcastFrame
+from infra.websockets.registry import ConnectionRegistry, OutboundConnection
+
+
+OverflowPolicy = Literal["drop_oldest", "disconnect"]
+
+
+@dataclass
+class ConnectionStats:
+    evicted_frames: int = 0
+    overflow_disconnects: int = 0
+    failed_sends: int = 0
+    reaped_connections: int = 0
+    rejected_connections: int = 0
+
 
 @dataclass
 class BaseConnectionManager(ABC):
-    connections_map: dict[str, list[WebSocket]] = field(
-        default_factory=lambda: defaultdict(list),
-        kw_only=True,
+    registry: ConnectionRegistry = field(
+        default_factory=ConnectionRegistry, kw_only=True
     )
 
     @abstractmethod
-    async def accept_connection(self, websocket: WebSocket, key: str): ...
+    async def accept_connection(
+        self, websocket: WebSocket, key: str, subprotocol: str | None = None
+    ): ...
 
     @abstractmethod
     async def remove_connection(self, websocket: WebSocket, key: str): ...
 
     @abstractmethod
-    async def send_all(self, key: str, bytes_: bytes): ...
+    async def send_all(self, key: str, frame: BroadcastFrame | bytes): ...
 
     @abstractmethod
     async def disconnect_all(self, key: str): ...
 
+    def mark_alive(self, websocket: WebSocket): ...
+
+    async def close(self): ...
+
 
 @dataclass
 class ConnectionManager(BaseConnectionManager):
-    lock_map: dict[str, asyncio.Lock] = field(default_factory=dict)
+    max_queue_size: int = field(default=256, kw_only=True)
+    overflow_policy: OverflowPolicy = field(default="drop_oldest", kw_only=True)
+    overflow_close_code: int = field(default=1013, kw_only=True)
+    heartbeat_interval_seconds: float = field(default=30, kw_only=True)
+    max_missed_pongs: int = field(default=2, kw_only=True)
+    heartbeat_close_code: int = field(default=1001, kw_only=True)
+    max_connections: int = field(default=10_000, kw_only=True)
+    connection_limit_close_code: int = field(default=1013, kw_only=True)
+    stats: ConnectionStats = field(default_factory=ConnectionStats, kw_only=True)
+    _background_tasks: set[asyncio.Task] = field(default_factory=set, init=False)
+    _heartbeat: asyncio.Task | None = field(default=None, init=False)
+
+    @property
+    def queued_frames(self) -> int:
+        return sum(
+            connection.queue.qsize()
+            for connection in self.registry.connections.values()
+        )
+
+    @property
+    def live_connections(self) -> int:
+        return len(self.registry)
+
+    @property
+    def idle_connections(self) -> int:
+        return sum(
+            1
+            for connection in self.registry.connections.values()
+            if connection.missed_pongs
+        )
+
+    async def _write(self, connection: OutboundConnection):
+        try:
+            while True:
+                frame = await connection.queue.get()
+                await connection.websocket.send_bytes(frame)
+
+                if connection.ping_pending:
+                    connection.ping_pending = False
+                    await connection.websocket.send_bytes(PING_FRAME)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.stats.failed_sends += 1
+            self._discard(websocket=connection.websocket, key=connection.key)
+
+    def _discard(self, websocket: WebSocket, key: str) -> OutboundConnection | None:
+        connection = self.registry.remove(websocket)
+
+        if connection is not None and connection.writer is not None:
+            if connection.writer is not asyncio.current_task():
+                connection.writer.cancel()
+
+        return connection
+
+    async def _close(self, websocket: WebSocket, code: int):
+        try:
+            await websocket.close(code=code)
+        except Exception:
+            pass
 
-    async def accept_connection(self, websocket: WebSocket, key: str):
-        await websocket.accept()
+    def _close_in_background(self, websocket: WebSocket, code: int):
+        task = asyncio.create_task(self._close(websocket, code))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
 
-        if key not in self.lock_map:
-            self.lock_map[key] = asyncio.Lock()
+    def _enqueue(self, connection: OutboundConnection, bytes_: bytes):
+        try:
+            connection.queue.put_nowait(bytes_)
+            return
+        except asyncio.QueueFull:
+            pass
 
-        async with self.lock_map[key]:
-            self.connections_map[key].append(websocket)
+        if self.overflow_policy == "disconnect":
+            self.stats.overflow_disconnects += 1
+            self._discard(websocket=connection.websocket, key=connection.key)
+            self._close_in_background(connection.websocket, self.overflow_close_code)
+            return
+
+        connection.queue.get_nowait()
+        self.stats.evicted_frames += 1
+        connection.queue.put_nowait(bytes_)
+
+    def _send_ping(self, connection: OutboundConnection):
+        # Pings never take a slot from chat frames, a busy writer sends one after
+        # its current frame instead
+        if connection.queue.empty():
+            connection.queue.put_nowait(PING_FRAME)
+        else:
+            connection.ping_pending = True
+
+    def _heartbeat_tick(self):
+        for connection in tuple(self.registry.connections.values()):
+            if connection.subprotocol not in HEARTBEAT_SUBPROTOCOLS:
+                continue
+
+            if connection.missed_pongs >= self.max_missed_pongs:
+                self.stats.reaped_connections += 1
+                self._discard(websocket=connection.websocket, key=connection.key)
+                self._close_in_background(
+                    connection.websocket, self.heartbeat_close_code
+                )
+                continue
+
+            connection.missed_pongs += 1
+            self._send_ping(connection)
+
+    async def _send_heartbeats(self):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval_seconds)
+            self._heartbeat_tick()
+
+    def _ensure_heartbeat(self):
+        if self.heartbeat_interval_seconds <= 0:
+            return
+        if self._heartbeat is None or self._heartbeat.done():
+            self._heartbeat = asyncio.create_task(self._send_heartbeats())
+
+    def mark_alive(self, websocket: WebSocket):
+        connection = self.registry.get(websocket)
+        if connection is not None:
+            connection.missed_pongs = 0
+
+    async def accept_connection(
+        self, websocket: WebSocket, key: str, subprotocol: str | None = None
+    ):
+        await websocket.accept(subprotocol=subprotocol)
+
+        if len(self.registry) >= self.max_connections:
+            self.stats.rejected_connections += 1
+            await self._close(websocket, self.connection_limit_close_code)
+            raise ConnectionLimitExceededException(max_connections=self.max_connections)
+
+        connection = OutboundConnection(
+            websocket=websocket,
+            key=key,
+            queue=asyncio.Queue(maxsize=self.max_queue_size),
+            subprotocol=subprotocol,
+        )
+        connection.writer = asyncio.create_task(self._write(connection))
+        self.registry.add(connection)
+
+        self._ensure_heartbeat()
 
     async def remove_connection(self, websocket: WebSocket, key: str):
-        async with self.lock_map[key]:
-            self.connections_map[key].remove(websocket)
+        self._discard(websocket=websocket, key=key)
 
-    async def send_all(self, key: str, bytes_: bytes):
-        print(key, bytes_)
-        for websocket in self.connections_map[key]:
-            await websocket.send_bytes(bytes_)
+    async def send_all(self, key: str, frame: BroadcastFrame | bytes):
+        # Every recipient gets one of the encodings prepared once for the broadcast
+        if not isinstance(frame, BroadcastFrame):
+            frame = BroadcastFrame(envelope=frame, text=frame)
+
+        for connection in self.registry.snapshot(key):
+            self._enqueue(connection, frame.encode(connection.subprotocol))
+
+    async def _disconnect(self, websocket: WebSocket):
+        await websocket.send_json(
+            {
+                "message": "Chat has been deleted",
+            }
+        )
+        await websocket.close()
 
     async def disconnect_all(self, key: str):
-        if key in self.lock_map:
-            async with self.lock_map[key]:
-                for websocket in self.connections_map[key]:
-                    await websocket.send_json(
-                        {
-                            "message": "Chat has been deleted",
-                        }
-                    )
-                    await websocket.close()
+        websockets = self.registry.websockets(key)
+        for websocket in websockets:
+            self._discard(websocket=websocket, key=key)
+
+        await asyncio.gather(
+            *(self._disconnect(websocket) for websocket in websockets),
+            return_exceptions=True,
+        )
+
+    async def close(self):
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            try:
+                await self._heartbeat
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat = None
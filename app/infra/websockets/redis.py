@@ -0,0 +1,180 @@
+import asyncio
+from dataclasses import dataclass, field
+from uuid import uuid4
+
+from fastapi import WebSocket
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from infra.websockets.frames import BroadcastFrame
+from infra.websockets.managers import ConnectionManager, ConnectionStats
+
+
+MESSAGE_FRAME = b"m"
+ENVELOPE_FRAME = b"e"
+DISCONNECT_FRAME = b"d"
+
+
+@dataclass
+class BackplaneStats(ConnectionStats):
+    published: int = 0
+    received: int = 0
+    failed_publishes: int = 0
+    listener_restarts: int = 0
+
+
+@dataclass
+class RedisConnectionManager(ConnectionManager):
+    redis_client: Redis = field(kw_only=True)
+    channel_prefix: str = field(default="chat", kw_only=True)
+    subscription_interval_seconds: float = field(default=0.05, kw_only=True)
+    reconnect_delay_seconds: float = field(default=1, kw_only=True)
+    instance_id: str = field(default_factory=lambda: uuid4().hex, kw_only=True)
+    stats: BackplaneStats = field(default_factory=BackplaneStats, kw_only=True)
+    _subscribed: set[str] = field(default_factory=set, init=False)
+    _pending_subscribe: set[str] = field(default_factory=set, init=False)
+    _pending_unsubscribe: set[str] = field(default_factory=set, init=False)
+    _listener: asyncio.Task | None = field(default=None, init=False)
+
+    def _channel(self, key: str) -> str:
+        return f"{self.channel_prefix}:{key}"
+
+    def _key(self, channel: bytes | str) -> str:
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        return channel.removeprefix(f"{self.channel_prefix}:")
+
+    def _pack(self, kind: bytes, bytes_: bytes) -> bytes:
+        return b"%s:%s:%s" % (self.instance_id.encode(), kind, bytes_)
+
+    @property
+    def subscribed_keys(self) -> frozenset[str]:
+        return frozenset(self._subscribed)
+
+    def _request_subscription(self, key: str):
+        self._pending_unsubscribe.discard(key)
+        if key not in self._subscribed:
+            self._pending_subscribe.add(key)
+
+    def _request_unsubscription(self, key: str):
+        self._pending_subscribe.discard(key)
+        if key in self._subscribed:
+            self._pending_unsubscribe.add(key)
+
+    async def _apply_subscriptions(self, pubsub):
+        # Changes collected since the last tick go out as one command each
+        subscribe, self._pending_subscribe = self._pending_subscribe, set()
+        unsubscribe, self._pending_unsubscribe = self._pending_unsubscribe, set()
+
+        if subscribe:
+            await pubsub.subscribe(*(self._channel(key) for key in subscribe))
+            self._subscribed |= subscribe
+
+        if unsubscribe:
+            await pubsub.unsubscribe(*(self._channel(key) for key in unsubscribe))
+            self._subscribed -= unsubscribe
+
+    async def _dispatch(self, message: dict):
+        origin, kind, bytes_ = message["data"].split(b":", 2)
+
+        # Local sockets already got the frame straight from send_all
+        if origin == self.instance_id.encode():
+            return
+
+        self.stats.received += 1
+        key = self._key(message["channel"])
+
+        if kind == DISCONNECT_FRAME:
+            await super().disconnect_all(key)
+        elif kind == ENVELOPE_FRAME:
+            await super().send_all(key, BroadcastFrame(envelope=bytes_))
+        else:
+            await super().send_all(key, bytes_)
+
+    async def _poll(self, pubsub, timeout: float) -> bool:
+        # One tick of the listener, False when no room is subscribed to wait on
+        await self._apply_subscriptions(pubsub)
+
+        if not self._subscribed:
+            return False
+
+        message = await pubsub.get_message(
+            ignore_subscribe_messages=True, timeout=timeout
+        )
+        if message is not None and message["type"] == "message":
+            await self._dispatch(message)
+        return True
+
+    async def _consume(self, pubsub):
+        while True:
+            if not await self._poll(pubsub, timeout=self.subscription_interval_seconds):
+                await asyncio.sleep(self.subscription_interval_seconds)
+
+    async def _listen(self):
+        while True:
+            pubsub = self.redis_client.pubsub()
+            try:
+                await self._consume(pubsub)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.stats.listener_restarts += 1
+                self._subscribed.clear()
+                self._pending_unsubscribe.clear()
+                self._pending_subscribe = set(self.registry.rooms)
+                await asyncio.sleep(self.reconnect_delay_seconds)
+            finally:
+                await pubsub.aclose()
+
+    def _ensure_listener(self):
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    def _discard(self, websocket: WebSocket, key: str):
+        connection = super()._discard(websocket=websocket, key=key)
+
+        if key not in self.registry:
+            self._request_unsubscription(key)
+
+        return connection
+
+    async def _publish(self, key: str, kind: bytes, bytes_: bytes):
+        try:
+            await self.redis_client.publish(
+                self._channel(key), self._pack(kind, bytes_)
+            )
+            self.stats.published += 1
+        except RedisError:
+            self.stats.failed_publishes += 1
+
+    async def accept_connection(
+        self, websocket: WebSocket, key: str, subprotocol: str | None = None
+    ):
+        await super().accept_connection(
+            websocket=websocket, key=key, subprotocol=subprotocol
+        )
+        self._request_subscription(key)
+        self._ensure_listener()
+
+    async def send_all(self, key: str, frame: BroadcastFrame | bytes):
+        await super().send_all(key, frame)
+
+        if isinstance(frame, BroadcastFrame):
+            await self._publish(key, ENVELOPE_FRAME, frame.envelope)
+        else:
+            await self._publish(key, MESSAGE_FRAME, frame)
+
+    async def disconnect_all(self, key: str):
+        await super().disconnect_all(key)
+        await self._publish(key, DISCONNECT_FRAME, b"")
+
+    async def close(self):
+        await super().close()
+
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
@@ -0,0 +1,78 @@
+import asyncio
+from dataclasses import dataclass, field
+
+from fastapi import WebSocket
+
+
+@dataclass(eq=False)
+class OutboundConnection:
+    websocket: WebSocket
+    key: str
+    queue: asyncio.Queue[bytes]
+    subprotocol: str | None = None
+    writer: asyncio.Task | None = None
+    missed_pongs: int = 0
+    ping_pending: bool = False
+
+
+@dataclass(eq=False)
+class Room:
+    connections: dict[WebSocket, OutboundConnection] = field(default_factory=dict)
+    _snapshot: tuple[OutboundConnection, ...] | None = None
+
+    def add(self, connection: OutboundConnection):
+        self.connections[connection.websocket] = connection
+        self._snapshot = None
+
+    def remove(self, websocket: WebSocket):
+        del self.connections[websocket]
+        self._snapshot = None
+
+    def snapshot(self) -> tuple[OutboundConnection, ...]:
+        # Rebuilt only after a join or leave, broadcasts in between share the tuple
+        if self._snapshot is None:
+            self._snapshot = tuple(self.connections.values())
+        return self._snapshot
+
+
+@dataclass
+class ConnectionRegistry:
+    rooms: dict[str, Room] = field(default_factory=dict)
+    connections: dict[WebSocket, OutboundConnection] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.connections)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.rooms
+
+    def get(self, websocket: WebSocket) -> OutboundConnection | None:
+        return self.connections.get(websocket)
+
+    def add(self, connection: OutboundConnection):
+        room = self.rooms.get(connection.key)
+        if room is None:
+            room = self.rooms[connection.key] = Room()
+
+        room.add(connection)
+        self.connections[connection.websocket] = connection
+
+    def remove(self, websocket: WebSocket) -> OutboundConnection | None:
+        connection = self.connections.pop(websocket, None)
+        if connection is None:
+            return None
+
+        room = self.rooms[connection.key]
+        room.remove(websocket)
+
+        if not room.connections:
+            del self.rooms[connection.key]
+
+        return connection
+
+    def snapshot(self, key: str) -> tuple[OutboundConnection, ...]:
+        room = self.rooms.get(key)
+        return room.snapshot() if room is not None else ()
+
+    def websockets(self, key: str) -> list[WebSocket]:
+        return [connection.websocket for connection in self.snapshot(key)]
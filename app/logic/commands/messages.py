@@ -1,8 +1,10 @@
-from dataclasses import dataclass
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
 
 from domain.entities.messages import Chat, Message
 from domain.entities.users import User
 from domain.values.messages import Text, Title
+from infra.repositories.filters.messages import GetMessagesFilters
 from infra.repositories.messages.base import BaseChatRepository, BaseMessageRepository
 from infra.repositories.users.base import BaseUserRepository
 from logic.commands.base import BaseCommand, BaseCommandHandler
@@ -10,6 +12,7 @@ from logic.exceptions.messages import ChatNotFoundException
 from logic.exceptions.users import (
     UserNotFoundException,
 )
+from logic.services.messages import MessageWriteBuffer
 
 
 @dataclass(frozen=True)
@@ -57,6 +60,7 @@ class GetUserChatsCommandHandler(BaseCommandHandler[GetUserChatsCommand, list[Ch
 class GetUserChatMessagesCommand(BaseCommand):
     user: User
     chat_oid: str
+    filters: GetMessagesFilters = field(default_factory=GetMessagesFilters)
 
 
 @dataclass(frozen=True)
@@ -68,11 +72,41 @@ class GetUserChatMessagesCommandHandler(
 
     async def handle(self, command) -> list[Message]:
         messages = await self.message_repository.get_messages_by_chat_oid(
-            command.chat_oid
+            chat_oid=command.chat_oid, filters=command.filters
         )
         return messages
 
 
+@dataclass(frozen=True)
+class ExportChatMessagesCommand(BaseCommand):
+    user: User
+    chat_oid: str
+    after: str | None = None
+
+
+@dataclass(frozen=True)
+class ExportChatMessagesCommandHandler(
+    BaseCommandHandler[ExportChatMessagesCommand, AsyncIterator[list[Message]]]
+):
+    chat_repository: BaseChatRepository
+    message_repository: BaseMessageRepository
+
+    async def handle(
+        self, command: ExportChatMessagesCommand
+    ) -> AsyncIterator[list[Message]]:
+        chat = await self.chat_repository.get_chat_by_chat_oid(
+            chat_oid=command.chat_oid
+        )
+
+        # Non-members get the same answer as for a missing chat, oids cannot be probed
+        if chat is None or command.user not in chat.users:
+            raise ChatNotFoundException()
+
+        return self.message_repository.iter_messages_by_chat_oid(
+            chat_oid=command.chat_oid, after=command.after
+        )
+
+
 @dataclass(frozen=True)
 class CreateMessageCommand(BaseCommand):
     text: str
@@ -97,6 +131,29 @@ class CreateMessageCommandHandler(BaseCommandHandler[CreateMessageCommand, Messa
         return message
 
 
+@dataclass(frozen=True)
+class BufferMessageCommand(BaseCommand):
+    text: str
+    chat_oid: str
+    user: User
+
+
+@dataclass(frozen=True)
+class BufferMessageCommandHandler(BaseCommandHandler[BufferMessageCommand, Message]):
+    message_buffer: MessageWriteBuffer
+
+    async def handle(self, command: BufferMessageCommand) -> Message:
+        text = Text(value=command.text)
+
+        message = Message(
+            text=text, sender_oid=command.user.oid, chat_oid=command.chat_oid
+        )
+
+        await self.message_buffer.add(message)
+
+        return message
+
+
 @dataclass(frozen=True)
 class AddUserToChatCommand(BaseCommand):
     user_oid: str
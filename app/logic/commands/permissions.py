@@ -1,6 +1,9 @@
+from contextlib import suppress
 from dataclasses import dataclass
 
 from domain.entities.users import User
+from infra.caches.identities.base import BaseUserIdentityCache
+from infra.exceptions.caches import IdentityCacheUnavailableException
 from infra.repositories.users.base import BaseUserRepository
 from logic.commands.base import BaseCommand, BaseCommandHandler
 from logic.exceptions.users import (
@@ -13,6 +16,28 @@ from logic.exceptions.users import (
 from logic.services.auth import AuthService
 
 
+@dataclass(frozen=True)
+class BaseAccessCheckCommandHandler:
+    user_repository: BaseUserRepository
+    auth_service: AuthService
+    identity_cache: BaseUserIdentityCache
+
+    async def _get_user(self, user_oid: str) -> User | None:
+        try:
+            user = await self.identity_cache.get(user_oid)
+        except IdentityCacheUnavailableException:
+            # The repository is the source of truth, a cache outage only costs a lookup
+            return await self.user_repository.get_user_by_user_oid(user_oid)
+
+        if user is None:
+            user = await self.user_repository.get_user_by_user_oid(user_oid)
+            if user is not None:
+                with suppress(IdentityCacheUnavailableException):
+                    await self.identity_cache.set(user)
+
+        return user
+
+
 @dataclass(frozen=True)
 class AccessCheckModeratorCommand(BaseCommand):
     access_token: str
@@ -20,11 +45,9 @@ class AccessCheckModeratorCommand(BaseCommand):
 
 @dataclass(frozen=True)
 class AccessCheckModeratorCommandHandler(
-    BaseCommandHandler[AccessCheckModeratorCommand, User]
+    BaseAccessCheckCommandHandler,
+    BaseCommandHandler[AccessCheckModeratorCommand, User],
 ):
-    user_repository: BaseUserRepository
-    auth_service: AuthService
-
     async def handle(self, command: AccessCheckModeratorCommand) -> User:
         payload = await self.auth_service.decode_jwt(
             token=command.access_token,
@@ -33,7 +56,7 @@ class AccessCheckModeratorCommandHandler(
         if payload is None:
             raise InvalidTokenException()
 
-        user = await self.user_repository.get_user_by_user_oid(payload.get("sub"))
+        user = await self._get_user(payload.get("sub"))
 
         if not user:
             raise UserNotFoundException()
@@ -50,10 +73,10 @@ class AccessCheckUserCommand(BaseCommand):
 
 
 @dataclass(frozen=True)
-class AccessCheckUserCommandHandler(BaseCommandHandler[AccessCheckUserCommand, User]):
-    user_repository: BaseUserRepository
-    auth_service: AuthService
-
+class AccessCheckUserCommandHandler(
+    BaseAccessCheckCommandHandler,
+    BaseCommandHandler[AccessCheckUserCommand, User],
+):
     async def handle(self, command: AccessCheckUserCommand) -> User:
         payload = await self.auth_service.decode_jwt(
             token=command.access_token,
@@ -62,7 +85,7 @@ class AccessCheckUserCommandHandler(BaseCommandHandler[AccessCheckUserCommand, U
         if payload is None:
             raise InvalidTokenException()
 
-        user = await self.user_repository.get_user_by_user_oid(payload.get("sub"))
+        user = await self._get_user(payload.get("sub"))
 
         if not user:
             raise UserNotFoundException()
@@ -2,6 +2,7 @@ from dataclasses import dataclass
 
 from domain.entities.users import Credentials, User
 from domain.values.users import Phone, Username, Password
+from infra.exceptions.users import UserAlreadyExistsException
 from infra.repositories.users.base import BaseUserRepository
 from logic.commands.base import BaseCommand, BaseCommandHandler
 from logic.exceptions.users import (
@@ -39,7 +40,11 @@ class SignUpCommandHandler(BaseCommandHandler[SignUpCommand, None]):
         credentials = Credentials(phone=phone, password=password)
         user = User(username=username, credentials=credentials)
 
-        await self.user_repository.add_user(user=user)
+        try:
+            await self.user_repository.add_user(user=user)
+        except UserAlreadyExistsException:
+            raise ThisNumberIsAlreadyRegisteredException()
+
         code = await self.auth_service.generate_confirmation_code()
 
         await self.auth_service.save_confirmation_code(user=user, code=code)
@@ -82,7 +87,7 @@ class SignInCommand(BaseCommand):
 
 
 @dataclass(frozen=True)
-class SignInCommandHandler(BaseCommandHandler[ConfirmCodeCommand, str]):
+class SignInCommandHandler(BaseCommandHandler[SignInCommand, str]):
     user_repository: BaseUserRepository
     auth_service: AuthService
 
@@ -98,6 +103,12 @@ class SignInCommandHandler(BaseCommandHandler[ConfirmCodeCommand, str]):
         if await self.auth_service.check_user_password(user, command.password) is False:
             raise PasswordNotVerifiedException()
 
+        if self.auth_service.password_needs_rehash(user):
+            await self.user_repository.update_user_password(
+                user_oid=user.oid,
+                password=await self.auth_service.hash_password(command.password),
+            )
+
         token = await self.auth_service.encode_jwt(user)
 
         return token
@@ -10,3 +10,25 @@ class CommandHandlersNotRegisteredException(LogicException):
     @property
     def message(self):
         return f"Could not find handlers for the command: {self.command_type}"
+
+
+@dataclass(eq=False)
+class MediatorAlreadyCompiledException(LogicException):
+    command_type: type
+
+    @property
+    def message(self):
+        return f"Could not register the command after compile: {self.command_type}"
+
+
+@dataclass(eq=False)
+class CommandHandlerTypeMismatchException(LogicException):
+    command_type: type
+    handler_type: type
+
+    @property
+    def message(self):
+        return (
+            f"Handler {self.handler_type} can not handle the command: "
+            f"{self.command_type}"
+        )
@@ -8,3 +8,10 @@ class ChatNotFoundException(LogicException):
     @property
     def message(self):
         return "Chat not found"
+
+
+@dataclass(eq=False)
+class MessageWriteBufferClosedException(LogicException):
+    @property
+    def message(self):
+        return "Message write buffer is closed"
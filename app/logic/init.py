@@ -5,28 +5,48 @@ from punq import (
     Scope,
 )
 
+from infra.caches.identities.base import BaseUserIdentityCache
+from infra.caches.identities.memory import MemoryUserIdentityCache
+from infra.caches.identities.redis import RedisUserIdentityCache
+from infra.caches.identities.tiered import TieredUserIdentityCache
 from infra.caches.users.base import BaseUserCache
+from infra.caches.users.memory import MemoryUserCache
 from infra.caches.users.redis import RedisUserCache
+from infra.metrics.registry import MetricsRegistry
+from infra.metrics.repositories import (
+    InstrumentedChatRepository,
+    InstrumentedMessageRepository,
+    InstrumentedUserRepository,
+)
+from infra.metrics.websockets import register_connection_metrics
 from infra.repositories.messages.base import BaseChatRepository, BaseMessageRepository
 from infra.repositories.messages.memory import (
+    MemoryChatStorage,
     MemoryChatRepository,
     MemoryMessageRepository,
 )
+from infra.repositories.indexes import MongoDBIndexManager, build_index_registry
 from infra.repositories.messages.mongo import (
     MongoDBChatRepository,
     MongoDBMessageRepository,
 )
+from infra.repositories.monitoring import MongoCommandMonitor
 from infra.repositories.users.base import BaseUserRepository
 from infra.repositories.users.memory import MemoryUserRepository
 from infra.repositories.users.mongo import MongoDBUserRepository
 from infra.websockets.managers import BaseConnectionManager, ConnectionManager
+from infra.websockets.redis import RedisConnectionManager
 from logic.commands.messages import (
+    BufferMessageCommand,
+    BufferMessageCommandHandler,
     AddUserToChatCommand,
     AddUserToChatCommandHandler,
     CreateChatCommand,
     CreateChatCommandHandler,
     CreateMessageCommand,
     CreateMessageCommandHandler,
+    ExportChatMessagesCommand,
+    ExportChatMessagesCommandHandler,
     GetChatCommand,
     GetChatCommandHandler,
     GetUserChatMessagesCommand,
@@ -53,6 +73,8 @@ from logic.commands.users import (
 )
 from logic.mediator import Mediator
 from logic.services.auth import AuthService
+from logic.services.hashers import PasswordHasher
+from logic.services.messages import MessageWriteBuffer
 from logic.services.senders import BaseSenderService, DummySenderService
 from settings.config import Settings
 
@@ -65,16 +87,65 @@ def init_container() -> Container:
     return _init_container()
 
 
+@lru_cache(1)
+def _get_shared_mediator() -> Mediator:
+    return init_container().resolve(Mediator)
+
+
+async def get_mediator() -> Mediator:
+    return _get_shared_mediator()
+
+
+@lru_cache(1)
+def _get_shared_settings() -> Settings:
+    return init_container().resolve(Settings)
+
+
+async def get_settings() -> Settings:
+    return _get_shared_settings()
+
+
+async def init_mongodb_indexes(container: Container):
+    settings: Settings = container.resolve(Settings)
+    if settings.storage_config.backend != "mongo":
+        return
+
+    index_manager: MongoDBIndexManager = container.resolve(MongoDBIndexManager)
+
+    await index_manager.apply()
+
+    if settings.mongo_config.mongodb_verify_indexes:
+        await index_manager.verify()
+
+
 def _init_container() -> Container:
     container = Container()
     container.register(Settings, instance=Settings(), scope=Scope.singleton)
 
     settings: Settings = container.resolve(Settings)
 
+    def create_mongodb_command_monitor() -> MongoCommandMonitor:
+        return MongoCommandMonitor(
+            slow_command_ms=settings.mongo_config.mongodb_slow_command_ms,
+            request_command_budget=settings.mongo_config.mongodb_request_command_budget,
+            budget_action=settings.mongo_config.mongodb_request_budget_action,
+        )
+
+    container.register(
+        MongoCommandMonitor,
+        factory=create_mongodb_command_monitor,
+        scope=Scope.singleton,
+    )
+
     def create_mongodb_client() -> AsyncIOMotorClient:
+        event_listeners = []
+        if settings.mongo_config.mongodb_monitor_commands:
+            event_listeners.append(container.resolve(MongoCommandMonitor))
+
         return AsyncIOMotorClient(
             settings.mongo_config.mongodb_connection_uri,
             serverSelectionTimeoutMS=3000,
+            event_listeners=event_listeners,
         )
 
     container.register(
@@ -83,25 +154,44 @@ def _init_container() -> Container:
 
     mongo_client = container.resolve(AsyncIOMotorClient)
 
+    def create_mongodb_index_manager() -> MongoDBIndexManager:
+        return MongoDBIndexManager(
+            mongo_db_client=mongo_client,
+            mongo_db_name=settings.mongo_config.mongodb_database,
+            registry=build_index_registry(settings.mongo_config),
+        )
+
+    container.register(
+        MongoDBIndexManager,
+        factory=create_mongodb_index_manager,
+        scope=Scope.singleton,
+    )
+
+    mongo_config = settings.mongo_config
+
     def init_chat_mongodb_repository() -> BaseChatRepository:
         return MongoDBChatRepository(
             mongo_db_client=mongo_client,
-            mongo_db_name=settings.mongo_config.mongodb_database,
-            mongo_db_collection_name=settings.mongo_config.mongodb_chat_collection,
+            mongo_db_name=mongo_config.mongodb_database,
+            mongo_db_collection_name=mongo_config.mongodb_chat_collection,
+            mongo_db_user_collection_name=mongo_config.mongodb_user_collection,
         )
 
     def init_message_mongodb_repository() -> BaseMessageRepository:
         return MongoDBMessageRepository(
             mongo_db_client=mongo_client,
-            mongo_db_name=settings.mongo_config.mongodb_database,
-            mongo_db_collection_name=settings.mongo_config.mongodb_message_collection,
+            mongo_db_name=mongo_config.mongodb_database,
+            mongo_db_collection_name=mongo_config.mongodb_message_collection,
+            mongo_db_chat_collection_name=mongo_config.mongodb_chat_collection,
         )
 
     def init_user_mongodb_repository() -> BaseUserRepository:
         return MongoDBUserRepository(
             mongo_db_client=mongo_client,
-            mongo_db_name=settings.mongo_config.mongodb_database,
-            mongo_db_collection_name=settings.mongo_config.mongodb_user_collection,
+            mongo_db_name=mongo_config.mongodb_database,
+            mongo_db_collection_name=mongo_config.mongodb_user_collection,
+            mongo_db_chat_collection_name=mongo_config.mongodb_chat_collection,
+            identity_cache=container.resolve(BaseUserIdentityCache),
         )
 
     def create_sender_service() -> BaseSenderService:
@@ -123,169 +213,317 @@ def _init_container() -> Container:
             redis_client=redis_client, cache_config=settings.cache_config
         )
 
+    def create_user_identity_cache() -> BaseUserIdentityCache:
+        return TieredUserIdentityCache(
+            local_cache=MemoryUserIdentityCache(
+                max_size=settings.cache_config.identity_cache_local_max_size,
+                expire_seconds=settings.cache_config.identity_cache_local_expire_seconds,
+            ),
+            remote_cache=RedisUserIdentityCache(
+                redis_client=redis_client,
+                expire_seconds=settings.cache_config.identity_cache_expire_seconds,
+            ),
+        )
+
     def create_auth_service() -> AuthService:
         return AuthService(
-            cache_client=create_user_cache(),
-            sender_service=create_sender_service(),
+            cache_client=container.resolve(BaseUserCache),
+            sender_service=container.resolve(BaseSenderService),
             authJWT=settings.auth_jwt,
+            password_hasher=PasswordHasher(
+                rounds=settings.password_hasher.bcrypt_rounds,
+                max_workers=settings.password_hasher.max_workers,
+                executor_type=settings.password_hasher.executor_type,
+            ),
         )
 
     def create_user_repository() -> BaseUserRepository:
-        return MemoryUserRepository()
+        return MemoryUserRepository(
+            identity_cache=container.resolve(BaseUserIdentityCache)
+        )
+
+    container.register(MemoryChatStorage, scope=Scope.singleton)
 
     def create_chat_repository() -> BaseChatRepository:
-        return MemoryChatRepository()
+        return MemoryChatRepository(storage=container.resolve(MemoryChatStorage))
 
     def create_message_repository() -> BaseMessageRepository:
-        return MemoryMessageRepository()
+        return MemoryMessageRepository(storage=container.resolve(MemoryChatStorage))
+
+    def create_memory_user_identity_cache() -> BaseUserIdentityCache:
+        return MemoryUserIdentityCache(
+            max_size=settings.cache_config.identity_cache_local_max_size,
+            expire_seconds=settings.cache_config.identity_cache_local_expire_seconds,
+        )
 
     # Register auth service
     container.register(AuthService, factory=create_auth_service, scope=Scope.singleton)
+    # Register sender service
+    container.register(
+        BaseSenderService, factory=create_sender_service, scope=Scope.singleton
+    )
+
+    if settings.storage_config.backend == "memory":
+        # Fully in-process, used for local runs and load tests without Mongo or Redis
+        user_repository_factory = create_user_repository
+        chat_repository_factory = create_chat_repository
+        message_repository_factory = create_message_repository
+        user_cache_factory = MemoryUserCache
+        user_identity_cache_factory = create_memory_user_identity_cache
+    else:
+        user_repository_factory = init_user_mongodb_repository
+        chat_repository_factory = init_chat_mongodb_repository
+        message_repository_factory = init_message_mongodb_repository
+        user_cache_factory = create_user_cache
+        user_identity_cache_factory = create_user_identity_cache
+
+    # Metrics
+    container.register(MetricsRegistry, scope=Scope.singleton)
+
+    def instrument_repository(repository, instrumented_type, name: str):
+        if not settings.metrics_config.enabled:
+            return repository
+
+        histogram = container.resolve(MetricsRegistry).histogram(
+            name="chat_repository_duration_seconds",
+            help="Repository method latency",
+            label_names=("repository", "method"),
+        )
+        return instrumented_type(histogram=histogram, name=name, repository=repository)
+
+    def create_instrumented_user_repository() -> BaseUserRepository:
+        return instrument_repository(
+            user_repository_factory(), InstrumentedUserRepository, "user"
+        )
+
+    def create_instrumented_chat_repository() -> BaseChatRepository:
+        return instrument_repository(
+            chat_repository_factory(), InstrumentedChatRepository, "chat"
+        )
+
+    def create_instrumented_message_repository() -> BaseMessageRepository:
+        return instrument_repository(
+            message_repository_factory(), InstrumentedMessageRepository, "message"
+        )
+
     # Register user repository
     container.register(
-        BaseUserRepository, factory=init_user_mongodb_repository, scope=Scope.singleton
+        BaseUserRepository,
+        factory=create_instrumented_user_repository,
+        scope=Scope.singleton,
     )
     # Register chat repository
     container.register(
-        BaseChatRepository, factory=init_chat_mongodb_repository, scope=Scope.singleton
+        BaseChatRepository,
+        factory=create_instrumented_chat_repository,
+        scope=Scope.singleton,
     )
     # Reegister message repository
     container.register(
         BaseMessageRepository,
-        factory=init_message_mongodb_repository,
+        factory=create_instrumented_message_repository,
         scope=Scope.singleton,
     )
     # Register user cache
-    container.register(BaseUserCache, factory=create_user_cache, scope=Scope.singleton)
-
-    # Register command handlers
-    container.register(SignUpCommandHandler)
-    container.register(SignInCommandHandler)
-    container.register(ConfirmCodeCommand)
-    container.register(CreateChatCommand)
-    container.register(GetUserChatsCommand)
-    container.register(GetUserChatMessagesCommand)
-    container.register(CreateMessageCommand)
-    container.register(AddUserToChatCommand)
-    container.register(GetUsersCommand)
-    container.register(AccessCheckModeratorCommand)
-    container.register(AccessCheckUserCommand)
-    container.register(DeleteUserCommand)
-    container.register(GetChatCommand)
+    container.register(BaseUserCache, factory=user_cache_factory, scope=Scope.singleton)
+    # Register user identity cache
+    container.register(
+        BaseUserIdentityCache,
+        factory=user_identity_cache_factory,
+        scope=Scope.singleton,
+    )
 
     # Message Broker
 
+    def create_connection_manager() -> BaseConnectionManager:
+        websocket_config = settings.websocket_config
+        options = dict(
+            max_queue_size=websocket_config.outbound_queue_size,
+            overflow_policy=websocket_config.overflow_policy,
+            overflow_close_code=websocket_config.overflow_close_code,
+            heartbeat_interval_seconds=websocket_config.heartbeat_interval_seconds,
+            max_missed_pongs=websocket_config.max_missed_pongs,
+            heartbeat_close_code=websocket_config.heartbeat_close_code,
+            max_connections=websocket_config.max_connections,
+            connection_limit_close_code=websocket_config.connection_limit_close_code,
+        )
+
+        if websocket_config.backplane == "redis":
+            connection_manager = RedisConnectionManager(
+                redis_client=redis_client,
+                channel_prefix=websocket_config.backplane_channel_prefix,
+                subscription_interval_seconds=websocket_config.backplane_subscription_interval_seconds,
+                **options,
+            )
+        else:
+            connection_manager = ConnectionManager(**options)
+
+        if settings.metrics_config.enabled:
+            register_connection_metrics(
+                container.resolve(MetricsRegistry), connection_manager
+            )
+
+        return connection_manager
+
     container.register(
-        BaseConnectionManager, instance=ConnectionManager(), scope=Scope.singleton
+        BaseConnectionManager,
+        factory=create_connection_manager,
+        scope=Scope.singleton,
     )
 
-    def init_mediator() -> Mediator:
-        mediator = Mediator()
-
-        # commands handlers
-        sign_up_handler = SignUpCommandHandler(
-            user_repository=container.resolve(BaseUserRepository),
-            auth_service=container.resolve(AuthService),
-        )
-
-        sign_in_handler = SignInCommandHandler(
-            user_repository=container.resolve(BaseUserRepository),
-            auth_service=container.resolve(AuthService),
-        )
-        confirm_code_handler = ConfirmCodeCommandHandler(
-            user_repository=container.resolve(BaseUserRepository),
-            auth_service=container.resolve(AuthService),
-        )
-        create_chat_handler = CreateChatCommandHandler(
-            user_repository=container.resolve(BaseUserRepository),
-            chat_repository=container.resolve(BaseChatRepository),
-        )
-        get_user_chats_handler = GetUserChatsCommandHandler(
-            user_repository=container.resolve(BaseUserRepository),
-            chat_repository=container.resolve(BaseChatRepository),
-        )
-        get_user_chat_messages_handler = GetUserChatMessagesCommandHandler(
-            user_repository=container.resolve(BaseUserRepository),
+    def create_message_write_buffer() -> MessageWriteBuffer:
+        websocket_config = settings.websocket_config
+        return MessageWriteBuffer(
             message_repository=container.resolve(BaseMessageRepository),
-        )
-        create_message_command_handler = CreateMessageCommandHandler(
-            user_repository=container.resolve(BaseUserRepository),
-            message_repository=container.resolve(BaseMessageRepository),
-        )
-        add_user_to_chat_command_handler = AddUserToChatCommandHandler(
-            user_repository=container.resolve(BaseUserRepository),
-            chat_repository=container.resolve(BaseChatRepository),
-        )
-        get_users_command_handler = GetUsersCommandHandler(
-            user_repository=container.resolve(BaseUserRepository),
-        )
-        access_check_moderator_command_handler = AccessCheckModeratorCommandHandler(
-            user_repository=container.resolve(BaseUserRepository),
-            auth_service=container.resolve(AuthService),
-        )
-        access_check_user_command_handler = AccessCheckUserCommandHandler(
-            user_repository=container.resolve(BaseUserRepository),
-            auth_service=container.resolve(AuthService),
-        )
-        delete_user_command_handler = DeleteUserCommandHandler(
-            user_repository=container.resolve(BaseUserRepository),
-            auth_service=container.resolve(AuthService),
-        )
-        get_chat_command_handler = GetChatCommandHandler(
-            user_repository=container.resolve(BaseUserRepository),
-            chat_repository=container.resolve(BaseChatRepository),
+            max_batch_size=websocket_config.write_buffer_batch_size,
+            flush_interval_seconds=websocket_config.write_buffer_flush_interval_seconds,
+            max_in_flight=websocket_config.write_buffer_max_in_flight,
+            max_pending=websocket_config.write_buffer_max_pending,
+            max_retries=websocket_config.write_buffer_max_retries,
+            retry_backoff_seconds=websocket_config.write_buffer_retry_backoff_seconds,
         )
 
-        # commands
-        mediator.register_command(
-            command=SignUpCommand, command_handlers=[sign_up_handler]
-        )
-        mediator.register_command(
-            command=SignInCommand, command_handlers=[sign_in_handler]
-        )
-        mediator.register_command(
-            command=ConfirmCodeCommand, command_handlers=[confirm_code_handler]
-        )
-        mediator.register_command(
-            command=CreateChatCommand, command_handlers=[create_chat_handler]
-        )
-        mediator.register_command(
-            command=GetUserChatsCommand, command_handlers=[get_user_chats_handler]
-        )
-        mediator.register_command(
-            command=GetUserChatMessagesCommand,
-            command_handlers=[get_user_chat_messages_handler],
-        )
-        mediator.register_command(
-            command=CreateMessageCommand,
-            command_handlers=[create_message_command_handler],
-        )
-        mediator.register_command(
-            command=AddUserToChatCommand,
-            command_handlers=[add_user_to_chat_command_handler],
-        )
-        mediator.register_command(
-            command=GetUsersCommand,
-            command_handlers=[get_users_command_handler],
-        )
-        mediator.register_command(
-            command=AccessCheckModeratorCommand,
-            command_handlers=[access_check_moderator_command_handler],
-        )
-        mediator.register_command(
-            command=AccessCheckUserCommand,
-            command_handlers=[access_check_user_command_handler],
-        )
-        mediator.register_command(
-            command=DeleteUserCommand,
-            command_handlers=[delete_user_command_handler],
-        )
-        mediator.register_command(
-            command=GetChatCommand, command_handlers=[get_chat_command_handler]
-        )
+    container.register(
+        MessageWriteBuffer,
+        factory=create_message_write_buffer,
+        scope=Scope.singleton,
+    )
 
-        return mediator
+    def create_mediator() -> Mediator:
+        return init_mediator(container)
 
-    container.register(Mediator, factory=init_mediator)
+    container.register(Mediator, factory=create_mediator, scope=Scope.singleton)
 
     return container
+
+
+def init_mediator(container: Container) -> Mediator:
+    settings: Settings = container.resolve(Settings)
+    command_latency = None
+    if settings.metrics_config.enabled:
+        command_latency = container.resolve(MetricsRegistry).histogram(
+            name="chat_command_duration_seconds",
+            help="Mediator command latency",
+            label_names=("command",),
+        )
+
+    mediator = Mediator(command_latency=command_latency)
+
+    # commands handlers
+    sign_up_handler = SignUpCommandHandler(
+        user_repository=container.resolve(BaseUserRepository),
+        auth_service=container.resolve(AuthService),
+    )
+
+    sign_in_handler = SignInCommandHandler(
+        user_repository=container.resolve(BaseUserRepository),
+        auth_service=container.resolve(AuthService),
+    )
+    confirm_code_handler = ConfirmCodeCommandHandler(
+        user_repository=container.resolve(BaseUserRepository),
+        auth_service=container.resolve(AuthService),
+    )
+    create_chat_handler = CreateChatCommandHandler(
+        user_repository=container.resolve(BaseUserRepository),
+        chat_repository=container.resolve(BaseChatRepository),
+    )
+    get_user_chats_handler = GetUserChatsCommandHandler(
+        user_repository=container.resolve(BaseUserRepository),
+        chat_repository=container.resolve(BaseChatRepository),
+    )
+    get_user_chat_messages_handler = GetUserChatMessagesCommandHandler(
+        user_repository=container.resolve(BaseUserRepository),
+        message_repository=container.resolve(BaseMessageRepository),
+    )
+    export_chat_messages_handler = ExportChatMessagesCommandHandler(
+        chat_repository=container.resolve(BaseChatRepository),
+        message_repository=container.resolve(BaseMessageRepository),
+    )
+    create_message_command_handler = CreateMessageCommandHandler(
+        user_repository=container.resolve(BaseUserRepository),
+        message_repository=container.resolve(BaseMessageRepository),
+    )
+    buffer_message_command_handler = BufferMessageCommandHandler(
+        message_buffer=container.resolve(MessageWriteBuffer),
+    )
+    add_user_to_chat_command_handler = AddUserToChatCommandHandler(
+        user_repository=container.resolve(BaseUserRepository),
+        chat_repository=container.resolve(BaseChatRepository),
+    )
+    get_users_command_handler = GetUsersCommandHandler(
+        user_repository=container.resolve(BaseUserRepository),
+    )
+    access_check_moderator_command_handler = AccessCheckModeratorCommandHandler(
+        user_repository=container.resolve(BaseUserRepository),
+        auth_service=container.resolve(AuthService),
+        identity_cache=container.resolve(BaseUserIdentityCache),
+    )
+    access_check_user_command_handler = AccessCheckUserCommandHandler(
+        user_repository=container.resolve(BaseUserRepository),
+        auth_service=container.resolve(AuthService),
+        identity_cache=container.resolve(BaseUserIdentityCache),
+    )
+    delete_user_command_handler = DeleteUserCommandHandler(
+        user_repository=container.resolve(BaseUserRepository),
+        auth_service=container.resolve(AuthService),
+    )
+    get_chat_command_handler = GetChatCommandHandler(
+        user_repository=container.resolve(BaseUserRepository),
+        chat_repository=container.resolve(BaseChatRepository),
+    )
+
+    # commands
+    mediator.register_command(command=SignUpCommand, command_handlers=[sign_up_handler])
+    mediator.register_command(command=SignInCommand, command_handlers=[sign_in_handler])
+    mediator.register_command(
+        command=ConfirmCodeCommand, command_handlers=[confirm_code_handler]
+    )
+    mediator.register_command(
+        command=CreateChatCommand, command_handlers=[create_chat_handler]
+    )
+    mediator.register_command(
+        command=GetUserChatsCommand, command_handlers=[get_user_chats_handler]
+    )
+    mediator.register_command(
+        command=GetUserChatMessagesCommand,
+        command_handlers=[get_user_chat_messages_handler],
+    )
+    mediator.register_command(
+        command=ExportChatMessagesCommand,
+        command_handlers=[export_chat_messages_handler],
+    )
+    mediator.register_command(
+        command=CreateMessageCommand,
+        command_handlers=[create_message_command_handler],
+    )
+    mediator.register_command(
+        command=BufferMessageCommand,
+        command_handlers=[buffer_message_command_handler],
+    )
+    mediator.register_command(
+        command=AddUserToChatCommand,
+        command_handlers=[add_user_to_chat_command_handler],
+    )
+    mediator.register_command(
+        command=GetUsersCommand,
+        command_handlers=[get_users_command_handler],
+    )
+    mediator.register_command(
+        command=AccessCheckModeratorCommand,
+        command_handlers=[access_check_moderator_command_handler],
+    )
+    mediator.register_command(
+        command=AccessCheckUserCommand,
+        command_handlers=[access_check_user_command_handler],
+    )
+    mediator.register_command(
+        command=DeleteUserCommand,
+        command_handlers=[delete_user_command_handler],
+    )
+    mediator.register_command(
+        command=GetChatCommand, command_handlers=[get_chat_command_handler]
+    )
+
+    mediator.compile()
+
+    return mediator
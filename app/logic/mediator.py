@@ -1,31 +1,86 @@
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Iterable
+from time import perf_counter
+from types import MappingProxyType
+from typing import Awaitable, Callable, Iterable, Mapping, get_args, get_origin
 
+from infra.metrics.registry import Histogram
 from logic.commands.base import CR, CT, BaseCommand, BaseCommandHandler
 
 from logic.exceptions.mediator import (
+    CommandHandlerTypeMismatchException,
     CommandHandlersNotRegisteredException,
+    MediatorAlreadyCompiledException,
 )
 
 
+def get_handler_command_type(handler: BaseCommandHandler) -> type | None:
+    for klass in type(handler).__mro__:
+        for base in klass.__dict__.get("__orig_bases__", ()):
+            if get_origin(base) is BaseCommandHandler:
+                command_type, _ = get_args(base)
+                return command_type if isinstance(command_type, type) else None
+    return None
+
+
 @dataclass(eq=False)
 class Mediator:
     commands_map: dict[CT, BaseCommandHandler] = field(
         default_factory=lambda: defaultdict(list), kw_only=True
     )
+    dispatch_table: Mapping[type, tuple[Callable[[CT], Awaitable[CR]], ...]] | None = (
+        field(default=None, init=False)
+    )
+    command_latency: Histogram | None = field(default=None, kw_only=True)
 
     def register_command(
         self, command: CT, command_handlers: Iterable[BaseCommandHandler[CT, CR]]
     ):
+        if self.dispatch_table is not None:
+            raise MediatorAlreadyCompiledException(command)
+
         self.commands_map[command].extend(command_handlers)
 
+    def compile(self):
+        dispatch_table = {}
+
+        for command_type, handlers in self.commands_map.items():
+            if not handlers:
+                raise CommandHandlersNotRegisteredException(command_type)
+
+            for handler in handlers:
+                handler_command_type = get_handler_command_type(handler)
+                if handler_command_type is not None and not issubclass(
+                    command_type, handler_command_type
+                ):
+                    raise CommandHandlerTypeMismatchException(
+                        command_type=command_type, handler_type=type(handler)
+                    )
+
+            dispatch_table[command_type] = tuple(handler.handle for handler in handlers)
+
+        self.dispatch_table = MappingProxyType(dispatch_table)
+
     async def handle_command(self, command: BaseCommand) -> Iterable[CR]:
         command_type = command.__class__
 
-        handlers = self.commands_map.get(command_type)
+        if self.dispatch_table is None:
+            handlers = tuple(
+                handler.handle for handler in self.commands_map.get(command_type, ())
+            )
+        else:
+            handlers = self.dispatch_table.get(command_type)
 
         if not handlers:
             raise CommandHandlersNotRegisteredException(command_type)
 
-        return [await handler.handle(command) for handler in handlers]
+        if self.command_latency is None:
+            return [await handle(command) for handle in handlers]
+
+        started = perf_counter()
+        try:
+            return [await handle(command) for handle in handlers]
+        finally:
+            self.command_latency.labels(command_type.__name__).observe(
+                perf_counter() - started
+            )
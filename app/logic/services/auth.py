@@ -1,15 +1,16 @@
 from datetime import datetime, timedelta
 import random
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from domain.entities.users import User
 from infra.caches.users.base import BaseUserCache
 
-import bcrypt
 import jwt
 
+from logic.services.hashers import PasswordHasher
 from logic.services.senders import BaseSenderService
+from logic.services.tokens import JWTKey, VerifiedTokenCache
 from settings.config import AuthJWT
 from jwt.exceptions import DecodeError, InvalidTokenError
 
@@ -19,11 +20,31 @@ class AuthService:
     cache_client: BaseUserCache
     sender_service: BaseSenderService
     authJWT: AuthJWT
+    password_hasher: PasswordHasher = field(default_factory=PasswordHasher)
+    _private_key: JWTKey = field(init=False)
+    _public_key: JWTKey = field(init=False)
+    _verified_tokens: VerifiedTokenCache = field(init=False)
+
+    def __post_init__(self):
+        self._private_key = JWTKey(
+            path=self.authJWT.private_key_path,
+            algorithm=self.authJWT.algorithm,
+            check_interval_seconds=self.authJWT.keys_check_interval_seconds,
+        )
+        self._public_key = JWTKey(
+            path=self.authJWT.publick_key_path,
+            algorithm=self.authJWT.algorithm,
+            check_interval_seconds=self.authJWT.keys_check_interval_seconds,
+        )
+        self._verified_tokens = VerifiedTokenCache(
+            max_size=self.authJWT.verified_tokens_cache_size
+        )
 
     async def hash_password(self, password: str) -> bytes:
-        salt = bcrypt.gensalt()
-        pwd_bytes = password.encode()
-        return bcrypt.hashpw(pwd_bytes, salt)
+        return await self.password_hasher.hash(password)
+
+    def password_needs_rehash(self, user: User) -> bool:
+        return self.password_hasher.needs_rehash(user.credentials.password.value)
 
     async def generate_confirmation_code(self) -> str:
         return str(random.randint(100000, 999999))
@@ -40,7 +61,9 @@ class AuthService:
         )
 
     async def check_user_password(self, user: User, password: str) -> bool:
-        return bcrypt.checkpw(password.encode(), user.credentials.password.value)
+        return await self.password_hasher.check(
+            password, user.credentials.password.value
+        )
 
     async def encode_jwt(self, user: User) -> str:
         now = datetime.now()
@@ -51,20 +74,31 @@ class AuthService:
             "exp": now + timedelta(minutes=self.authJWT.access_token_expire_minutes),
             "iat": now,
         }
+        private_key, _ = self._private_key.get()
         encoded = jwt.encode(
             payload=payload,
-            key=self.authJWT.private_key_path.read_text(),
+            key=private_key,
             algorithm=self.authJWT.algorithm,
         )
         return encoded
 
     async def decode_jwt(self, token: str) -> dict | None:
+        public_key, reloaded = self._public_key.get()
+        if reloaded:
+            self._verified_tokens.clear()
+
+        decoded = self._verified_tokens.get(token)
+        if decoded is not None:
+            return decoded
+
         try:
             decoded = jwt.decode(
                 jwt=token,
-                key=self.authJWT.publick_key_path.read_text(),
+                key=public_key,
                 algorithms=[self.authJWT.algorithm],
             )
-            return decoded
         except (DecodeError, InvalidTokenError):
             return None
+
+        self._verified_tokens.set(token, decoded)
+        return decoded
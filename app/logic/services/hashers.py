@@ -0,0 +1,73 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Literal
+
+import bcrypt
+
+
+def _hash_password(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+
+
+def _check_password(password: bytes, hashed_password: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed_password)
+
+
+def get_bcrypt_rounds(hashed_password: bytes) -> int:
+    # bcrypt hashes look like $2b$12$<salt+hash>
+    return int(hashed_password.split(b"$")[2])
+
+
+@dataclass
+class PasswordHasher:
+    rounds: int = 12
+    max_workers: int = 4
+    executor_type: Literal["thread", "process"] = "thread"
+    queue_depth: int = field(default=0, init=False)
+    in_flight: int = field(default=0, init=False)
+    _executor: Executor | None = field(default=None, init=False)
+    _semaphore: asyncio.Semaphore = field(init=False)
+
+    def __post_init__(self):
+        self._semaphore = asyncio.Semaphore(self.max_workers)
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    async def _run(self, function, *args):
+        self.queue_depth += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queue_depth -= 1
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, function, *args)
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    async def hash(self, password: str) -> bytes:
+        return await self._run(_hash_password, password.encode(), self.rounds)
+
+    async def check(self, password: str, hashed_password: bytes) -> bool:
+        return await self._run(_check_password, password.encode(), hashed_password)
+
+    def needs_rehash(self, hashed_password: bytes) -> bool:
+        return get_bcrypt_rounds(hashed_password) != self.rounds
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,167 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+
+from domain.entities.messages import Message
+from infra.repositories.messages.base import BaseMessageRepository
+from logic.exceptions.messages import MessageWriteBufferClosedException
+
+
+logger = logging.getLogger(__name__)
+
+
+def _chat_oids(messages: list[Message]) -> list[str]:
+    return sorted({message.chat_oid for message in messages})
+
+
+@dataclass
+class WriteBufferStats:
+    flushed_batches: int = 0
+    flushed_messages: int = 0
+    failed_messages: int = 0
+    failed_counter_updates: int = 0
+    retried_batches: int = 0
+    backpressure_waits: int = 0
+
+
+@dataclass(eq=False)
+class WriteLane:
+    pending: list[Message] = field(default_factory=list)
+    wakeup: asyncio.Event = field(default_factory=asyncio.Event)
+    full: asyncio.Event = field(default_factory=asyncio.Event)
+    space: asyncio.Event = field(default_factory=asyncio.Event)
+    task: asyncio.Task | None = None
+
+
+@dataclass
+class MessageWriteBuffer:
+    message_repository: BaseMessageRepository
+    max_batch_size: int = 500
+    flush_interval_seconds: float = 0.05
+    max_in_flight: int = 4
+    max_pending: int = 10_000
+    max_retries: int = 3
+    retry_backoff_seconds: float = 0.1
+    stats: WriteBufferStats = field(default_factory=WriteBufferStats, kw_only=True)
+    _lanes: list[WriteLane] = field(init=False)
+    _closing: bool = field(default=False, init=False)
+
+    def __post_init__(self):
+        # A chat always maps to the same lane, and a lane writes one batch at a time,
+        # so messages of a chat are stored in the order they were received
+        self._lanes = [WriteLane() for _ in range(self.max_in_flight)]
+
+    @property
+    def pending(self) -> int:
+        return sum(len(lane.pending) for lane in self._lanes)
+
+    def _get_lane(self, chat_oid: str) -> WriteLane:
+        return self._lanes[hash(chat_oid) % len(self._lanes)]
+
+    async def add(self, message: Message):
+        # Lane tasks finish once closing starts, a late message would never be written
+        if self._closing:
+            raise MessageWriteBufferClosedException()
+
+        lane = self._get_lane(message.chat_oid)
+
+        # Only an overloaded lane makes the caller wait for storage
+        while len(lane.pending) >= self.max_pending:
+            self.stats.backpressure_waits += 1
+            lane.space.clear()
+            await lane.space.wait()
+
+        lane.pending.append(message)
+
+        if lane.task is None:
+            lane.task = asyncio.create_task(self._run(lane))
+        if len(lane.pending) == 1:
+            lane.wakeup.set()
+        if len(lane.pending) >= self.max_batch_size:
+            lane.full.set()
+
+    async def _flush(self, lane: WriteLane):
+        while lane.pending:
+            batch = lane.pending[: self.max_batch_size]
+            del lane.pending[: self.max_batch_size]
+            lane.space.set()
+
+            await self._write(batch)
+
+    async def _write(self, batch: list[Message]):
+        # Messages are already broadcast, so a failed batch is retried before the lane
+        # moves on, which keeps the order of a chat. Stored messages are never inserted
+        # again, a retry only repeats the step that failed
+        inserted = False
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.stats.retried_batches += 1
+                await asyncio.sleep(self.retry_backoff_seconds * 2 ** (attempt - 1))
+
+            try:
+                if not inserted:
+                    await self.message_repository.insert_messages(batch)
+                    inserted = True
+                await self.message_repository.update_chat_counters(batch)
+            except Exception:
+                logger.exception(
+                    "Failed to %s for %d messages of chats %s, attempt %d",
+                    "update chat counters" if inserted else "insert",
+                    len(batch),
+                    _chat_oids(batch),
+                    attempt + 1,
+                )
+            else:
+                self.stats.flushed_batches += 1
+                self.stats.flushed_messages += len(batch)
+                return
+
+        if inserted:
+            self.stats.flushed_messages += len(batch)
+            self.stats.failed_counter_updates += len(batch)
+            logger.error(
+                "Stored %d messages of chats %s without updating chat counters",
+                len(batch),
+                _chat_oids(batch),
+            )
+            return
+
+        self.stats.failed_messages += len(batch)
+        logger.error(
+            "Dropped %d messages of chats %s after %d attempts",
+            len(batch),
+            _chat_oids(batch),
+            self.max_retries + 1,
+        )
+
+    async def _run(self, lane: WriteLane):
+        while True:
+            await lane.wakeup.wait()
+            lane.wakeup.clear()
+
+            if not self._closing and len(lane.pending) < self.max_batch_size:
+                try:
+                    await asyncio.wait_for(
+                        lane.full.wait(), timeout=self.flush_interval_seconds
+                    )
+                except asyncio.TimeoutError:
+                    pass
+            lane.full.clear()
+
+            await self._flush(lane)
+
+            if self._closing and not lane.pending:
+                return
+
+    async def close(self):
+        self._closing = True
+        tasks = [lane.task for lane in self._lanes if lane.task is not None]
+
+        for lane in self._lanes:
+            lane.wakeup.set()
+            lane.full.set()
+
+        await asyncio.gather(*tasks)
+
+        for lane in self._lanes:
+            await self._flush(lane)
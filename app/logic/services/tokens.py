@@ -0,0 +1,81 @@
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import monotonic, time
+from typing import Any
+
+from jwt.algorithms import get_default_algorithms
+
+
+@dataclass
+class JWTKey:
+    path: Path
+    algorithm: str
+    check_interval_seconds: float = 1
+    _key: Any = field(default=None, init=False)
+    _mtime_ns: int | None = field(default=None, init=False)
+    _checked_at: float = field(default=float("-inf"), init=False)
+
+    def _load(self, mtime_ns: int):
+        algorithm = get_default_algorithms()[self.algorithm]
+        self._key = algorithm.prepare_key(self.path.read_bytes())
+        self._mtime_ns = mtime_ns
+
+    def get(self) -> tuple[Any, bool]:
+        now = monotonic()
+        if now - self._checked_at < self.check_interval_seconds:
+            return self._key, False
+
+        self._checked_at = now
+        mtime_ns = self.path.stat().st_mtime_ns
+        if mtime_ns == self._mtime_ns:
+            return self._key, False
+
+        self._load(mtime_ns)
+        return self._key, True
+
+
+@dataclass
+class VerifiedTokenCache:
+    max_size: int = 10_000
+    _entries: OrderedDict[bytes, tuple[float, dict]] = field(
+        default_factory=OrderedDict, init=False
+    )
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> dict | None:
+        digest = self._digest(token)
+        entry = self._entries.get(digest)
+
+        if entry is None:
+            return None
+
+        expires_at, payload = entry
+        if expires_at <= time():
+            del self._entries[digest]
+            return None
+
+        self._entries.move_to_end(digest)
+        return dict(payload)
+
+    def set(self, token: str, payload: dict):
+        expires_at = payload.get("exp")
+        if expires_at is None or self.max_size <= 0:
+            return
+
+        digest = self._digest(token)
+        self._entries[digest] = (float(expires_at), dict(payload))
+        self._entries.move_to_end(digest)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,5 +1,7 @@
 import os
 from pathlib import Path
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 from pydantic import BaseModel
 
@@ -13,6 +15,14 @@ class AuthJWT(BaseModel):
     publick_key_path: Path = BASE_DIR / "certs" / "jwt-public.pem"
     algorithm: str = "RS256"
     access_token_expire_minutes: int = 120
+    keys_check_interval_seconds: float = 1
+    verified_tokens_cache_size: int = 10_000
+
+
+class PasswordHasherConfig(BaseModel):
+    bcrypt_rounds: int = 12
+    max_workers: int = 4
+    executor_type: Literal["thread", "process"] = "thread"
 
 
 class CacheConfig(BaseModel):
@@ -20,6 +30,42 @@ class CacheConfig(BaseModel):
     cache_port: int = 6379
     cache_password: str = "root"
     cache_host: str = "cache"
+    identity_cache_expire_seconds: int = 300
+    identity_cache_local_expire_seconds: float = 5
+    identity_cache_local_max_size: int = 10_000
+
+
+class WebSocketConfig(BaseModel):
+    outbound_queue_size: int = 256
+    overflow_policy: Literal["drop_oldest", "disconnect"] = "drop_oldest"
+    overflow_close_code: int = 1013
+    heartbeat_interval_seconds: float = 30
+    max_missed_pongs: int = 2
+    heartbeat_close_code: int = 1001
+    max_connections: int = 10_000
+    connection_limit_close_code: int = 1013
+    backplane: Literal["memory", "redis"] = "memory"
+    backplane_channel_prefix: str = "chat"
+    backplane_subscription_interval_seconds: float = 0.05
+    write_buffer_batch_size: int = 500
+    write_buffer_flush_interval_seconds: float = 0.05
+    write_buffer_max_in_flight: int = 4
+    write_buffer_max_pending: int = 10_000
+    write_buffer_max_retries: int = 3
+    write_buffer_retry_backoff_seconds: float = 0.1
+
+
+class MetricsConfig(BaseModel):
+    enabled: bool = False
+    token: str | None = None
+
+
+class StorageConfig(BaseModel):
+    backend: Literal["mongo", "memory"] = "mongo"
+
+
+class ApiConfig(BaseModel):
+    fast_json_responses: bool = False
 
 
 class MongoConfig(BaseModel):
@@ -28,9 +74,19 @@ class MongoConfig(BaseModel):
     mongodb_chat_collection: str = "chats"
     mongodb_message_collection: str = "messages"
     mongodb_user_collection: str = "users"
+    mongodb_verify_indexes: bool = False
+    mongodb_monitor_commands: bool = True
+    mongodb_slow_command_ms: float = 100
+    mongodb_request_command_budget: int = 20
+    mongodb_request_budget_action: Literal["warn", "raise"] = "warn"
 
 
 class Settings(BaseSettings):
     auth_jwt: AuthJWT = AuthJWT()
+    password_hasher: PasswordHasherConfig = PasswordHasherConfig()
     cache_config: CacheConfig = CacheConfig()
     mongo_config: MongoConfig = MongoConfig()
+    websocket_config: WebSocketConfig = WebSocketConfig()
+    api_config: ApiConfig = ApiConfig()
+    storage_config: StorageConfig = StorageConfig()
+    metrics_config: MetricsConfig = MetricsConfig()
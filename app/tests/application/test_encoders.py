@@ -0,0 +1,69 @@
+import json
+from datetime import datetime
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from application.api.messages.encoders import (
+    accepts_gzip,
+    encode_chat_messages,
+    encode_user_chats,
+)
+from application.api.messages.schemas import (
+    ChatDetailSchema,
+    GetUserChatMessagesSchema,
+    GetUserChatsSchema,
+    MessageDetailSchema,
+)
+from domain.entities.messages import Chat, Message
+from domain.values.messages import Text, Title
+from tests.fixtures import create_user
+
+
+def test_fast_encoders_match_schemas():
+    user = create_user("user", "+79010000001")
+    chat = Chat(title=Title(value="chat"), users={user})
+    messages = [
+        Message(
+            text=Text(value=f"привет {i}"),
+            sender_oid=user.oid,
+            chat_oid=chat.oid,
+            created_at=datetime(2024, 1, 1, 12, 0, i, i * 1000),
+        )
+        for i in range(3)
+    ]
+    chat.track_message(messages[-1])
+    empty_chat = Chat(title=Title(value="empty"))
+
+    messages_schema = GetUserChatMessagesSchema(
+        count=len(messages),
+        messages=[MessageDetailSchema.from_entity(message) for message in messages],
+    )
+    chats_schema = GetUserChatsSchema(
+        count=2,
+        chats=[ChatDetailSchema.from_entity(c) for c in (chat, empty_chat)],
+    )
+
+    assert json.loads(encode_chat_messages(messages)) == jsonable_encoder(
+        messages_schema
+    )
+    assert json.loads(encode_user_chats([chat, empty_chat])) == jsonable_encoder(
+        chats_schema
+    )
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("gzip, deflate, br", True),
+        ("br;q=1.0, GZIP;q=0.5", True),
+        ("*", True),
+        ("gzip;q=0", False),
+        ("gzip;q=0.0, *;q=1", False),
+        ("gzipped, deflate", False),
+        ("identity", False),
+        ("", False),
+    ],
+)
+def test_accepts_gzip_respects_quality_values(accept_encoding: str, expected: bool):
+    assert accepts_gzip(accept_encoding) is expected
@@ -0,0 +1,35 @@
+from fastapi.testclient import TestClient
+from punq import Scope
+
+from application.api.main import create_application
+from logic.init import init_container
+from settings.config import MetricsConfig, Settings
+from tests.fixtures import init_dummy_container
+
+
+def create_client(metrics_config: MetricsConfig) -> TestClient:
+    container = init_dummy_container()
+    container.register(
+        Settings,
+        instance=Settings(metrics_config=metrics_config),
+        scope=Scope.singleton,
+    )
+    app = create_application()
+    app.dependency_overrides[init_container] = lambda: container
+    return TestClient(app)
+
+
+def test_metrics_are_disabled_by_default():
+    client = create_client(MetricsConfig())
+
+    assert client.get("/metrics").status_code == 404
+    assert "/metrics" not in client.get("/openapi.json").json()["paths"]
+
+
+def test_metrics_require_the_configured_token():
+    client = create_client(MetricsConfig(enabled=True, token="secret"))
+
+    assert client.get("/metrics").status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer secret"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
@@ -0,0 +1,96 @@
+from collections.abc import AsyncIterator
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from punq import Scope
+
+from application.api.main import create_application
+from domain.entities.messages import Chat, Message
+from domain.values.messages import Text, Title
+from infra.caches.users.memory import MemoryUserCache
+from infra.repositories.messages.base import BaseChatRepository, BaseMessageRepository
+from infra.repositories.messages.memory import MemoryMessageRepository
+from infra.repositories.monitoring import MongoCommandMonitor
+from infra.repositories.users.base import BaseUserRepository
+from logic.init import get_mediator, init_container
+from logic.mediator import Mediator
+from logic.services.auth import AuthService
+from logic.services.hashers import PasswordHasher
+from logic.services.senders import DummySenderService
+from settings.config import AuthJWT
+from tests.fixtures import create_user, init_dummy_container, write_key_pair
+
+
+class QueryingMessageRepository(MemoryMessageRepository):
+    async def iter_messages_by_chat_oid(
+        self, chat_oid: str, after: str | None = None, batch_size: int = 500
+    ) -> AsyncIterator[list[Message]]:
+        # Every batch of a Mongo export is a getMore round trip
+        monitor = init_container().resolve(MongoCommandMonitor)
+        async for batch in super().iter_messages_by_chat_oid(
+            chat_oid=chat_oid, after=after, batch_size=batch_size
+        ):
+            for request_id in range(3):
+                event = SimpleNamespace(
+                    command_name="getMore",
+                    command={"getMore": 1, "collection": "messages"},
+                    connection_id=("localhost", 27017),
+                    request_id=request_id,
+                    duration_micros=0,
+                )
+                monitor.started(event)
+                monitor.succeeded(event)
+            yield batch
+
+
+@pytest.mark.asyncio
+async def test_streamed_export_is_not_counted_against_the_request_budget(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    monitor = init_container().resolve(MongoCommandMonitor)
+    monkeypatch.setattr(monitor, "request_command_budget", 1)
+    monkeypatch.setattr(monitor, "budget_action", "raise")
+
+    auth_jwt = AuthJWT(
+        private_key_path=tmp_path / "jwt-private.pem",
+        publick_key_path=tmp_path / "jwt-public.pem",
+    )
+    write_key_pair(auth_jwt.private_key_path, auth_jwt.publick_key_path)
+    auth_service = AuthService(
+        cache_client=MemoryUserCache(),
+        sender_service=DummySenderService(),
+        authJWT=auth_jwt,
+        password_hasher=PasswordHasher(rounds=4, max_workers=1),
+    )
+    container = init_dummy_container()
+    container.register(AuthService, instance=auth_service, scope=Scope.singleton)
+    container.register(
+        BaseMessageRepository, QueryingMessageRepository, scope=Scope.singleton
+    )
+
+    user = create_user("user", "+79010000001")
+    user.is_confirmed = True
+    chat = Chat(title=Title(value="chat"), users={user})
+    await container.resolve(BaseUserRepository).add_user(user)
+    await container.resolve(BaseChatRepository).add_chat(chat)
+    messages = [
+        Message(text=Text(value=f"{i}"), sender_oid=user.oid, chat_oid=chat.oid)
+        for i in range(3)
+    ]
+    await container.resolve(BaseMessageRepository).add_messages(messages)
+
+    app = create_application()
+    mediator = container.resolve(Mediator)
+    app.dependency_overrides[get_mediator] = lambda: mediator
+    client = TestClient(app)
+    token = await auth_service.encode_jwt(user)
+
+    response = client.get(
+        f"/chats/{chat.oid}/messages/export/",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == len(messages)
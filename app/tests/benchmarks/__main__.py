@@ -0,0 +1,143 @@
+import argparse
+import asyncio
+import gc
+import inspect
+import json
+import platform
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from tests.benchmarks.bench_auth import bench_auth
+from tests.benchmarks.bench_converters import bench_converters
+from tests.benchmarks.bench_entities import bench_entities
+from tests.benchmarks.bench_mediator import bench_mediator
+from tests.benchmarks.bench_metrics import bench_metrics
+from tests.benchmarks.bench_repositories import bench_repositories
+from tests.benchmarks.bench_responses import bench_responses
+from tests.benchmarks.bench_values import bench_values
+
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+
+@dataclass(frozen=True)
+class Suite:
+    name: str
+    function: Callable
+    quick: dict = field(default_factory=dict)
+
+
+SUITES = (
+    Suite("mediator", bench_mediator, quick={"iterations": 2_000}),
+    Suite("auth", bench_auth, quick={"iterations": 200}),
+    Suite("values", bench_values, quick={"iterations": 20_000}),
+    Suite("entities", bench_entities, quick={"count": 100_000}),
+    Suite("converters", bench_converters, quick={"count": 100_000}),
+    Suite(
+        "repositories",
+        bench_repositories,
+        quick={"chats_count": 1_000, "messages_count": 100_000, "lookups": 1_000},
+    ),
+    Suite("responses", bench_responses, quick={"iterations": 5}),
+    Suite("metrics", bench_metrics, quick={"iterations": 20_000}),
+)
+
+
+def run_suite(suite: Suite, quick: bool) -> dict[str, float]:
+    kwargs = suite.quick if quick else {}
+    gc.collect()
+    if inspect.iscoroutinefunction(suite.function):
+        return asyncio.run(suite.function(**kwargs))
+    return suite.function(**kwargs)
+
+
+def run_suites(suites: tuple[Suite, ...], quick: bool, repeat: int) -> dict[str, float]:
+    # Every metric is a cost, so the best of several runs is the least noisy one
+    results = {}
+    for suite in suites:
+        for _ in range(repeat):
+            for metric, value in run_suite(suite, quick).items():
+                name = f"{suite.name}.{metric}"
+                results[name] = min(value, results.get(name, value))
+    return results
+
+
+def compare_results(
+    results: dict[str, float], baseline: dict[str, float], threshold: float
+) -> list[str]:
+    regressions = []
+    for name, value in results.items():
+        reference = baseline.get(name)
+        if reference is None or reference <= 0:
+            continue
+        change = value / reference - 1
+        if change > threshold:
+            regressions.append(
+                f"{name}: {reference:.3f} -> {value:.3f} (+{change:.0%})"
+            )
+    return regressions
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmarks")
+    parser.add_argument("--only", nargs="+", choices=[suite.name for suite in SUITES])
+    parser.add_argument("--quick", action="store_true", help="run with small sizes")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--update-baseline", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    suites = tuple(
+        suite for suite in SUITES if args.only is None or suite.name in args.only
+    )
+
+    results = run_suites(suites, quick=args.quick, repeat=args.repeat)
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "quick": args.quick,
+        "results": results,
+    }
+
+    for name, value in results.items():
+        print(f"{name}: {value:.3f}", file=sys.stderr)
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2, sort_keys=True))
+
+    if args.update_baseline:
+        # Suites left out with --only keep their previous baseline values
+        if args.baseline.exists():
+            previous = json.loads(args.baseline.read_text())
+            if previous.get("quick") == args.quick:
+                report["results"] = {**previous["results"], **results}
+        args.baseline.write_text(json.dumps(report, indent=2, sort_keys=True))
+        return 0
+
+    if not args.baseline.exists():
+        print(json.dumps(report, sort_keys=True))
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    if baseline.get("quick") != args.quick:
+        print("baseline was recorded with a different --quick setting", file=sys.stderr)
+        return 2
+
+    regressions = compare_results(results, baseline["results"], args.threshold)
+    report["regressions"] = regressions
+    print(json.dumps(report, sort_keys=True))
+
+    for regression in regressions:
+        print(f"regression: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,52 @@
+import asyncio
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+import jwt
+
+from infra.caches.users.memory import MemoryUserCache
+from logic.services.auth import AuthService
+from logic.services.senders import DummySenderService
+from settings.config import AuthJWT
+from tests.fixtures import create_user, write_key_pair
+
+
+async def bench_auth(iterations: int = 2000) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as directory:
+        auth_jwt = AuthJWT(
+            private_key_path=Path(directory) / "jwt-private.pem",
+            publick_key_path=Path(directory) / "jwt-public.pem",
+        )
+        write_key_pair(auth_jwt.private_key_path, auth_jwt.publick_key_path)
+        auth_service = AuthService(
+            cache_client=MemoryUserCache(),
+            sender_service=DummySenderService(),
+            authJWT=auth_jwt,
+        )
+        token = await auth_service.encode_jwt(create_user("user", "+79010000000"))
+
+        # Previous behaviour: read the key file and verify the signature each time
+        started = perf_counter()
+        for _ in range(iterations):
+            jwt.decode(
+                jwt=token,
+                key=auth_jwt.publick_key_path.read_text(),
+                algorithms=[auth_jwt.algorithm],
+            )
+        uncached = (perf_counter() - started) / iterations
+
+        started = perf_counter()
+        for _ in range(iterations):
+            await auth_service.decode_jwt(token)
+        cached = (perf_counter() - started) / iterations
+
+    return {
+        "decode_jwt_uncached_us": uncached * 1_000_000,
+        "decode_jwt_cached_us": cached * 1_000_000,
+    }
+
+
+if __name__ == "__main__":
+    for name, value in asyncio.run(bench_auth()).items():
+        print(f"{name}: {value:.2f}")
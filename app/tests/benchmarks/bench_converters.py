@@ -0,0 +1,43 @@
+import asyncio
+from time import perf_counter
+
+from infra.repositories.converters import convert_in_chunks
+from infra.repositories.messages.converters import (
+    convert_message_document_to_entity,
+    convert_message_documents_to_entities,
+    convert_message_entities_to_documents,
+)
+from tests.benchmarks.bench_entities import _documents
+
+
+async def bench_converters(count: int = 1_000_000) -> dict[str, float]:
+    documents = _documents(count)
+
+    started = perf_counter()
+    [convert_message_document_to_entity(document) for document in documents]
+    single = perf_counter() - started
+
+    started = perf_counter()
+    convert_message_documents_to_entities(documents)
+    batch = perf_counter() - started
+
+    started = perf_counter()
+    messages = await convert_in_chunks(documents, convert_message_documents_to_entities)
+    chunked = perf_counter() - started
+
+    del documents
+    started = perf_counter()
+    convert_message_entities_to_documents(messages)
+    to_documents = perf_counter() - started
+
+    return {
+        "document_to_entity_single_us": single / count * 1_000_000,
+        "documents_to_entities_batch_us": batch / count * 1_000_000,
+        "documents_to_entities_chunked_us": chunked / count * 1_000_000,
+        "entities_to_documents_batch_us": to_documents / count * 1_000_000,
+    }
+
+
+if __name__ == "__main__":
+    for name, value in asyncio.run(bench_converters()).items():
+        print(f"{name}: {value:.2f}")
@@ -0,0 +1,68 @@
+import gc
+import tracemalloc
+from datetime import datetime
+from time import perf_counter
+from uuid import uuid4
+
+from domain.entities.messages import Message
+from domain.values.messages import Text
+
+
+def _documents(count: int) -> list[dict]:
+    created_at = datetime.now()
+    return [
+        {
+            "oid": str(uuid4()),
+            "text": f"message {index}",
+            "sender_oid": "sender",
+            "chat_oid": "chat",
+            "created_at": created_at,
+        }
+        for index in range(count)
+    ]
+
+
+def _hydrate(documents: list[dict], text_factory) -> list[Message]:
+    return [
+        Message(
+            text=text_factory(document["text"]),
+            sender_oid=document["sender_oid"],
+            chat_oid=document["chat_oid"],
+            oid=document["oid"],
+            created_at=document["created_at"],
+        )
+        for document in documents
+    ]
+
+
+def _timed(documents: list[dict], text_factory) -> float:
+    gc.collect()
+    started = perf_counter()
+    _hydrate(documents, text_factory)
+    return perf_counter() - started
+
+
+def bench_entities(count: int = 1_000_000) -> dict[str, float]:
+    documents = _documents(count)
+
+    validated = _timed(documents, Text)
+    trusted = _timed(documents, Text.from_trusted)
+
+    # Only the entity and value objects are counted, the strings belong to the documents
+    gc.collect()
+    tracemalloc.start()
+    messages = _hydrate(documents, Text.from_trusted)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "message_bytes": (allocated - len(messages) * 8) / count,
+        "hydrate_validated_s": validated,
+        "hydrate_trusted_s": trusted,
+        "hydrate_trusted_us_per_message": trusted / count * 1_000_000,
+    }
+
+
+if __name__ == "__main__":
+    for name, value in bench_entities().items():
+        print(f"{name}: {value:.2f}")
@@ -0,0 +1,39 @@
+import asyncio
+from time import perf_counter
+
+from domain.entities.messages import Chat
+from domain.values.messages import Title
+from infra.repositories.messages.base import BaseChatRepository
+from logic.commands.messages import GetChatCommand
+from logic.init import init_mediator
+from logic.mediator import Mediator
+from tests.fixtures import init_dummy_container
+
+
+async def bench_mediator(iterations: int = 20_000) -> dict[str, float]:
+    container = init_dummy_container()
+    chat = Chat(title=Title(value="benchmark"))
+    await container.resolve(BaseChatRepository).add_chat(chat)
+    command = GetChatCommand(chat_oid=chat.oid)
+
+    # Previous behaviour: every request built a new mediator and its handlers
+    started = perf_counter()
+    for _ in range(iterations):
+        await init_mediator(container).handle_command(command)
+    rebuilt = (perf_counter() - started) / iterations
+
+    mediator: Mediator = container.resolve(Mediator)
+    started = perf_counter()
+    for _ in range(iterations):
+        await mediator.handle_command(command)
+    shared = (perf_counter() - started) / iterations
+
+    return {
+        "mediator_rebuilt_per_request_us": rebuilt * 1_000_000,
+        "mediator_shared_dispatch_us": shared * 1_000_000,
+    }
+
+
+if __name__ == "__main__":
+    for name, value in asyncio.run(bench_mediator()).items():
+        print(f"{name}: {value:.2f}")
@@ -0,0 +1,48 @@
+import asyncio
+from time import perf_counter
+
+from infra.metrics.registry import MetricsRegistry
+from infra.metrics.repositories import InstrumentedChatRepository
+from infra.repositories.messages.memory import MemoryChatRepository, MemoryChatStorage
+
+
+async def _lookups(repository, iterations: int) -> float:
+    started = perf_counter()
+    for _ in range(iterations):
+        await repository.get_chat_by_chat_oid("missing")
+    return (perf_counter() - started) / iterations
+
+
+def bench_metrics(iterations: int = 200_000) -> dict[str, float]:
+    histogram = MetricsRegistry().histogram(
+        "chat_bench_seconds", "Benchmark latency", ("repository", "method")
+    )
+
+    child = histogram.labels("chat", "get_chat_by_chat_oid")
+    started = perf_counter()
+    for _ in range(iterations):
+        child.observe(0.003)
+    observe = (perf_counter() - started) / iterations
+
+    started = perf_counter()
+    for _ in range(iterations):
+        histogram.labels("chat", "get_chat_by_chat_oid").observe(0.003)
+    labelled_observe = (perf_counter() - started) / iterations
+
+    repository = MemoryChatRepository(storage=MemoryChatStorage())
+    instrumented = InstrumentedChatRepository(
+        histogram=histogram, name="chat", repository=repository
+    )
+    plain = asyncio.run(_lookups(repository, iterations))
+    wrapped = asyncio.run(_lookups(instrumented, iterations))
+
+    return {
+        "observe_us": observe * 1_000_000,
+        "labelled_observe_us": labelled_observe * 1_000_000,
+        "repository_overhead_us": (wrapped - plain) * 1_000_000,
+    }
+
+
+if __name__ == "__main__":
+    for name, value in bench_metrics().items():
+        print(f"{name}: {value:.2f}")
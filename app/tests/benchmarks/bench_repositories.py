@@ -0,0 +1,97 @@
+import asyncio
+import random
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from domain.entities.messages import Chat, Message
+from domain.values.messages import Text, Title
+from infra.repositories.filters.messages import GetMessagesFilters
+from infra.repositories.messages.memory import (
+    MemoryChatRepository,
+    MemoryChatStorage,
+    MemoryMessageRepository,
+)
+from tests.fixtures import create_user
+
+
+async def bench_repositories(
+    chats_count: int = 10_000,
+    messages_count: int = 1_000_000,
+    batch_size: int = 500,
+    lookups: int = 10_000,
+) -> dict[str, float]:
+    storage = MemoryChatStorage()
+    chat_repository = MemoryChatRepository(storage=storage)
+    message_repository = MemoryMessageRepository(storage=storage)
+    users = [create_user(f"user {i}", f"+7901{i:07}") for i in range(chats_count // 10)]
+    random.seed(0)
+
+    chats = []
+    for i in range(chats_count):
+        chat = Chat(title=Title(value=f"chat {i}"), users=set(random.sample(users, 2)))
+        chats.append(chat)
+
+    started = perf_counter()
+    for chat in chats:
+        await chat_repository.add_chat(chat)
+    add_chat = (perf_counter() - started) / chats_count
+
+    now = datetime.now()
+    text = Text(value="hello")
+    messages = [
+        Message(
+            text=text,
+            sender_oid="user",
+            chat_oid=chats[i % chats_count].oid,
+            created_at=now + timedelta(microseconds=i),
+        )
+        for i in range(messages_count)
+    ]
+
+    started = perf_counter()
+    for start in range(0, messages_count, batch_size):
+        await message_repository.add_messages(messages[start : start + batch_size])
+    add_messages = (perf_counter() - started) / messages_count
+
+    sampled_chats = random.choices(chats, k=lookups)
+    started = perf_counter()
+    for chat in sampled_chats:
+        await message_repository.get_messages_by_chat_oid(
+            chat_oid=chat.oid, filters=GetMessagesFilters()
+        )
+    latest_page = (perf_counter() - started) / lookups
+
+    cursors = random.choices(messages, k=lookups)
+    started = perf_counter()
+    for cursor in cursors:
+        await message_repository.get_messages_by_chat_oid(
+            chat_oid=cursor.chat_oid, filters=GetMessagesFilters(before=cursor.oid)
+        )
+    cursor_page = (perf_counter() - started) / lookups
+
+    sampled_users = random.choices(users, k=lookups)
+    started = perf_counter()
+    for user in sampled_users:
+        await chat_repository.get_chats_by_user_oid(user.oid)
+    user_chats = (perf_counter() - started) / lookups
+
+    started = perf_counter()
+    exported = 0
+    for chat in chats[:100]:
+        async for batch in message_repository.iter_messages_by_chat_oid(chat.oid):
+            exported += len(batch)
+    export = (perf_counter() - started) / max(exported, 1)
+
+    return {
+        "add_chat_us": add_chat * 1_000_000,
+        "add_messages_us_per_message": add_messages * 1_000_000,
+        "latest_page_us": latest_page * 1_000_000,
+        "cursor_page_us": cursor_page * 1_000_000,
+        "user_chats_us": user_chats * 1_000_000,
+        "export_us_per_message": export * 1_000_000,
+    }
+
+
+if __name__ == "__main__":
+    for name, value in asyncio.run(bench_repositories()).items():
+        print(f"{name}: {value:.2f}")
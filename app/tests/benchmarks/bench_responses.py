@@ -0,0 +1,79 @@
+from time import perf_counter
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from application.api.messages.encoders import encode_chat_messages, encode_user_chats
+from application.api.messages.schemas import (
+    ChatDetailSchema,
+    GetUserChatMessagesSchema,
+    GetUserChatsSchema,
+    MessageDetailSchema,
+)
+from domain.entities.messages import Chat, Message
+from domain.values.messages import Text, Title
+from tests.fixtures import create_user
+
+
+def _timed(encode, iterations: int) -> float:
+    started = perf_counter()
+    for _ in range(iterations):
+        encode()
+    return (perf_counter() - started) / iterations
+
+
+def _schema_messages(messages: list[Message]) -> bytes:
+    # What FastAPI does with a returned model: jsonable_encoder, then JSONResponse
+    schema = GetUserChatMessagesSchema(
+        count=len(messages),
+        messages=[MessageDetailSchema.from_entity(message) for message in messages],
+    )
+    return JSONResponse(jsonable_encoder(schema)).body
+
+
+def _schema_chats(chats: list[Chat]) -> bytes:
+    schema = GetUserChatsSchema(
+        count=len(chats), chats=[ChatDetailSchema.from_entity(chat) for chat in chats]
+    )
+    return JSONResponse(jsonable_encoder(schema)).body
+
+
+def bench_responses(
+    page_size: int = 1_000, chats_count: int = 100, iterations: int = 50
+) -> dict[str, float]:
+    users = [create_user(f"user {i}", f"+7901{i:07}") for i in range(2)]
+    chats = []
+    for i in range(chats_count):
+        chat = Chat(title=Title(value=f"chat {i}"), users=set(users))
+        chat.track_message(
+            Message(
+                text=Text(value="hello"), sender_oid=users[0].oid, chat_oid=chat.oid
+            )
+        )
+        chats.append(chat)
+
+    messages = [
+        Message(
+            text=Text(value=f"message number {i}"),
+            sender_oid=users[i % 2].oid,
+            chat_oid=chats[0].oid,
+        )
+        for i in range(page_size)
+    ]
+
+    schema_page = _timed(lambda: _schema_messages(messages), iterations)
+    fast_page = _timed(lambda: encode_chat_messages(messages), iterations)
+    schema_chats = _timed(lambda: _schema_chats(chats), iterations)
+    fast_chats = _timed(lambda: encode_user_chats(chats), iterations)
+
+    return {
+        "messages_page_schema_ms": schema_page * 1_000,
+        "messages_page_fast_ms": fast_page * 1_000,
+        "chats_list_schema_ms": schema_chats * 1_000,
+        "chats_list_fast_ms": fast_chats * 1_000,
+    }
+
+
+if __name__ == "__main__":
+    for name, value in bench_responses().items():
+        print(f"{name}: {value:.2f}")
@@ -0,0 +1,27 @@
+from time import perf_counter
+
+from domain.values.messages import Text, Title
+from domain.values.users import Password, Phone, Username
+
+
+def _timed(factory, value, iterations: int) -> float:
+    started = perf_counter()
+    for _ in range(iterations):
+        factory(value)
+    return (perf_counter() - started) / iterations
+
+
+def bench_values(iterations: int = 200_000) -> dict[str, float]:
+    return {
+        "text_validated_us": _timed(Text, "hello", iterations) * 1_000_000,
+        "text_trusted_us": _timed(Text.from_trusted, "hello", iterations) * 1_000_000,
+        "title_validated_us": _timed(Title, "chat", iterations) * 1_000_000,
+        "username_validated_us": _timed(Username, "user", iterations) * 1_000_000,
+        "phone_validated_us": _timed(Phone, "+79010000000", iterations) * 1_000_000,
+        "password_validated_us": _timed(Password, b"x" * 60, iterations) * 1_000_000,
+    }
+
+
+if __name__ == "__main__":
+    for name, value in bench_values().items():
+        print(f"{name}: {value:.2f}")
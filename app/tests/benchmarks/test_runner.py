@@ -0,0 +1,15 @@
+from tests.benchmarks.__main__ import compare_results
+
+
+def test_compare_results_reports_only_regressions_over_threshold():
+    baseline = {"a.slow_us": 10.0, "a.fast_us": 10.0, "a.zero_us": 0.0}
+    results = {
+        "a.slow_us": 13.0,
+        "a.fast_us": 11.0,
+        "a.zero_us": 5.0,
+        "a.new_us": 1.0,
+    }
+
+    regressions = compare_results(results, baseline, threshold=0.2)
+
+    assert regressions == ["a.slow_us: 10.000 -> 13.000 (+30%)"]
@@ -20,3 +20,19 @@ def test_create_message_success(user1: User, user2: User, faker: Faker):
 def test_create_empty_message_text():
     with pytest.raises(EmptyTextException):
         Text("")
+
+
+def test_trusted_text_skips_validation():
+    text = Text.from_trusted("")
+
+    assert text.value == ""
+    assert text == Text.from_trusted("")
+    assert not hasattr(text, "__dict__")
+
+
+def test_message_has_no_instance_dict(user1: User):
+    message = Message(text=Text("hello"), sender_oid=user1.oid, chat_oid="chatoid")
+
+    assert not hasattr(message, "__dict__")
+    with pytest.raises(AttributeError):
+        message.unknown = 1
@@ -1,10 +1,19 @@
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
 from punq import Container, Scope
 
+from domain.entities.users import Credentials, User
+from domain.values.users import Password, Phone, Username
+from infra.caches.identities.base import BaseUserIdentityCache
+from infra.caches.identities.memory import MemoryUserIdentityCache
 from infra.caches.users.base import BaseUserCache
 from infra.caches.users.memory import MemoryUserCache
 from infra.repositories.messages.base import BaseChatRepository, BaseMessageRepository
 from infra.repositories.messages.memory import (
     MemoryChatRepository,
+    MemoryChatStorage,
     MemoryMessageRepository,
 )
 from infra.repositories.users.base import BaseUserRepository
@@ -12,16 +21,51 @@ from infra.repositories.users.memory import MemoryUserRepository
 from logic.init import _init_container
 
 
+def create_user(username: str, phone: str) -> User:
+    credentials = Credentials(
+        phone=Phone(value=phone), password=Password(value="alpine1212")
+    )
+    return User(username=Username(value=username), credentials=credentials)
+
+
 def init_dummy_container() -> Container:
     container = _init_container()
 
     def create_user_cache() -> BaseUserCache:
         return MemoryUserCache()
 
-    container.register(BaseUserRepository, MemoryUserRepository, scope=Scope.singleton)
+    def create_user_repository() -> BaseUserRepository:
+        return MemoryUserRepository(
+            identity_cache=container.resolve(BaseUserIdentityCache)
+        )
+
+    container.register(
+        BaseUserIdentityCache, MemoryUserIdentityCache, scope=Scope.singleton
+    )
+    container.register(
+        BaseUserRepository, factory=create_user_repository, scope=Scope.singleton
+    )
+    container.register(MemoryChatStorage, scope=Scope.singleton)
     container.register(BaseChatRepository, MemoryChatRepository, scope=Scope.singleton)
     container.register(
         BaseMessageRepository, MemoryMessageRepository, scope=Scope.singleton
     )
     container.register(BaseUserCache, factory=create_user_cache, scope=Scope.singleton)
     return container
+
+
+def write_key_pair(private_key_path: Path, public_key_path: Path):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_key_path.write_bytes(
+        private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption(),
+        )
+    )
+    public_key_path.write_bytes(
+        private_key.public_key().public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    )
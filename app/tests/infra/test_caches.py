@@ -0,0 +1,75 @@
+import pytest
+
+from domain.entities.users import User
+from infra.caches.identities.memory import MemoryUserIdentityCache
+from infra.caches.identities.tiered import TieredUserIdentityCache
+from infra.repositories.users.base import BaseUserRepository
+from tests.fixtures import create_user
+
+
+@pytest.mark.asyncio
+async def test_identity_cache_does_not_keep_password():
+    cache = MemoryUserIdentityCache()
+    user = create_user("user", "+79010000100")
+
+    await cache.set(user)
+    cached: User = await cache.get(user.oid)
+
+    assert cached.oid == user.oid
+    assert cached.credentials.password is None
+    assert user.credentials.password is not None
+    assert (cache.stats.hits, cache.stats.misses) == (1, 0)
+
+
+@pytest.mark.asyncio
+async def test_identity_cache_evicts_least_recently_used():
+    cache = MemoryUserIdentityCache(max_size=2)
+    first, second, third = (
+        create_user(f"user{i}", f"+7901000010{i}") for i in range(3)
+    )
+
+    await cache.set(first)
+    await cache.set(second)
+    await cache.get(first.oid)
+    await cache.set(third)
+
+    assert await cache.get(second.oid) is None
+    assert await cache.get(first.oid) is not None
+    assert await cache.get(third.oid) is not None
+
+
+@pytest.mark.asyncio
+async def test_identity_cache_entries_expire():
+    cache = MemoryUserIdentityCache(expire_seconds=0)
+    user = create_user("user", "+79010000100")
+
+    await cache.set(user)
+
+    assert await cache.get(user.oid) is None
+    assert cache.stats.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_tiered_identity_cache_fills_local_tier():
+    local_cache = MemoryUserIdentityCache()
+    remote_cache = MemoryUserIdentityCache()
+    cache = TieredUserIdentityCache(local_cache=local_cache, remote_cache=remote_cache)
+    user = create_user("user", "+79010000100")
+    await remote_cache.set(user)
+
+    assert await cache.get(user.oid) is not None
+    assert await local_cache.get(user.oid) is not None
+    assert (cache.stats.hits, cache.stats.misses) == (1, 0)
+
+
+@pytest.mark.asyncio
+async def test_confirm_user_invalidates_identity_cache(
+    user_repository: BaseUserRepository,
+):
+    user = create_user("user", "+79010000100")
+    await user_repository.add_user(user)
+    await user_repository.identity_cache.set(user)
+
+    await user_repository.confirm_user(user_oid=user.oid)
+
+    assert await user_repository.identity_cache.get(user.oid) is None
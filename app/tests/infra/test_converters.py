@@ -0,0 +1,60 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from infra.repositories.converters import convert_in_chunks
+from infra.repositories.messages.converters import (
+    convert_message_documents_to_entities,
+    convert_message_entities_to_documents,
+)
+
+
+def create_message_documents(count: int) -> list[dict]:
+    return [
+        {
+            "oid": f"message-{i}",
+            "text": f"{i}",
+            "sender_oid": "user",
+            "chat_oid": "chat",
+            "created_at": datetime.now(),
+        }
+        for i in range(count)
+    ]
+
+
+def test_message_documents_round_trip():
+    documents = create_message_documents(3)
+
+    messages = convert_message_documents_to_entities(documents)
+
+    assert [message.oid for message in messages] == [
+        "message-0",
+        "message-1",
+        "message-2",
+    ]
+    assert convert_message_entities_to_documents(messages) == documents
+
+
+@pytest.mark.asyncio
+async def test_large_batches_yield_to_event_loop():
+    documents = create_message_documents(25)
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0)
+            ticks += 1
+
+    ticker = asyncio.create_task(tick())
+    await asyncio.sleep(0)
+    messages = await convert_in_chunks(
+        documents, convert_message_documents_to_entities, chunk_size=10
+    )
+    ticker.cancel()
+
+    assert [message.oid for message in messages] == [
+        document["oid"] for document in documents
+    ]
+    assert ticks >= 2
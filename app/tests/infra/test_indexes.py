@@ -0,0 +1,46 @@
+from infra.repositories.indexes import build_index_registry, is_collection_scan
+from settings.config import MongoConfig
+
+
+def test_index_registry_covers_all_collections():
+    mongo_config = MongoConfig()
+    registry = build_index_registry(mongo_config)
+
+    assert set(registry) == {
+        mongo_config.mongodb_user_collection,
+        mongo_config.mongodb_chat_collection,
+        mongo_config.mongodb_message_collection,
+    }
+    for collection_indexes in registry.values():
+        assert any(
+            index.unique and index.keys == (("oid", 1),)
+            for index in collection_indexes.indexes
+        )
+
+
+def test_explain_collection_scan_detected():
+    explain = {
+        "queryPlanner": {
+            "winningPlan": {
+                "stage": "LIMIT",
+                "inputStage": {"stage": "COLLSCAN", "filter": {"oid": {"$eq": ""}}},
+            }
+        }
+    }
+
+    assert is_collection_scan(explain) is True
+
+
+def test_explain_index_scan_accepted():
+    explain = {
+        "queryPlanner": {
+            "winningPlan": {
+                "queryPlan": {
+                    "stage": "FETCH",
+                    "inputStage": {"stage": "IXSCAN", "indexName": "oid"},
+                }
+            }
+        }
+    }
+
+    assert is_collection_scan(explain) is False
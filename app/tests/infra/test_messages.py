@@ -0,0 +1,200 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from domain.entities.messages import Chat, Message
+from domain.values.messages import Text, Title
+from infra.repositories.filters.messages import GetMessagesFilters
+from infra.repositories.messages.memory import (
+    MemoryChatRepository,
+    MemoryChatStorage,
+    MemoryMessageRepository,
+)
+from infra.repositories.messages.mongo import MongoDBMessageRepository
+from tests.fixtures import create_user
+
+
+@pytest.mark.asyncio
+async def test_memory_storage_keeps_late_messages_in_time_order():
+    storage = MemoryChatStorage()
+    chat_repository = MemoryChatRepository(storage=storage)
+    message_repository = MemoryMessageRepository(storage=storage)
+    chat = Chat(title=Title(value="chat"))
+    await chat_repository.add_chat(chat)
+
+    now = datetime.now()
+    messages = [
+        Message(
+            text=Text(value=f"{i}"),
+            sender_oid="user",
+            chat_oid=chat.oid,
+            created_at=now + timedelta(seconds=i),
+        )
+        for i in range(5)
+    ]
+    await message_repository.add_messages([messages[i] for i in (0, 1, 3, 4, 2)])
+
+    stored = await message_repository.get_messages_by_chat_oid(
+        chat_oid=chat.oid, filters=GetMessagesFilters(after=messages[0].oid)
+    )
+    assert stored == messages[1:]
+    assert chat.messages_count == 5
+    assert chat.last_message == messages[4]
+    assert chat.messages == set()
+
+
+@pytest.mark.asyncio
+async def test_memory_storage_is_scoped_to_instance_and_cleans_indexes():
+    storage = MemoryChatStorage()
+    chat_repository = MemoryChatRepository(storage=storage)
+    message_repository = MemoryMessageRepository(storage=storage)
+    user = create_user("user", "+79010000050")
+    chat = Chat(title=Title(value="chat"))
+    chat.add_user(user)
+    await chat_repository.add_chat(chat)
+    message = Message(text=Text(value="hello"), sender_oid=user.oid, chat_oid=chat.oid)
+    await message_repository.add_message(message)
+
+    other_repository = MemoryChatRepository(storage=MemoryChatStorage())
+    assert await other_repository.get_chats_by_user_oid(user.oid) == []
+    assert await chat_repository.get_chats_by_user_oid(user.oid) == [chat]
+
+    await chat_repository.delete_chat_by_chat_oid(chat.oid)
+
+    assert await chat_repository.get_chats_by_user_oid(user.oid) == []
+    assert await message_repository.get_message_by_message_oid(message.oid) is None
+    assert storage.user_chats == {}
+    assert storage.logs == {}
+
+    await message_repository.add_message(message)
+    assert storage.logs == {}
+    assert storage.messages == {}
+
+
+@pytest.mark.asyncio
+async def test_memory_repository_iterates_history_in_batches_and_resumes():
+    storage = MemoryChatStorage()
+    message_repository = MemoryMessageRepository(storage=storage)
+    await MemoryChatRepository(storage=storage).add_chat(
+        chat := Chat(title=Title(value="chat"))
+    )
+
+    now = datetime.now()
+    messages = [
+        Message(
+            text=Text(value=f"{i}"),
+            sender_oid="user",
+            chat_oid=chat.oid,
+            created_at=now + timedelta(seconds=i),
+        )
+        for i in range(7)
+    ]
+    await message_repository.add_messages(messages[:6])
+
+    batches = []
+    async for batch in message_repository.iter_messages_by_chat_oid(
+        chat_oid=chat.oid, batch_size=3
+    ):
+        batches.append(batch)
+        if len(batches) == 1:
+            await message_repository.add_message(messages[6])
+
+    assert batches == [messages[:3], messages[3:6], messages[6:]]
+
+    resumed = [
+        message
+        async for batch in message_repository.iter_messages_by_chat_oid(
+            chat_oid=chat.oid, after=messages[4].oid, batch_size=3
+        )
+        for message in batch
+    ]
+    assert resumed == messages[5:]
+
+    unknown = message_repository.iter_messages_by_chat_oid(
+        chat_oid=chat.oid, after="unknown"
+    )
+    assert [batch async for batch in unknown] == []
+
+
+class FakeCollection:
+    def __init__(self):
+        self.documents: list[dict] = []
+        self.updates: list[tuple[dict, list[dict]]] = []
+
+    async def insert_one(self, document: dict):
+        self.documents.append(document)
+
+    async def insert_many(self, documents: list[dict], ordered: bool = True):
+        stored = {document["oid"] for document in self.documents}
+        write_errors = []
+        for index, document in enumerate(documents):
+            if document["oid"] in stored:
+                write_errors.append({"index": index, "code": 11000, "errmsg": "dup"})
+                continue
+            self.documents.append(document)
+        if write_errors:
+            raise BulkWriteError(
+                {
+                    "writeErrors": write_errors,
+                    "nInserted": len(documents) - len(write_errors),
+                }
+            )
+
+    async def bulk_write(self, requests: list, ordered: bool = True):
+        self.updates.extend((request._filter, request._doc) for request in requests)
+
+
+class FakeMongoClient:
+    def __init__(self):
+        self.collections: defaultdict[str, FakeCollection] = defaultdict(FakeCollection)
+
+    def __getitem__(self, database_name: str) -> defaultdict[str, FakeCollection]:
+        return self.collections
+
+
+def create_mongo_message_repository(
+    client: FakeMongoClient,
+) -> MongoDBMessageRepository:
+    return MongoDBMessageRepository(
+        mongo_db_client=client,
+        mongo_db_name="chat",
+        mongo_db_collection_name="messages",
+        mongo_db_chat_collection_name="chats",
+    )
+
+
+@pytest.mark.asyncio
+async def test_mongo_add_message_updates_chat_counters():
+    client = FakeMongoClient()
+    repository = create_mongo_message_repository(client)
+    message = Message(text=Text(value="hello"), sender_oid="user", chat_oid="chat")
+
+    await repository.add_message(message)
+
+    assert [
+        document["oid"] for document in client.collections["messages"].documents
+    ] == [message.oid]
+    ((chat_filter, update),) = client.collections["chats"].updates
+    assert chat_filter == {"oid": "chat"}
+    assert update[0]["$set"]["messages_count"] == {
+        "$add": [{"$ifNull": ["$messages_count", 0]}, 1]
+    }
+
+
+@pytest.mark.asyncio
+async def test_mongo_insert_messages_treats_stored_oids_as_written():
+    client = FakeMongoClient()
+    repository = create_mongo_message_repository(client)
+    messages = [
+        Message(text=Text(value=f"{i}"), sender_oid="user", chat_oid="chat")
+        for i in range(3)
+    ]
+
+    await repository.insert_messages(messages[:2])
+    await repository.insert_messages(messages)
+
+    assert [
+        document["oid"] for document in client.collections["messages"].documents
+    ] == [message.oid for message in messages]
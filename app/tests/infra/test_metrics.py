@@ -0,0 +1,47 @@
+import pytest
+
+from infra.metrics.registry import MetricsRegistry
+from infra.metrics.repositories import InstrumentedChatRepository
+from infra.repositories.messages.memory import MemoryChatRepository, MemoryChatStorage
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram(
+        "chat_test_seconds", "Test latency", ("route",), buckets=(0.1, 1)
+    )
+    child = histogram.labels('/chats/"x"')
+    for value in (0.05, 0.1, 0.5, 3):
+        child.observe(value)
+    registry.gauge("chat_test_rooms", "Rooms", lambda: 7)
+
+    assert registry.render().splitlines() == [
+        "# HELP chat_test_seconds Test latency",
+        "# TYPE chat_test_seconds histogram",
+        'chat_test_seconds_bucket{route="/chats/\\"x\\"",le="0.1"} 2',
+        'chat_test_seconds_bucket{route="/chats/\\"x\\"",le="1"} 3',
+        'chat_test_seconds_bucket{route="/chats/\\"x\\"",le="+Inf"} 4',
+        'chat_test_seconds_sum{route="/chats/\\"x\\""} 3.65',
+        'chat_test_seconds_count{route="/chats/\\"x\\""} 4',
+        "# HELP chat_test_rooms Rooms",
+        "# TYPE chat_test_rooms gauge",
+        "chat_test_rooms 7",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_instrumented_repository_times_each_method():
+    histogram = MetricsRegistry().histogram(
+        "chat_repository_duration_seconds", "Latency", ("repository", "method")
+    )
+    repository = InstrumentedChatRepository(
+        histogram=histogram,
+        name="chat",
+        repository=MemoryChatRepository(storage=MemoryChatStorage()),
+    )
+
+    assert await repository.get_chat_by_chat_oid("missing") is None
+    assert await repository.get_chats_by_user_oid("missing") == []
+
+    assert histogram.labels("chat", "get_chat_by_chat_oid").count == 1
+    assert histogram.labels("chat", "get_chats_by_user_oid").count == 1
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+
+from infra.exceptions.monitoring import CommandBudgetExceededException
+from infra.repositories.monitoring import MongoCommandMonitor, filter_shape
+
+
+def _events(command_name: str, command: dict, request_id: int, duration_ms: float):
+    started = SimpleNamespace(
+        command_name=command_name,
+        command=command,
+        connection_id=("localhost", 27017),
+        request_id=request_id,
+    )
+    succeeded = SimpleNamespace(
+        command_name=command_name,
+        connection_id=("localhost", 27017),
+        request_id=request_id,
+        duration_micros=int(duration_ms * 1000),
+    )
+    return started, succeeded
+
+
+def test_filter_shape_hides_values():
+    shape = filter_shape(
+        {
+            "chat_oid": "secret",
+            "users": {"$in": ["a", "b", ObjectId()]},
+            "$or": [{"created_at": {"$gt": 1}}, {"created_at": {"$gt": 2}}],
+        }
+    )
+
+    assert shape == {
+        "chat_oid": "str",
+        "users": {"$in": ["str", "ObjectId"]},
+        "$or": [{"created_at": {"$gt": "int"}}],
+    }
+
+
+def test_slow_command_is_logged_with_its_filter_shape(caplog):
+    monitor = MongoCommandMonitor(slow_command_ms=50)
+    fast = _events("find", {"find": "users", "filter": {"oid": "1"}}, 1, 5)
+    slow = _events("find", {"find": "chats", "filter": {"users": "2"}}, 2, 80)
+
+    with caplog.at_level(logging.WARNING, logger="infra.repositories.monitoring"):
+        for started, succeeded in (fast, slow):
+            monitor.started(started)
+            monitor.succeeded(succeeded)
+
+    assert len(caplog.records) == 1
+    message = caplog.records[0].getMessage()
+    assert "find on chats took 80.0 ms" in message
+    assert "{'users': 'str'}" in message and "'2'" not in message
+
+
+@pytest.mark.asyncio
+async def test_commands_over_budget_fail_the_scope():
+    monitor = MongoCommandMonitor(request_command_budget=2, budget_action="raise")
+
+    def find_user(request_id: int):
+        started, succeeded = _events(
+            "find", {"find": "users", "filter": {"oid": "1"}}, request_id, 1
+        )
+        monitor.started(started)
+        monitor.succeeded(succeeded)
+
+    with monitor.track("GET /chats/") as scope:
+        find_user(1)
+        await asyncio.to_thread(find_user, 2)
+    assert scope.count == 2
+
+    with (
+        pytest.raises(CommandBudgetExceededException),
+        monitor.track("GET /chats/"),
+    ):
+        for request_id in range(3):
+            await asyncio.to_thread(find_user, request_id)
+
+    # Outside of a scope commands are not counted against anything
+    find_user(4)
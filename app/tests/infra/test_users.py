@@ -0,0 +1,41 @@
+import pytest
+
+from infra.exceptions.users import UserAlreadyExistsException
+from infra.repositories.users.base import BaseUserRepository
+from infra.repositories.users.memory import MemoryUserRepository
+from tests.fixtures import create_user
+
+
+@pytest.mark.asyncio
+async def test_add_user_with_registered_phone_fails(
+    user_repository: BaseUserRepository,
+):
+    await user_repository.add_user(create_user("first", "+79010000099"))
+
+    with pytest.raises(UserAlreadyExistsException):
+        await user_repository.add_user(create_user("second", "+79010000099"))
+
+
+@pytest.mark.asyncio
+async def test_memory_user_repository_snapshot_restores_indexes():
+    repository = MemoryUserRepository()
+    users = [create_user(f"user{i}", f"+7901000011{i}") for i in range(3)]
+    for user in users:
+        await repository.add_user(user)
+    await repository.confirm_user(users[1].oid)
+
+    restored = MemoryUserRepository()
+    restored.restore(repository.snapshot())
+
+    assert [user.oid for user in await restored.get_users(limit=2)] == [
+        user.oid for user in users[:2]
+    ]
+    assert await restored.get_user_by_phone("+7 (901) 000-01-11") is None
+    user = await restored.get_user_by_phone("+79010000111")
+    assert user.oid == users[1].oid
+    assert user.is_confirmed is True
+    assert user.created_at == users[1].created_at
+    assert user.credentials.password == users[1].credentials.password
+
+    with pytest.raises(UserAlreadyExistsException):
+        await restored.add_user(create_user("copy", "+79010000110"))
@@ -0,0 +1,349 @@
+import asyncio
+import gc
+
+import msgpack
+import pytest
+
+from domain.entities.messages import Message
+from domain.values.messages import Text
+from infra.exceptions.websockets import ConnectionLimitExceededException
+from infra.websockets.frames import (
+    MSGPACK_SUBPROTOCOL,
+    PING_FRAME,
+    build_message_frame,
+)
+from infra.websockets.managers import ConnectionManager
+from infra.websockets.redis import RedisConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self, blocked: bool = False):
+        self.frames: list[bytes] = []
+        self.close_code: int | None = None
+        self.unblocked = asyncio.Event()
+        if not blocked:
+            self.unblocked.set()
+
+    async def accept(self, subprotocol: str | None = None):
+        self.subprotocol = subprotocol
+
+    async def send_bytes(self, data: bytes):
+        await self.unblocked.wait()
+        self.frames.append(data)
+
+    async def send_json(self, data: dict):
+        self.frames.append(data)
+
+    async def close(self, code: int = 1000):
+        self.close_code = code
+
+
+class FakePubSub:
+    def __init__(self, broker: "FakeRedis"):
+        self.broker = broker
+        self.channels: set[str] = set()
+        self.commands: list[tuple[str, tuple[str, ...]]] = []
+        self.messages: asyncio.Queue[dict] = asyncio.Queue()
+
+    async def subscribe(self, *channels: str):
+        self.commands.append(("subscribe", channels))
+        self.channels.update(channels)
+
+    async def unsubscribe(self, *channels: str):
+        self.commands.append(("unsubscribe", channels))
+        self.channels.difference_update(channels)
+
+    async def get_message(self, ignore_subscribe_messages: bool, timeout: float):
+        if self.messages.empty():
+            await asyncio.sleep(timeout)
+        return None if self.messages.empty() else self.messages.get_nowait()
+
+    async def aclose(self):
+        self.broker.pubsubs.remove(self)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.pubsubs: list[FakePubSub] = []
+
+    def pubsub(self) -> FakePubSub:
+        pubsub = FakePubSub(self)
+        self.pubsubs.append(pubsub)
+        return pubsub
+
+    async def publish(self, channel: str, data: bytes) -> int:
+        receivers = [pubsub for pubsub in self.pubsubs if channel in pubsub.channels]
+        for pubsub in receivers:
+            pubsub.messages.put_nowait(
+                {"type": "message", "channel": channel.encode(), "data": data}
+            )
+        return len(receivers)
+
+
+async def drain():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def poll_by_hand(
+    manager: RedisConnectionManager, monkeypatch: pytest.MonkeyPatch
+) -> FakePubSub:
+    # Without the background listener a test decides when each tick runs
+    monkeypatch.setattr(manager, "_ensure_listener", lambda: None)
+    return manager.redis_client.pubsub()
+
+
+@pytest.mark.asyncio
+async def test_slow_peer_does_not_delay_healthy_peer():
+    manager = ConnectionManager(max_queue_size=2)
+    healthy, stalled = FakeWebSocket(), FakeWebSocket(blocked=True)
+    await manager.accept_connection(healthy, key="chat")
+    await manager.accept_connection(stalled, key="chat")
+
+    for i in range(5):
+        await manager.send_all("chat", f"{i}".encode())
+        await drain()
+
+    assert healthy.frames == [b"0", b"1", b"2", b"3", b"4"]
+    assert stalled.frames == []
+    assert manager.stats.evicted_frames > 0
+
+    stalled.unblocked.set()
+    await drain()
+    assert stalled.frames[-1] == b"4"
+
+
+@pytest.mark.asyncio
+async def test_overflow_disconnect_policy_closes_slow_peer():
+    manager = ConnectionManager(
+        max_queue_size=1, overflow_policy="disconnect", overflow_close_code=4008
+    )
+    stalled = FakeWebSocket(blocked=True)
+    await manager.accept_connection(stalled, key="chat")
+
+    for i in range(3):
+        await manager.send_all("chat", f"{i}".encode())
+    await drain()
+
+    assert stalled.close_code == 4008
+    assert manager.stats.overflow_disconnects == 1
+    assert "chat" not in manager.registry
+    assert manager.queued_frames == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_backplane_delivers_across_processes(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    redis = FakeRedis()
+    first = RedisConnectionManager(redis_client=redis)
+    second = RedisConnectionManager(redis_client=redis)
+    first_pubsub = poll_by_hand(first, monkeypatch)
+    second_pubsub = poll_by_hand(second, monkeypatch)
+    local, remote = FakeWebSocket(), FakeWebSocket()
+    await first.accept_connection(local, key="chat")
+    await second.accept_connection(remote, key="chat")
+    await first._poll(first_pubsub, timeout=0)
+    await second._poll(second_pubsub, timeout=0)
+
+    await first.send_all("chat", b"hello")
+    # Same-process sockets do not wait for the round trip through redis
+    await drain()
+    assert local.frames == [b"hello"]
+    assert remote.frames == []
+
+    await first._poll(first_pubsub, timeout=0)
+    await second._poll(second_pubsub, timeout=0)
+    await drain()
+    assert remote.frames == [b"hello"]
+    assert local.frames == [b"hello"]
+    assert second.stats.received == 1
+
+    await first.close()
+    await second.close()
+
+
+@pytest.mark.asyncio
+async def test_redis_backplane_listener_releases_pubsub_on_close():
+    redis = FakeRedis()
+    manager = RedisConnectionManager(redis_client=redis)
+    await manager.accept_connection(FakeWebSocket(), key="chat")
+    await drain()
+
+    (pubsub,) = redis.pubsubs
+    assert pubsub.channels == {"chat:chat"}
+
+    await manager.close()
+    assert redis.pubsubs == []
+
+
+@pytest.mark.asyncio
+async def test_redis_backplane_batches_subscriptions_for_local_rooms(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    manager = RedisConnectionManager(redis_client=FakeRedis())
+    pubsub = poll_by_hand(manager, monkeypatch)
+    websockets = {key: FakeWebSocket() for key in ("a", "b", "c")}
+    for key, websocket in websockets.items():
+        await manager.accept_connection(websocket, key=key)
+    await manager._poll(pubsub, timeout=0)
+
+    assert len(pubsub.commands) == 1
+    command, channels = pubsub.commands[0]
+    assert command == "subscribe"
+    assert sorted(channels) == ["chat:a", "chat:b", "chat:c"]
+
+    await manager.remove_connection(websockets["a"], key="a")
+    await manager.remove_connection(websockets["b"], key="b")
+    await manager._poll(pubsub, timeout=0)
+
+    command, channels = pubsub.commands[-1]
+    assert command == "unsubscribe"
+    assert sorted(channels) == ["chat:a", "chat:b"]
+    assert manager.subscribed_keys == {"c"}
+
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_broadcast_encodes_once_per_subprotocol():
+    manager = ConnectionManager()
+    legacy = FakeWebSocket()
+    binary = [FakeWebSocket(), FakeWebSocket()]
+    await manager.accept_connection(legacy, key="chat")
+    for websocket in binary:
+        await manager.accept_connection(
+            websocket, key="chat", subprotocol=MSGPACK_SUBPROTOCOL
+        )
+
+    message = Message(text=Text(value="hello"), sender_oid="user", chat_oid="chat")
+    packed_text = msgpack.packb("hello")
+    await manager.send_all("chat", build_message_frame(message, packed_text))
+    await drain()
+
+    assert legacy.frames == [b"hello"]
+    assert binary[0].frames[0] is binary[1].frames[0]
+    assert binary[0].frames[0].endswith(packed_text)
+
+    envelope = msgpack.unpackb(binary[0].frames[0])
+    assert envelope["sender"] == "user"
+    assert envelope["oid"] == message.oid
+    assert envelope["text"] == "hello"
+    assert envelope["timestamp"].to_datetime().timestamp() == pytest.approx(
+        message.created_at.timestamp()
+    )
+
+
+@pytest.mark.asyncio
+async def test_redis_backplane_relays_envelope_to_legacy_clients(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    redis = FakeRedis()
+    first = RedisConnectionManager(redis_client=redis)
+    second = RedisConnectionManager(redis_client=redis)
+    pubsub = poll_by_hand(second, monkeypatch)
+    monkeypatch.setattr(first, "_ensure_listener", lambda: None)
+    sender, legacy = FakeWebSocket(), FakeWebSocket()
+    await first.accept_connection(sender, key="chat", subprotocol=MSGPACK_SUBPROTOCOL)
+    await second.accept_connection(legacy, key="chat")
+    await second._poll(pubsub, timeout=0)
+
+    message = Message(text=Text(value="hello"), sender_oid="user", chat_oid="chat")
+    await first.send_all("chat", build_message_frame(message))
+    await second._poll(pubsub, timeout=0)
+    await drain()
+
+    assert msgpack.unpackb(sender.frames[0])["oid"] == message.oid
+    assert legacy.frames == [b"hello"]
+
+    await first.close()
+    await second.close()
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_reaps_connections_that_miss_pongs():
+    manager = ConnectionManager(heartbeat_interval_seconds=0, max_missed_pongs=2)
+    dead, alive, legacy = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+    await manager.accept_connection(dead, key="chat", subprotocol=MSGPACK_SUBPROTOCOL)
+    await manager.accept_connection(alive, key="chat", subprotocol=MSGPACK_SUBPROTOCOL)
+    await manager.accept_connection(legacy, key="chat")
+
+    manager._heartbeat_tick()
+    assert manager.idle_connections == 2
+
+    for _ in range(2):
+        await drain()
+        manager.mark_alive(alive)
+        manager._heartbeat_tick()
+    await drain()
+
+    assert dead.frames == [PING_FRAME, PING_FRAME]
+    assert dead.close_code == manager.heartbeat_close_code
+    assert manager.registry.websockets("chat") == [alive, legacy]
+    assert manager.stats.reaped_connections == 1
+    assert manager.live_connections == 2
+    assert legacy.frames == []
+
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_ping_does_not_evict_chat_frames():
+    manager = ConnectionManager(heartbeat_interval_seconds=0, max_queue_size=2)
+    stalled = FakeWebSocket(blocked=True)
+    await manager.accept_connection(
+        stalled, key="chat", subprotocol=MSGPACK_SUBPROTOCOL
+    )
+
+    for i in range(3):
+        await manager.send_all("chat", f"{i}".encode())
+        await drain()
+    manager._heartbeat_tick()
+
+    stalled.unblocked.set()
+    await drain()
+
+    assert manager.stats.evicted_frames == 0
+    assert stalled.frames == [b"0", PING_FRAME, b"1", b"2"]
+
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_connection_limit_rejects_with_close_code():
+    manager = ConnectionManager(max_connections=1, connection_limit_close_code=4013)
+    first, second = FakeWebSocket(), FakeWebSocket()
+    await manager.accept_connection(first, key="chat")
+
+    with pytest.raises(ConnectionLimitExceededException):
+        await manager.accept_connection(second, key="chat")
+
+    assert second.close_code == 4013
+    assert manager.registry.websockets("chat") == [first]
+    assert manager.stats.rejected_connections == 1
+
+    await manager.close()
+
+
+async def open_and_close_rooms(manager: ConnectionManager, count: int):
+    for i in range(count):
+        websocket = FakeWebSocket()
+        await manager.accept_connection(websocket, key=f"chat{i}")
+        await manager.remove_connection(websocket, key=f"chat{i}")
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_empty_rooms_are_torn_down_at_steady_state_memory():
+    manager = ConnectionManager(heartbeat_interval_seconds=0)
+    await open_and_close_rooms(manager, 1_000)
+
+    gc.collect()
+    objects_before, tasks_before = len(gc.get_objects()), len(asyncio.all_tasks())
+    await open_and_close_rooms(manager, 100_000)
+    gc.collect()
+
+    assert manager.registry.rooms == {}
+    assert len(manager.registry) == 0
+    assert len(asyncio.all_tasks()) == tasks_before
+    assert len(gc.get_objects()) - objects_before < 100
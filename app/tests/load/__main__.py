@@ -0,0 +1,178 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+from contextlib import asynccontextmanager
+from pathlib import Path
+from time import perf_counter
+from urllib.parse import urlsplit, urlunsplit
+
+import httpx
+
+from tests.load.journeys import Journey, JourneyFailed, JourneyOptions
+from tests.load.stats import LoadRecorder
+
+
+def configure_in_process(directory: Path, bcrypt_rounds: int | None):
+    from tests.fixtures import write_key_pair
+
+    # Settings are read from the environment when the container is first built
+    os.environ.setdefault("STORAGE_CONFIG", json.dumps({"backend": "memory"}))
+    if "AUTH_JWT" not in os.environ:
+        private_key_path = directory / "jwt-private.pem"
+        public_key_path = directory / "jwt-public.pem"
+        write_key_pair(private_key_path, public_key_path)
+        os.environ["AUTH_JWT"] = json.dumps(
+            {
+                "private_key_path": str(private_key_path),
+                "publick_key_path": str(public_key_path),
+            }
+        )
+    if bcrypt_rounds is not None:
+        os.environ["PASSWORD_HASHER"] = json.dumps({"bcrypt_rounds": bcrypt_rounds})
+
+
+@asynccontextmanager
+async def in_process_target(bcrypt_rounds: int | None):
+    with tempfile.TemporaryDirectory() as directory:
+        configure_in_process(Path(directory), bcrypt_rounds)
+
+        from application.api.main import create_application
+        from logic.init import init_container
+        from logic.services.senders import BaseSenderService
+        from tests.load.clients import ASGIWebSocket, RecordingSenderService
+
+        codes = RecordingSenderService()
+        init_container().register(BaseSenderService, instance=codes)
+        app = create_application()
+
+        def websocket_factory(path, headers, subprotocols):
+            return ASGIWebSocket(
+                app=app, path=path, headers=headers, subprotocols=subprotocols
+            )
+
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app), base_url="http://loadgen"
+            ) as http:
+                yield http, websocket_factory, codes
+
+
+@asynccontextmanager
+async def remote_target(url: str, redis_url: str):
+    from redis.asyncio import Redis
+
+    from tests.load.clients import RedisCodeSource, RemoteWebSocket
+
+    parts = urlsplit(url)
+    websocket_base = urlunsplit(
+        ("wss" if parts.scheme == "https" else "ws", parts.netloc, parts.path, "", "")
+    ).rstrip("/")
+
+    def websocket_factory(path, headers, subprotocols):
+        return RemoteWebSocket(
+            url=websocket_base + path, headers=headers, subprotocols=subprotocols
+        )
+
+    redis_client = Redis.from_url(redis_url)
+    try:
+        async with httpx.AsyncClient(base_url=url, timeout=30) as http:
+            yield http, websocket_factory, RedisCodeSource(redis_client=redis_client)
+    finally:
+        await redis_client.aclose()
+
+
+async def run_load(args: argparse.Namespace) -> dict:
+    if args.url is None:
+        target = in_process_target(args.bcrypt_rounds)
+    else:
+        target = remote_target(args.url, args.redis_url)
+
+    recorder = LoadRecorder()
+    options = JourneyOptions(
+        rest_messages=args.rest_messages,
+        history_reads=args.history_reads,
+        websocket_messages=args.websocket_messages,
+    )
+    # Distinct phone numbers per run, so journeys can be repeated against one server
+    first_phone = random.randrange(10**9)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async with target as (http, websocket_factory, codes):
+        journey = Journey(
+            http=http,
+            websocket_factory=websocket_factory,
+            codes=codes,
+            recorder=recorder,
+            options=options,
+        )
+
+        async def run_user(index: int):
+            async with semaphore:
+                try:
+                    await journey.run(phone=f"+7{(first_phone + index) % 10**10:010}")
+                except JourneyFailed as error:
+                    recorder.failed_journeys += 1
+                    print(f"journey failed: {error}", file=sys.stderr)
+
+        started = perf_counter()
+        await asyncio.gather(*(run_user(index) for index in range(args.users)))
+        elapsed = perf_counter() - started
+
+    return {
+        "target": args.url or "in-process",
+        "users": args.users,
+        "concurrency": args.concurrency,
+        "elapsed_s": elapsed,
+        "failed_journeys": recorder.failed_journeys,
+        "endpoints": recorder.report(elapsed),
+    }
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        f"{report['target']}: {report['users']} users, "
+        f"concurrency {report['concurrency']}, {report['elapsed_s']:.2f}s, "
+        f"{report['failed_journeys']} failed journeys",
+        f"{'endpoint':<36} {'count':>7} {'errors':>6} {'p50 ms':>8} "
+        f"{'p95 ms':>8} {'p99 ms':>8} {'rps':>8}",
+    ]
+    for endpoint, stats in report["endpoints"].items():
+        lines.append(
+            f"{endpoint:<36} {stats['count']:>7} {stats['errors']:>6} "
+            f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} "
+            f"{stats['p99_ms']:>8.2f} {stats['rps']:>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m tests.load")
+    parser.add_argument("--url", help="running server, in-process app when omitted")
+    parser.add_argument("--redis-url", default="redis://:root@localhost:6379/0")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--rest-messages", type=int, default=10)
+    parser.add_argument("--history-reads", type=int, default=5)
+    parser.add_argument("--websocket-messages", type=int, default=10)
+    parser.add_argument("--bcrypt-rounds", type=int, help="in-process only")
+    parser.add_argument("--output", type=Path, help="write the report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    report = asyncio.run(run_load(args))
+
+    print(format_report(report))
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2))
+
+    return 1 if report["failed_journeys"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
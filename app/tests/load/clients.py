@@ -0,0 +1,117 @@
+import asyncio
+from dataclasses import dataclass, field
+
+from redis.asyncio import Redis
+
+from domain.entities.users import User
+from logic.services.senders import BaseSenderService
+
+
+class WebSocketClosed(Exception):
+    pass
+
+
+@dataclass
+class ASGIWebSocket:
+    # httpx.ASGITransport only speaks HTTP, websocket frames use the ASGI queues
+    app: object
+    path: str
+    headers: dict[str, str] = field(default_factory=dict)
+    subprotocols: list[str] = field(default_factory=list)
+    _to_app: asyncio.Queue = field(default_factory=asyncio.Queue, init=False)
+    _from_app: asyncio.Queue = field(default_factory=asyncio.Queue, init=False)
+    _task: asyncio.Task | None = field(default=None, init=False)
+
+    async def connect(self):
+        scope = {
+            "type": "websocket",
+            "asgi": {"version": "3.0"},
+            "scheme": "ws",
+            "path": self.path,
+            "raw_path": self.path.encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [
+                (name.lower().encode(), value.encode())
+                for name, value in self.headers.items()
+            ],
+            "subprotocols": self.subprotocols,
+            "client": ("loadgen", 0),
+            "server": ("loadgen", 80),
+        }
+        self._task = asyncio.create_task(
+            self.app(scope, self._to_app.get, self._from_app.put)
+        )
+        await self._to_app.put({"type": "websocket.connect"})
+
+        message = await self._from_app.get()
+        if message["type"] != "websocket.accept":
+            raise WebSocketClosed(message.get("code"))
+
+    async def send_bytes(self, data: bytes):
+        await self._to_app.put({"type": "websocket.receive", "bytes": data})
+
+    async def receive_bytes(self) -> bytes:
+        message = await self._from_app.get()
+        if message["type"] == "websocket.close":
+            raise WebSocketClosed(message.get("code"))
+        return message.get("bytes") or message.get("text", "").encode()
+
+    async def close(self):
+        await self._to_app.put({"type": "websocket.disconnect", "code": 1000})
+        if self._task is not None:
+            await asyncio.wait_for(self._task, timeout=5)
+
+
+@dataclass
+class RemoteWebSocket:
+    url: str
+    headers: dict[str, str] = field(default_factory=dict)
+    subprotocols: list[str] = field(default_factory=list)
+    _connection: object = field(default=None, init=False)
+
+    async def connect(self):
+        from websockets.asyncio.client import connect
+
+        self._connection = await connect(
+            self.url,
+            additional_headers=self.headers,
+            subprotocols=self.subprotocols,
+            compression=None,
+        )
+
+    async def send_bytes(self, data: bytes):
+        await self._connection.send(data)
+
+    async def receive_bytes(self) -> bytes:
+        from websockets.exceptions import ConnectionClosed
+
+        try:
+            frame = await self._connection.recv()
+        except ConnectionClosed as error:
+            raise WebSocketClosed(error.rcvd.code if error.rcvd else None)
+        return frame if isinstance(frame, bytes) else frame.encode()
+
+    async def close(self):
+        await self._connection.close()
+
+
+@dataclass
+class RecordingSenderService(BaseSenderService):
+    codes: dict[str, str] = field(default_factory=dict)
+
+    async def send_code(self, user: User, code: str) -> None:
+        self.codes[user.credentials.phone.value] = code
+
+    async def get_code(self, phone: str) -> str | None:
+        return self.codes.pop(phone, None)
+
+
+@dataclass
+class RedisCodeSource:
+    # A running server keeps confirmation codes in Redis under the phone number
+    redis_client: Redis
+
+    async def get_code(self, phone: str) -> str | None:
+        code = await self.redis_client.get(phone)
+        return code.decode() if code is not None else None
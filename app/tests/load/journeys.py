@@ -0,0 +1,150 @@
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Callable, Protocol
+
+import httpx
+import msgpack
+
+from infra.websockets.frames import MSGPACK_SUBPROTOCOL
+from tests.load.stats import LoadRecorder
+
+
+PASSWORD = "load-test-password"
+
+
+class JourneyFailed(Exception):
+    pass
+
+
+class CodeSource(Protocol):
+    async def get_code(self, phone: str) -> str | None: ...
+
+
+class WebSocketClient(Protocol):
+    async def connect(self): ...
+
+    async def send_bytes(self, data: bytes): ...
+
+    async def receive_bytes(self) -> bytes: ...
+
+    async def close(self): ...
+
+
+WebSocketFactory = Callable[[str, dict[str, str], list[str]], WebSocketClient]
+
+
+@dataclass(frozen=True)
+class JourneyOptions:
+    rest_messages: int = 10
+    history_reads: int = 5
+    websocket_messages: int = 10
+
+
+@dataclass
+class Journey:
+    http: httpx.AsyncClient
+    websocket_factory: WebSocketFactory
+    codes: CodeSource
+    recorder: LoadRecorder
+    options: JourneyOptions
+
+    async def _request(
+        self, endpoint: str, method: str, url: str, **kwargs
+    ) -> httpx.Response:
+        started = perf_counter()
+        try:
+            response = await self.http.request(method, url, **kwargs)
+        except httpx.HTTPError as error:
+            self.recorder.record(endpoint, perf_counter() - started, ok=False)
+            raise JourneyFailed(f"{endpoint}: {error!r}")
+
+        self.recorder.record(endpoint, perf_counter() - started, response.is_success)
+        if not response.is_success:
+            raise JourneyFailed(f"{endpoint}: {response.status_code} {response.text}")
+        return response
+
+    async def _sign_up(self, phone: str) -> dict[str, str]:
+        await self._request(
+            "POST /auth/sign-up",
+            "POST",
+            "/auth/sign-up",
+            json={
+                "username": f"user {phone}",
+                "phone": phone,
+                "password1": PASSWORD,
+                "password2": PASSWORD,
+            },
+        )
+
+        code = await self.codes.get_code(phone)
+        if code is None:
+            raise JourneyFailed(f"no confirmation code for {phone}")
+
+        response = await self._request(
+            "POST /auth/confirm",
+            "POST",
+            "/auth/confirm",
+            json={"phone": phone, "code": code},
+        )
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def _chat_over_websocket(self, chat_oid: str, headers: dict[str, str]):
+        websocket = self.websocket_factory(
+            f"/chats/{chat_oid}/", headers, [MSGPACK_SUBPROTOCOL]
+        )
+
+        started = perf_counter()
+        await websocket.connect()
+        self.recorder.record("WS connect /chats/{chat_oid}/", perf_counter() - started)
+
+        try:
+            for index in range(self.options.websocket_messages):
+                text = f"websocket message {index}"
+                started = perf_counter()
+                await websocket.send_bytes(msgpack.packb(text))
+
+                # Skip pings until our own message comes back through the broadcast
+                while True:
+                    frame = msgpack.unpackb(await websocket.receive_bytes())
+                    if isinstance(frame, dict) and frame.get("text") == text:
+                        break
+
+                self.recorder.record(
+                    "WS message /chats/{chat_oid}/", perf_counter() - started
+                )
+        finally:
+            await websocket.close()
+
+    async def run(self, phone: str):
+        headers = await self._sign_up(phone)
+
+        response = await self._request(
+            "POST /chats/",
+            "POST",
+            "/chats/",
+            json={"title": f"chat {phone}"},
+            headers=headers,
+        )
+        chat_oid = response.json()["oid"]
+
+        for index in range(self.options.rest_messages):
+            await self._request(
+                "POST /chats/{chat_oid}/messages/",
+                "POST",
+                f"/chats/{chat_oid}/messages/",
+                json={"text": f"message {index}"},
+                headers=headers,
+            )
+
+        for _ in range(self.options.history_reads):
+            await self._request(
+                "GET /chats/{chat_oid}/messages/",
+                "GET",
+                f"/chats/{chat_oid}/messages/",
+                headers=headers,
+            )
+
+        await self._request("GET /chats/", "GET", "/chats/", headers=headers)
+
+        if self.options.websocket_messages:
+            await self._chat_over_websocket(chat_oid, headers)
@@ -0,0 +1,46 @@
+import math
+from dataclasses import dataclass, field
+
+
+@dataclass
+class EndpointStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+
+def percentile(latencies: list[float], percent: float) -> float:
+    if not latencies:
+        return 0.0
+    # Nearest rank over the sorted samples
+    rank = max(math.ceil(percent / 100 * len(latencies)), 1)
+    return latencies[rank - 1]
+
+
+@dataclass
+class LoadRecorder:
+    endpoints: dict[str, EndpointStats] = field(default_factory=dict)
+    failed_journeys: int = 0
+
+    def record(self, endpoint: str, seconds: float, ok: bool = True):
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = self.endpoints[endpoint] = EndpointStats()
+
+        if ok:
+            stats.latencies.append(seconds)
+        else:
+            stats.errors += 1
+
+    def report(self, elapsed_seconds: float) -> dict[str, dict[str, float]]:
+        report = {}
+        for endpoint, stats in self.endpoints.items():
+            latencies = sorted(stats.latencies)
+            report[endpoint] = {
+                "count": len(latencies),
+                "errors": stats.errors,
+                "p50_ms": percentile(latencies, 50) * 1_000,
+                "p95_ms": percentile(latencies, 95) * 1_000,
+                "p99_ms": percentile(latencies, 99) * 1_000,
+                "rps": len(latencies) / elapsed_seconds if elapsed_seconds else 0.0,
+            }
+        return report
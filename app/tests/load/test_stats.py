@@ -0,0 +1,23 @@
+from tests.load.stats import LoadRecorder, percentile
+
+
+def test_percentile_uses_nearest_rank():
+    latencies = [float(value) for value in range(1, 101)]
+
+    assert percentile(latencies, 50) == 50
+    assert percentile(latencies, 99) == 99
+    assert percentile([], 95) == 0
+
+
+def test_recorder_reports_errors_and_throughput():
+    recorder = LoadRecorder()
+    recorder.record("GET /chats/", 0.002)
+    recorder.record("GET /chats/", 0.004)
+    recorder.record("GET /chats/", 1.0, ok=False)
+
+    report = recorder.report(elapsed_seconds=2)
+
+    assert report["GET /chats/"]["count"] == 2
+    assert report["GET /chats/"]["errors"] == 1
+    assert report["GET /chats/"]["p99_ms"] == 4
+    assert report["GET /chats/"]["rps"] == 1
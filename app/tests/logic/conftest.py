@@ -1,9 +1,17 @@
+from pathlib import Path
+
 from pytest import fixture
 
 from domain.entities.messages import Chat
 from domain.entities.users import Credentials, User
 from domain.values.messages import Title
 from domain.values.users import Password, Phone, Username
+from infra.caches.users.memory import MemoryUserCache
+from logic.services.auth import AuthService
+from logic.services.hashers import PasswordHasher
+from logic.services.senders import DummySenderService
+from settings.config import AuthJWT
+from tests.fixtures import write_key_pair
 
 
 @fixture(scope="function")
@@ -58,3 +66,24 @@ def users() -> list[User]:
         user = User(username=username, credentials=crd, is_confirmed=True)
         users_list.append(user)
     return users_list
+
+
+@fixture(scope="function")
+def auth_jwt(tmp_path: Path) -> AuthJWT:
+    auth_jwt = AuthJWT(
+        private_key_path=tmp_path / "jwt-private.pem",
+        publick_key_path=tmp_path / "jwt-public.pem",
+        keys_check_interval_seconds=0,
+    )
+    write_key_pair(auth_jwt.private_key_path, auth_jwt.publick_key_path)
+    return auth_jwt
+
+
+@fixture(scope="function")
+def auth_service(auth_jwt: AuthJWT) -> AuthService:
+    return AuthService(
+        cache_client=MemoryUserCache(),
+        sender_service=DummySenderService(),
+        authJWT=auth_jwt,
+        password_hasher=PasswordHasher(rounds=4, max_workers=2),
+    )
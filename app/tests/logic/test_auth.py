@@ -0,0 +1,63 @@
+import os
+
+import pytest
+from redis.asyncio import Redis
+
+from domain.entities.users import User
+from infra.caches.identities.redis import RedisUserIdentityCache
+from infra.repositories.users.base import BaseUserRepository
+from logic.commands.permissions import (
+    AccessCheckUserCommand,
+    AccessCheckUserCommandHandler,
+)
+from logic.services.auth import AuthService
+from settings.config import AuthJWT
+from tests.fixtures import write_key_pair
+
+
+@pytest.mark.asyncio
+async def test_decode_jwt_caches_verified_token(auth_service: AuthService, user: User):
+    token = await auth_service.encode_jwt(user)
+
+    first = await auth_service.decode_jwt(token)
+    second = await auth_service.decode_jwt(token)
+
+    assert first["sub"] == second["sub"] == user.oid
+    assert len(auth_service._verified_tokens) == 1
+    assert await auth_service.decode_jwt(token + "x") is None
+
+
+@pytest.mark.asyncio
+async def test_decode_jwt_reloads_rotated_keys(
+    auth_service: AuthService, auth_jwt: AuthJWT, user: User
+):
+    token = await auth_service.encode_jwt(user)
+    assert await auth_service.decode_jwt(token) is not None
+
+    write_key_pair(auth_jwt.private_key_path, auth_jwt.publick_key_path)
+    stat = auth_jwt.publick_key_path.stat()
+    os.utime(
+        auth_jwt.publick_key_path,
+        ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000),
+    )
+
+    assert await auth_service.decode_jwt(token) is None
+
+
+@pytest.mark.asyncio
+async def test_access_check_falls_back_to_repository_when_redis_is_down(
+    auth_service: AuthService, user_repository: BaseUserRepository, user: User
+):
+    redis_client = Redis(port=1, socket_connect_timeout=0.1)
+    handler = AccessCheckUserCommandHandler(
+        user_repository=user_repository,
+        auth_service=auth_service,
+        identity_cache=RedisUserIdentityCache(redis_client=redis_client),
+    )
+    await user_repository.add_user(user)
+    token = await auth_service.encode_jwt(user)
+
+    checked = await handler.handle(AccessCheckUserCommand(access_token=token))
+
+    assert checked.oid == user.oid
+    await redis_client.aclose()
@@ -0,0 +1,14 @@
+from infra.repositories.messages.base import BaseChatRepository, BaseMessageRepository
+from infra.repositories.users.base import BaseUserRepository
+from logic.init import _init_container
+
+
+def test_mongodb_repositories_build_from_container():
+    container = _init_container()
+
+    for repository_type in (
+        BaseUserRepository,
+        BaseChatRepository,
+        BaseMessageRepository,
+    ):
+        assert container.resolve(repository_type) is not None
@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+
+import pytest
+
+from logic.commands.base import BaseCommand, BaseCommandHandler
+from logic.commands.messages import GetChatCommand
+from logic.exceptions.mediator import (
+    CommandHandlerTypeMismatchException,
+    MediatorAlreadyCompiledException,
+)
+from logic.mediator import Mediator
+
+
+@dataclass(frozen=True)
+class PingCommand(BaseCommand):
+    value: int
+
+
+@dataclass(frozen=True)
+class PingCommandHandler(BaseCommandHandler[PingCommand, int]):
+    async def handle(self, command: PingCommand) -> int:
+        return command.value
+
+
+def test_container_mediator_is_shared(container):
+    assert container.resolve(Mediator) is container.resolve(Mediator)
+
+
+@pytest.mark.asyncio
+async def test_compiled_mediator_dispatch():
+    mediator = Mediator()
+    mediator.register_command(PingCommand, [PingCommandHandler()])
+    mediator.compile()
+
+    assert await mediator.handle_command(PingCommand(value=1)) == [1]
+
+    with pytest.raises(MediatorAlreadyCompiledException):
+        mediator.register_command(PingCommand, [PingCommandHandler()])
+
+
+def test_compile_rejects_handler_for_other_command():
+    mediator = Mediator()
+    mediator.register_command(GetChatCommand, [PingCommandHandler()])
+
+    with pytest.raises(CommandHandlerTypeMismatchException):
+        mediator.compile()
@@ -1,16 +1,30 @@
+import asyncio
+
 from faker import Faker
+from punq import Container
+
 from domain.entities.messages import Message
 from domain.entities.users import User
+from domain.values.messages import Text
+from infra.repositories.filters.messages import GetMessagesFilters
 from infra.repositories.messages.base import BaseChatRepository, BaseMessageRepository
 from infra.repositories.users.base import BaseUserRepository
 from logic.commands.messages import (
     AddUserToChatCommand,
+    BufferMessageCommand,
     CreateChatCommand,
     CreateMessageCommand,
+    ExportChatMessagesCommand,
     GetUserChatMessagesCommand,
+    GetUserChatsCommand,
     GetUsersCommand,
 )
+from logic.exceptions.messages import (
+    ChatNotFoundException,
+    MessageWriteBufferClosedException,
+)
 from logic.mediator import Mediator
+from logic.services.messages import MessageWriteBuffer
 
 import pytest
 
@@ -26,6 +40,22 @@ async def test_create_chat_command_succes(
     assert chat.oid == chat_from_repo.oid
 
 
+@pytest.mark.asyncio
+async def test_get_user_chats_command_success(
+    mediator: Mediator, faker: Faker, user: User, user2: User
+):
+    chat, *_ = await mediator.handle_command(
+        CreateChatCommand(title=faker.text(max_nb_chars=10), user=user)
+    )
+    await mediator.handle_command(
+        CreateChatCommand(title=faker.text(max_nb_chars=10), user=user2)
+    )
+
+    chats, *_ = await mediator.handle_command(GetUserChatsCommand(user=user))
+
+    assert [user_chat.oid for user_chat in chats] == [chat.oid]
+
+
 @pytest.mark.asyncio
 async def test_create_message_command_success(
     message_repository: BaseMessageRepository,
@@ -48,6 +78,173 @@ async def test_create_message_command_success(
     assert message_from_repo.text.value == "hello"
 
 
+@pytest.mark.asyncio
+async def test_create_message_updates_chat_counters(
+    chat_repository: BaseChatRepository, mediator: Mediator, faker: Faker, user: User
+):
+    chat, *_ = await mediator.handle_command(
+        CreateChatCommand(title=faker.text(max_nb_chars=10), user=user)
+    )
+    for text in ("first", "second"):
+        message, *_ = await mediator.handle_command(
+            CreateMessageCommand(text=text, chat_oid=chat.oid, user=user)
+        )
+
+    chat_from_repo = await chat_repository.get_chat_by_chat_oid(chat_oid=chat.oid)
+
+    assert chat_from_repo.messages_count == 2
+    assert chat_from_repo.last_message.oid == message.oid
+
+
+class RecordingMessageRepository(BaseMessageRepository):
+    def __init__(self):
+        self.batches: list[list[Message]] = []
+        self.counted: list[list[Message]] = []
+
+    async def add_message(self, message: Message):
+        await self.add_messages([message])
+
+    async def insert_messages(self, messages: list[Message]):
+        await asyncio.sleep(0)
+        self.batches.append(messages)
+
+    async def update_chat_counters(self, messages: list[Message]):
+        self.counted.append(messages)
+
+    async def get_messages_by_chat_oid(self, chat_oid, filters):
+        return []
+
+    async def get_message_by_message_oid(self, message_oid):
+        return None
+
+    async def iter_messages_by_chat_oid(self, chat_oid, after=None, batch_size=500):
+        return
+        yield
+
+
+@pytest.mark.asyncio
+async def test_buffer_message_command_is_stored_on_close(
+    container: Container,
+    chat_repository: BaseChatRepository,
+    message_repository: BaseMessageRepository,
+    mediator: Mediator,
+    faker: Faker,
+    user: User,
+):
+    chat, *_ = await mediator.handle_command(
+        CreateChatCommand(title=faker.text(max_nb_chars=10), user=user)
+    )
+    messages = []
+    for text in ("first", "second", "third"):
+        message, *_ = await mediator.handle_command(
+            BufferMessageCommand(text=text, chat_oid=chat.oid, user=user)
+        )
+        messages.append(message)
+
+    assert await message_repository.get_message_by_message_oid(messages[0].oid) is None
+
+    await container.resolve(MessageWriteBuffer).close()
+
+    stored = await message_repository.get_messages_by_chat_oid(
+        chat_oid=chat.oid, filters=GetMessagesFilters()
+    )
+    chat_from_repo = await chat_repository.get_chat_by_chat_oid(chat_oid=chat.oid)
+    assert [message.oid for message in stored] == [message.oid for message in messages]
+    assert chat_from_repo.messages_count == 3
+
+
+async def drain():
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_message_write_buffer_flushes_by_size_and_time(user: User):
+    repository = RecordingMessageRepository()
+    buffer = MessageWriteBuffer(
+        message_repository=repository, max_batch_size=10, flush_interval_seconds=0.05
+    )
+
+    def create_message(i: int) -> Message:
+        return Message(
+            text=Text(value=f"{i}"), sender_oid=user.oid, chat_oid=f"chat{i % 2}"
+        )
+
+    await buffer.add(create_message(0))
+    await drain()
+    assert repository.batches == []
+
+    await asyncio.sleep(0.1)
+    assert [len(batch) for batch in repository.batches] == [1]
+
+    messages = [create_message(i) for i in range(25)]
+    for message in messages:
+        await buffer.add(message)
+    await drain()
+
+    assert buffer.pending == 0
+    assert all(len(batch) <= 10 for batch in repository.batches)
+    for chat_oid in ("chat0", "chat1"):
+        stored = [
+            message.oid
+            for batch in repository.batches[1:]
+            for message in batch
+            if message.chat_oid == chat_oid
+        ]
+        assert stored == [
+            message.oid for message in messages if message.chat_oid == chat_oid
+        ]
+
+    await buffer.close()
+
+
+class FlakyMessageRepository(RecordingMessageRepository):
+    def __init__(self, insert_failures: int, counter_failures: int):
+        super().__init__()
+        self.insert_failures = insert_failures
+        self.counter_failures = counter_failures
+
+    async def insert_messages(self, messages: list[Message]):
+        if self.insert_failures:
+            self.insert_failures -= 1
+            raise ConnectionError("mongo is down")
+        await super().insert_messages(messages)
+
+    async def update_chat_counters(self, messages: list[Message]):
+        if self.counter_failures:
+            self.counter_failures -= 1
+            raise ConnectionError("mongo is down")
+        await super().update_chat_counters(messages)
+
+
+@pytest.mark.asyncio
+async def test_message_write_buffer_retries_failed_batches(user: User):
+    repository = FlakyMessageRepository(insert_failures=1, counter_failures=1)
+    buffer = MessageWriteBuffer(
+        message_repository=repository,
+        max_in_flight=1,
+        flush_interval_seconds=0,
+        retry_backoff_seconds=0,
+    )
+    messages = [
+        Message(text=Text(value=f"{i}"), sender_oid=user.oid, chat_oid="chat")
+        for i in range(5)
+    ]
+
+    for message in messages:
+        await buffer.add(message)
+    await buffer.close()
+
+    stored = [message.oid for batch in repository.batches for message in batch]
+    assert stored == [message.oid for message in messages]
+    assert repository.counted == repository.batches
+    assert buffer.stats.retried_batches == 2
+    assert buffer.stats.failed_messages == 0
+
+    with pytest.raises(MessageWriteBufferClosedException):
+        await buffer.add(messages[0])
+
+
 @pytest.mark.asyncio
 async def test_get_chat_messages(
     chat_repository: BaseChatRepository, mediator: Mediator, faker: Faker, user: User
@@ -68,6 +265,46 @@ async def test_get_chat_messages(
     assert len(messages) == 2
 
 
+@pytest.mark.asyncio
+async def test_get_chat_messages_paginated(
+    mediator: Mediator, faker: Faker, user: User
+):
+    chat, *_ = await mediator.handle_command(
+        CreateChatCommand(title=faker.text(max_nb_chars=10), user=user)
+    )
+    created = []
+    for i in range(5):
+        message, *_ = await mediator.handle_command(
+            CreateMessageCommand(text=f"message{i}", chat_oid=chat.oid, user=user)
+        )
+        created.append(message.oid)
+
+    latest, *_ = await mediator.handle_command(
+        GetUserChatMessagesCommand(
+            user=user, chat_oid=chat.oid, filters=GetMessagesFilters(limit=2)
+        )
+    )
+    assert [message.oid for message in latest] == created[3:]
+
+    before, *_ = await mediator.handle_command(
+        GetUserChatMessagesCommand(
+            user=user,
+            chat_oid=chat.oid,
+            filters=GetMessagesFilters(limit=2, before=latest[0].oid),
+        )
+    )
+    assert [message.oid for message in before] == created[1:3]
+
+    after, *_ = await mediator.handle_command(
+        GetUserChatMessagesCommand(
+            user=user,
+            chat_oid=chat.oid,
+            filters=GetMessagesFilters(limit=10, after=created[1]),
+        )
+    )
+    assert [message.oid for message in after] == created[2:]
+
+
 @pytest.mark.asyncio
 async def test_add_user_to_chat_command_success(
     chat_repository: BaseChatRepository,
@@ -105,3 +342,25 @@ async def test_get_users_command_success(
     users_from_repo, *_ = await mediator.handle_command(GetUsersCommand(user=user))
 
     assert len(users) == len(users_from_repo)
+
+
+@pytest.mark.asyncio
+async def test_export_chat_messages_is_limited_to_members(
+    mediator: Mediator, user: User, user2: User
+):
+    chat, *_ = await mediator.handle_command(
+        CreateChatCommand(title="export", user=user)
+    )
+    message, *_ = await mediator.handle_command(
+        CreateMessageCommand(text="secret", chat_oid=chat.oid, user=user)
+    )
+
+    batches, *_ = await mediator.handle_command(
+        ExportChatMessagesCommand(user=user, chat_oid=chat.oid)
+    )
+    assert [batch async for batch in batches] == [[message]]
+
+    with pytest.raises(ChatNotFoundException):
+        await mediator.handle_command(
+            ExportChatMessagesCommand(user=user2, chat_oid=chat.oid)
+        )
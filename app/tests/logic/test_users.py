@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from domain.values.users import Password
+from infra.repositories.users.base import BaseUserRepository
+from logic.commands.users import SignInCommand, SignInCommandHandler
+from logic.services.auth import AuthService
+from logic.services.hashers import PasswordHasher, get_bcrypt_rounds
+from tests.fixtures import create_user
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_round_trip():
+    hasher = PasswordHasher(rounds=4, max_workers=1)
+
+    hashed_password = await hasher.hash("alpine1212")
+
+    assert await hasher.check("alpine1212", hashed_password) is True
+    assert await hasher.check("alpine1213", hashed_password) is False
+    assert hasher.needs_rehash(hashed_password) is False
+    assert PasswordHasher(rounds=5).needs_rehash(hashed_password) is True
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_caps_concurrency():
+    hasher = PasswordHasher(rounds=4, max_workers=1)
+    queue_depths = []
+
+    async def probe():
+        while not tasks_done.is_set():
+            queue_depths.append(hasher.queue_depth)
+            assert hasher.in_flight <= 1
+            await asyncio.sleep(0)
+
+    tasks_done = asyncio.Event()
+    probe_task = asyncio.create_task(probe())
+    await asyncio.gather(*(hasher.hash("alpine1212") for _ in range(4)))
+    tasks_done.set()
+    await probe_task
+
+    assert max(queue_depths) == 3
+    assert hasher.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_sign_in_rehashes_password_with_outdated_cost(
+    user_repository: BaseUserRepository, auth_service: AuthService
+):
+    user = create_user("user", "+79010000200")
+    user.is_confirmed = True
+    user.credentials.password = Password(
+        value=await PasswordHasher(rounds=5).hash("alpine1212")
+    )
+    await user_repository.add_user(user)
+    handler = SignInCommandHandler(
+        user_repository=user_repository, auth_service=auth_service
+    )
+
+    await handler.handle(SignInCommand(phone="+79010000200", password="alpine1212"))
+
+    user_from_repo = await user_repository.get_user_by_user_oid(user.oid)
+    assert get_bcrypt_rounds(user_from_repo.credentials.password.value) == 4